@@ -1,30 +1,33 @@
 # app.py
+import os
+import functools
 import streamlit as st
 import pandas as pd
-import base64
 
 # Custom components
 from dashboard.components.executive_summary import generate_executive_summary
 from dashboard.components.sidebar import display_sidebar, apply_filters
-from dashboard.components.metrics_display import display_key_metrics, display_advanced_metrics
-from dashboard.data_loader import load_data
-from dashboard.components.filters import apply_advanced_filters
-from dashboard.visualizations import (
-    plot_repository_growth,
-    plot_issue_resolution_time,
-    plot_pull_request_merge_time,
-    plot_contributor_activity,
-    plot_repository_size_distribution,
-    plot_correlation_heatmap,
-    plot_issue_pr_funnel,
-    plot_trend_analysis,
-    plot_repository_treemap,
-    plot_issues_vs_prs,
-    display_top_repositories
+from dashboard.components.metrics_display import key_metrics, display_key_metrics, display_advanced_metrics
+from dashboard.data_loader import (
+    load_manifest, load_repositories, load_partition, load_activity_partitions, load_column_max,
+    load_sketches, load_snapshots, load_rollups
 )
+from dashboard.data_processing.rollups import filter_rollups
+from dashboard.filter_engine import DeferredIndex, build_activity_index, build_repository_index
+from dashboard.prerender import VIEW_CHARTS, load_default_figure, load_default_view
+from dashboard.search_index import build_repository_search
+from dashboard.figure_cache import FigureCache, filter_fingerprint
+from dashboard.downloads import EXPORT_FORMATS, ExportJobs
+from dashboard.profiler import RENDER_PROFILER, RENDER_PROFILE_WINDOW, RenderProfiler
+from dashboard.components.filters import apply_advanced_filters
+from dashboard.visualizations import plot_star_growth
 from streamlit_lottie import st_lottie
 import json
 
+# Copy-on-write: frames handed out from the process-wide caches share memory with the cached ones
+# until a caller modifies them, and a modification never reaches the cached frame or other sessions
+pd.set_option("mode.copy_on_write", True)
+
 # Set page config
 st.set_page_config(page_title="OSS-Pulse", page_icon="📊", layout="wide")
 
@@ -37,121 +40,386 @@ def load_css():
 st.markdown(load_css(), unsafe_allow_html=True)
 
 # Data loading and caching
-@st.cache_data(ttl=3600)
-def get_data():
-    return load_data()
-
-# Data export function
-@st.cache_data
-def get_download_link(df: pd.DataFrame, filename: str, text: str) -> str:
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    return f'<a href="data:file/csv;base64,{b64}" download="{filename}" class="download-link">{text}</a>'
-
-# Modify the visualization functions to return data for processing
-def load_visualizations_data(filtered_repo_data, filtered_issues_data, filtered_pr_data):
-    return [
-        plot_repository_growth(filtered_repo_data),
-        plot_issue_resolution_time(filtered_issues_data),
-        plot_pull_request_merge_time(filtered_pr_data),
-        plot_contributor_activity(filtered_repo_data),
-        plot_repository_size_distribution(filtered_repo_data),
-        plot_correlation_heatmap(filtered_repo_data),
-        plot_issue_pr_funnel(filtered_issues_data, filtered_pr_data),
-        plot_trend_analysis(filtered_repo_data),
-        plot_repository_treemap(filtered_repo_data),
-        plot_issues_vs_prs(filtered_repo_data, filtered_issues_data, filtered_pr_data),
-    ]
+# Release data is cached per manifest version: nothing reloads until a new export is published
+# Filter indexes are shared objects (not copied per rerun) so their memoised results carry over
+@st.cache_resource(max_entries=2)
+def get_repo_index(version, _base_path):
+    get_profiler().note_miss()
+    repo_data = load_repositories(_base_path)
+    return build_repository_index(repo_data) if repo_data is not None else None
+
+@st.cache_resource(max_entries=2)
+def get_search_index(version, _base_path):
+    get_profiler().note_miss()
+    # Built over the repository index's rows so search and filter masks can be combined
+    repo_index = get_repo_index(version, _base_path)
+    return build_repository_search(repo_index.frame) if repo_index is not None else None
+
+@st.cache_data(max_entries=2)
+def get_activity_bounds(version, _base_path):
+    get_profiler().note_miss()
+    # Slider bounds come from Parquet statistics, no issue/PR rows are read
+    return (load_column_max('issues', 'resolution_time_days', _base_path),
+            load_column_max('pull_requests', 'merge_time_days', _base_path))
+
+@st.cache_resource(max_entries=4096)
+def get_partition(collection, relative_path, partition, checksum, _base_path):
+    # Keyed on the file checksum, so partitions a new release left unchanged are not read again
+    return load_partition(_base_path, relative_path, partition, collection)
+
+@st.cache_resource(max_entries=16)
+def get_activity_index(version, repositories, _manifest):
+    get_profiler().note_miss()
+    # Only the partitions of the selected repositories are read, then indexed by repository
+    def read_partition(base_path, relative_path, partition, collection, checksum):
+        return get_partition(collection, relative_path, partition, checksum, base_path)
+    issues_data = load_activity_partitions(_manifest, 'issues', repositories, read_partition)
+    pr_data = load_activity_partitions(_manifest, 'pull_requests', repositories, read_partition)
+    if issues_data is None or pr_data is None:
+        return None, None
+    return build_activity_index('issues', issues_data), build_activity_index('pull_requests', pr_data)
+
+def get_deferred_activity_index(version, repositories, manifest, default_view):
+    """Issue and PR indexes whose rows are only read if a view or filter needs more than the pre-rendered summary."""
+    def load(position):
+        def load_index():
+            with get_profiler().measure('load:activity', cached=True):
+                index = get_activity_index(version, repositories, manifest)[position]
+            if index is None:
+                raise RuntimeError("Failed to load issue and pull request data")
+            return index
+        return load_index
+    return tuple(DeferredIndex(load(position), repositories, summary['rows'], summary['bounds'])
+                 for position, summary in enumerate((default_view['activity']['issues'], default_view['activity']['pull_requests'])))
+
+def shared_view(value):
+    """Zero-copy, copy-on-write view of a frame (or tuple of frames) cached once per process."""
+    if isinstance(value, tuple):
+        return tuple(shared_view(item) for item in value)
+    return value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+
+# Frames are held once per process (st.cache_data would hand every caller its own unpickled copy)
+@st.cache_resource(max_entries=2)
+def _get_sketches(version, _base_path):
+    get_profiler().note_miss()
+    return load_sketches(_base_path)
+
+def get_sketches(version, base_path):
+    return shared_view(_get_sketches(version, base_path))
+
+# Snapshots live in their own append-only store rather than in the export release
+@st.cache_resource(ttl=3600)
+def _get_snapshots():
+    get_profiler().note_miss()
+    return load_snapshots()
+
+def get_snapshots():
+    return shared_view(_get_snapshots())
+
+@st.cache_resource(max_entries=2)
+def _get_rollups(version, _base_path):
+    get_profiler().note_miss()
+    return load_rollups(base_path=_base_path)
+
+def get_rollups(version, base_path):
+    return shared_view(_get_rollups(version, base_path))
+
+# Figures and metrics of the unfiltered views, pre-rendered by the pipeline with each release
+@st.cache_resource(max_entries=2)
+def get_default_view(version, _base_path):
+    get_profiler().note_miss()
+    return load_default_view(_base_path)
+
+# One figure cache per process, shared by all sessions; keys carry the data version and filters
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+# Per-component timings of profiled reruns, with rolling percentiles over all sessions
+@st.cache_resource
+def get_profiler():
+    return RenderProfiler()
+
+def show_figure(chart_id, key, build):
+    with get_profiler().measure(f"chart:{chart_id}") as record:
+        fig, hit, size = get_figure_cache().get_or_build_entry(key, lambda: build(record))
+        record.update(cache='hit' if hit else 'miss', bytes=size)
+        st.plotly_chart(fig, use_container_width=True)
+
+def frame_rows(*args):
+    return sum(len(arg) for arg in args if isinstance(arg, pd.DataFrame))
+
+def show_chart(version, fingerprint, chart_id, plot, *args):
+    def build(record):
+        record['rows'] = frame_rows(*args)
+        return plot(*args)
+    show_figure(chart_id, (version, fingerprint, chart_id), build)
+
+# Data export: files are written in the background on request, then offered for download
+@st.cache_resource
+def get_export_jobs():
+    return ExportJobs()
+
+EXPORT_DATASETS = {
+    'Repository Data': ('filtered_repo_data', 'repo_data'),
+    'Issues Data': ('filtered_issues_data', 'issues_data'),
+    'PR Data': ('filtered_pr_data', 'pr_data'),
+}
+EXPORT_POLL_SECONDS = 1
+
+def export_key(view_data, file_name, export_format):
+    return view_data['version'], view_data['fingerprint'], file_name, export_format
+
+def export_pending(view_data):
+    export_format = st.session_state.get('export_format', next(iter(EXPORT_FORMATS)))
+    jobs = [get_export_jobs().get(export_key(view_data, file_name, export_format))
+            for file_name, _ in EXPORT_DATASETS.values()]
+    return any(job is not None and not job.done() for job in jobs)
+
+def display_export(view_data):
+    export_format = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key="export_format")
+    _, mime = EXPORT_FORMATS[export_format]
+    jobs = get_export_jobs()
+    for col, (label, (file_name, frame_key)) in zip(st.columns(3), EXPORT_DATASETS.items()):
+        key = export_key(view_data, file_name, export_format)
+        with col:
+            job = jobs.get(key)
+            if job is None:
+                if st.button(f"Export {label}", key=f"export_{file_name}"):
+                    jobs.submit(key, file_name, view_frame(view_data, frame_key), export_format)
+                    # A full rerun re-creates this fragment with polling until the file is ready
+                    st.rerun()
+            elif not job.done():
+                st.caption(f"Preparing {label}...")
+            elif job.exception() is not None:
+                st.error(f"Export of {label} failed: {job.exception()}")
+                if st.button("Retry", key=f"retry_{file_name}"):
+                    jobs.submit(key, file_name, view_frame(view_data, frame_key), export_format)
+                    st.rerun()
+            else:
+                with open(job.result(), 'rb') as f:
+                    st.download_button(f"Download {label}", f, file_name=os.path.basename(job.result()),
+                                       mime=mime, key=f"download_{file_name}")
 
 @st.cache_resource
 def load_lottie_files():
     lottie_files = ["github", "linkedin", "profile"]
     return {file: json.load(open(f"dashboard/assets/images/{file}.json")) for file in lottie_files}
 
+def view_frame(view_data, name):
+    """Filtered frame of the view: issue/PR rows are only selected (and, if needed, read) on first use."""
+    if name == 'issues_data':
+        return view_data['activity']()[0]
+    if name == 'pr_data':
+        return view_data['activity']()[1]
+    return view_data[name]
+
+def get_view_rollups(view_data):
+    """Rollup cells of the filtered repositories, or None when the views must use the rows."""
+    if not view_data['use_rollups']:
+        return None
+    rollup_data = get_rollups(view_data['version'], view_data['base_path'])
+    return filter_rollups(rollup_data, view_data['repo_data']['name']) if rollup_data is not None else None
+
+def get_view_sketches(view_data):
+    """Quantile sketches of the filtered repositories, or None when the views must use the rows."""
+    quantile_sketches = view_data['quantile_sketches']
+    if not view_data['use_rollups'] or quantile_sketches is None:
+        return None
+    return quantile_sketches[quantile_sketches['repository'].isin(view_data['repo_data']['name'])]
+
+def view_rows(view_data, rollups):
+    """Issue and PR rows for components that fall back to them when there are no rollups."""
+    return (view_frame(view_data, 'issues_data'), view_frame(view_data, 'pr_data')) if rollups is None else (None, None)
+
+def show_view_chart(view_data, chart_id):
+    default_view = view_data['default_view']
+    if default_view is not None and chart_id in default_view['charts']:
+        # Unfiltered: serve the figure the pipeline rendered, no rows are touched
+        show_figure(chart_id, (view_data['version'], 'default', chart_id),
+                    lambda record: load_default_figure(view_data['base_path'], chart_id))
+        return
+
+    plot, arguments = VIEW_CHARTS[chart_id]
+    def build(record):
+        view_args = {'rollups': get_view_rollups, 'quantile_sketches': get_view_sketches}
+        args = [view_args[name](view_data) if name in view_args else view_frame(view_data, name) for name in arguments]
+        record['rows'] = frame_rows(*args)
+        return plot(*args)
+    show_figure(chart_id, (view_data['version'], view_data['fingerprint'], chart_id), build)
+
+def display_overview(view_data):
+    profiler = get_profiler()
+    default_view = view_data['default_view']
+    with profiler.measure('key_metrics') as record:
+        if default_view is not None:
+            metrics = default_view['metrics']
+            record['cache'] = 'hit'
+        else:
+            pr_data = view_frame(view_data, 'pr_data')
+            metrics = key_metrics(view_data['repo_data'], pr_data, view_data['contributor_sketches'])
+            record['rows'] = frame_rows(view_data['repo_data'], pr_data)
+        display_key_metrics(metrics)
+    with profiler.measure('executive_summary') as record:
+        rollups = get_view_rollups(view_data)
+        rows = view_rows(view_data, rollups)
+        record['rows'] = frame_rows(view_data['repo_data'], rollups, *rows)
+        generate_executive_summary(view_data['repo_data'], *rows, rollups)
+
+def display_repositories(view_data):
+    col1, col2 = st.columns(2)
+    with col1:
+        show_view_chart(view_data, 'repository_growth')
+    with col2:
+        show_view_chart(view_data, 'contributor_activity')
+
+    col1, col2 = st.columns(2)
+    with col1:
+        show_view_chart(view_data, 'repository_size_distribution')
+    with col2:
+        show_view_chart(view_data, 'top_repositories')
+
+    snapshot_data = get_snapshots()
+    if not snapshot_data.empty:
+        # The snapshot store is versioned by its newest point rather than by the release
+        snapshot_version = (len(snapshot_data), str(snapshot_data['timestamp'].max()))
+        filtered_snapshots = snapshot_data[snapshot_data['repository'].isin(view_data['repo_data']['full_name'])]
+        show_chart(snapshot_version, view_data['fingerprint'], 'star_growth', plot_star_growth, filtered_snapshots)
+
+def display_issues_prs(view_data):
+    col1, col2 = st.columns(2)
+    with col1:
+        show_view_chart(view_data, 'issue_resolution_time')
+    with col2:
+        show_view_chart(view_data, 'pull_request_merge_time')
+
+    show_view_chart(view_data, 'issue_pr_funnel')
+    show_view_chart(view_data, 'issues_vs_prs')
+
+def display_insights(view_data):
+    with get_profiler().measure('advanced_metrics') as record:
+        rollups = get_view_rollups(view_data)
+        quantile_sketches = get_view_sketches(view_data)
+        # Duration percentiles fall back to the rows of releases exported without sketches
+        rows = view_rows(view_data, rollups if quantile_sketches is not None else None)
+        record['rows'] = frame_rows(view_data['repo_data'], rollups, quantile_sketches, *rows)
+        advanced_metrics = display_advanced_metrics(view_data['repo_data'], *rows, rollups, quantile_sketches)
+        st.plotly_chart(advanced_metrics, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        show_view_chart(view_data, 'correlation_heatmap')
+    with col2:
+        show_view_chart(view_data, 'repository_treemap')
+
+# Views of the main area, rendered one at a time
+VIEWS = {
+    "Overview": display_overview,
+    "Repositories": display_repositories,
+    "Issues & PRs": display_issues_prs,
+    "Insights": display_insights,
+}
+
+def select_activity(issues_index, issue_query, pr_index, pr_query):
+    with get_profiler().measure('activity') as record:
+        issues_data, pr_data = issues_index.filter(**issue_query), pr_index.filter(**pr_query)
+        record['rows'] = frame_rows(issues_data, pr_data)
+    return issues_data, pr_data
+
+def display_render_profile(records):
+    """Debug panel of the profiled rerun: this rerun's components and the rolling percentiles of all profiled reruns."""
+    with st.expander("Render Profile", expanded=True):
+        st.markdown("#### This Rerun")
+        st.dataframe(pd.DataFrame(records), hide_index=True, use_container_width=True)
+        st.markdown(f"#### Rolling Percentiles (last {RENDER_PROFILE_WINDOW} reruns per component)")
+        st.dataframe(get_profiler().percentiles(), hide_index=True, use_container_width=True)
+
 # Refactor main to use asyncio
 def main():
     # Header
     st.markdown("<h1 style='text-align: center;'>OSS-Pulse</h1>", unsafe_allow_html=True)
     st.markdown("<p style='text-align: center;'>Analyzing Open Source Software Trends and Metrics</p>", unsafe_allow_html=True)
 
+    profiler = get_profiler()
+
     # Load data
-    repo_data, issues_data, pr_data = get_data()
+    with profiler.measure('load', cached=True) as record:
+        manifest = load_manifest()
+        version, base_path = manifest['version'], manifest['path']
+        repo_index = get_repo_index(version, base_path)
+        activity_bounds = get_activity_bounds(version, base_path)
 
-    if repo_data is None or issues_data is None or pr_data is None:
-        st.error("Failed to load data. Please check your data source and try again.")
-        return
+        if repo_index is None or None in activity_bounds:
+            st.error("Failed to load data. Please check your data source and try again.")
+            return
+
+        quantile_sketches, contributor_sketches = get_sketches(version, base_path)
+        record['rows'] = len(repo_index)
 
     # Sidebar filters
-    with st.sidebar:
-        filters = display_sidebar(repo_data, issues_data, pr_data)
-        filtered_repo_data, filtered_issues_data, filtered_pr_data = apply_filters(repo_data, issues_data, pr_data, filters)
+    with st.sidebar, profiler.measure('filters') as filter_record:
+        with profiler.measure('load:search_index', cached=True):
+            search_index = get_search_index(version, base_path)
+        filters = display_sidebar(repo_index, search_index, *activity_bounds)
+        filtered_repo_data = apply_filters(repo_index, search_index, filters)
+
+        default_view = get_default_view(version, base_path)
+        repositories = tuple(sorted(filtered_repo_data['name']))
+        if default_view is not None and len(filtered_repo_data) == len(repo_index):
+            # Unfiltered: the pre-rendered summary answers the filter widgets, rows are read only if a view needs them
+            issues_index, pr_index = get_deferred_activity_index(version, repositories, manifest, default_view)
+        else:
+            # Repository-level filters are pushed down into the issue/PR reads
+            with profiler.measure('load:activity', cached=True):
+                issues_index, pr_index = get_activity_index(version, repositories, manifest)
+            if issues_index is None or pr_index is None:
+                st.error("Failed to load data. Please check your data source and try again.")
+                return
+
+        st.session_state['advanced_filters'] = None
         if not filtered_repo_data.empty:
-            filtered_repo_data, filtered_issues_data, filtered_pr_data = apply_advanced_filters(filtered_repo_data, filtered_issues_data, filtered_pr_data)
+            filtered_repo_data, issue_query, pr_query = apply_advanced_filters(filtered_repo_data, issues_index, pr_index)
         else:
             st.warning("No data available after applying filters. Please adjust your filter criteria.")
+            return
+        filter_record['rows'] = len(repo_index)
 
-    # Main content
-    tab1, tab2, tab3, tab4 = st.tabs(["Overview", "Repositories", "Issues & PRs", "Insights"])
-
-    with tab1:
-        display_key_metrics(filtered_repo_data, filtered_issues_data, filtered_pr_data)
-        generate_executive_summary(filtered_repo_data, filtered_issues_data, filtered_pr_data)
-
-    with tab2:
-        col1, col2 = st.columns(2)
-        with col1:
-            repository_growth = plot_repository_growth(filtered_repo_data)
-            st.plotly_chart(repository_growth, use_container_width=True)
-        with col2:
-            contributor_activity = plot_contributor_activity(filtered_repo_data)
-            st.plotly_chart(contributor_activity, use_container_width=True)
-
-        col1, col2 = st.columns(2)
-        with col1:
-            repository_size_distribution = plot_repository_size_distribution(filtered_repo_data)
-            st.plotly_chart(repository_size_distribution, use_container_width=True)
-        with col2:
-            display_top_repositories(filtered_repo_data)
-
-    with tab3:
-        col1, col2 = st.columns(2)
-        with col1:
-            issue_resolution_time = plot_issue_resolution_time(filtered_issues_data)
-            st.plotly_chart(issue_resolution_time, use_container_width=True)
-        with col2:
-            pull_request_merge_time = plot_pull_request_merge_time(filtered_pr_data)
-            st.plotly_chart(pull_request_merge_time, use_container_width=True)
-
-        issue_pr_funnel = plot_issue_pr_funnel(filtered_issues_data, filtered_pr_data)
-        st.plotly_chart(issue_pr_funnel, use_container_width=True)
-        issues_vs_prs = plot_issues_vs_prs(filtered_repo_data, filtered_issues_data, filtered_pr_data)
-        st.plotly_chart(issues_vs_prs, use_container_width=True)
-
-    with tab4:
-        advanced_metrics = display_advanced_metrics(filtered_repo_data, filtered_issues_data, filtered_pr_data)
-        st.plotly_chart(advanced_metrics, use_container_width=True)
+    # Answer aggregate views from the rollup cube unless issue/PR-level filters narrowed the rows
+    use_rollups = not st.session_state.get('row_filters_active', False)
+    unfiltered = use_rollups and len(filtered_repo_data) == len(repo_index)
+
+    # Figures are cached on what produced the filtered frames, never on the frames themselves
+    view_data = {
+        'version': version,
+        'base_path': base_path,
+        'fingerprint': filter_fingerprint(filters, st.session_state.get('advanced_filters'), use_rollups),
+        'use_rollups': use_rollups,
+        'repo_data': filtered_repo_data,
+        # Issue and PR rows are selected on first use; the pre-rendered views need none
+        'activity': functools.cache(lambda: select_activity(issues_index, issue_query, pr_index, pr_query)),
+        'default_view': default_view if unfiltered else None,
+        'quantile_sketches': quantile_sketches,
+        'contributor_sketches': contributor_sketches,
+    }
 
-        col1, col2 = st.columns(2)
-        with col1:
-            correlation_heatmap = plot_correlation_heatmap(filtered_repo_data)
-            st.plotly_chart(correlation_heatmap, use_container_width=True)
-        with col2:
-            repository_treemap = plot_repository_treemap(filtered_repo_data)
-            st.plotly_chart(repository_treemap, use_container_width=True)
+    # Main content: only the selected view is computed on a rerun
+    view = st.radio("View", list(VIEWS), horizontal=True, label_visibility="collapsed", key="view")
+    with profiler.measure(f"view:{view}"):
+        VIEWS[view](view_data)
 
     # Footer and Export
     st.markdown("---")
     st.markdown("<p style='text-align: center;'>Created with ❤️ by Mebarek</p>", unsafe_allow_html=True)
 
+    with st.expander("Chart Cache"):
+        stats = get_figure_cache().stats()
+        st.caption(f"{stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), "
+                   f"{stats['entries']} figures in {stats['bytes'] / 2**20:.1f} MiB, {stats['evictions']} evicted")
+
     with st.expander("Export Data"):
         st.markdown("### Download Filtered Data")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown(get_download_link(filtered_repo_data, 'filtered_repo_data.csv', 'Repository Data'), unsafe_allow_html=True)
-        with col2:
-            st.markdown(get_download_link(filtered_issues_data, 'filtered_issues_data.csv', 'Issues Data'), unsafe_allow_html=True)
-        with col3:
-            st.markdown(get_download_link(filtered_pr_data, 'filtered_pr_data.csv', 'PR Data'), unsafe_allow_html=True)
+        # Runs as a fragment: export clicks do not rerun the dashboard, and it polls only while a file is being written
+        st.fragment(display_export, run_every=EXPORT_POLL_SECONDS if export_pending(view_data) else None)(view_data)
 
     # Sidebar Footer
     st.sidebar.markdown("---")
@@ -176,4 +444,9 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    # Opt-in: RENDER_PROFILER profiles every session, `?profile` in the URL one session
+    profiling = RENDER_PROFILER or 'profile' in st.query_params
+    with get_profiler().rerun(profiling, view=st.session_state.get('view')) as records:
+        main()
+    if profiling:
+        display_render_profile(records)
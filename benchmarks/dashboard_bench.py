@@ -0,0 +1,164 @@
+# benchmarks/dashboard_bench.py
+
+import os
+import sys
+import logging
+import argparse
+import tempfile
+import pandas as pd
+from benchmarks.harness import (
+    BASELINES_DIR, DEFAULT_TOLERANCE, compare, format_results, load_baseline, measure_against, save_baseline
+)
+from benchmarks.synthetic import DATASETS, write_release
+from dashboard.components.executive_summary import generate_executive_summary
+from dashboard.components.filters import apply_advanced_filters
+from dashboard.components.metrics_display import display_advanced_metrics, key_metrics
+from dashboard.components.sidebar import apply_filters
+from dashboard.data_loader import load_activity, load_repositories, load_rollups, load_sketches
+from dashboard.data_processing.rollups import filter_rollups
+from dashboard.filter_engine import build_activity_index, build_repository_index
+from dashboard.prerender import VIEW_CHARTS
+from dashboard.search_index import build_repository_search
+
+BASELINE_FILE = os.path.join(BASELINES_DIR, 'dashboard.json')
+
+def load_release(release_dir):
+    """What the dashboard holds after its loaders ran: repositories, issues, PRs, sketches and rollups."""
+    quantile_sketches, contributor_sketches = load_sketches(release_dir)
+    return {
+        'repo_data': load_repositories(release_dir),
+        'issues_data': load_activity('issues', base_path=release_dir),
+        'pr_data': load_activity('pull_requests', base_path=release_dir),
+        'quantile_sketches': quantile_sketches,
+        'contributor_sketches': contributor_sketches,
+        'rollup_data': load_rollups(base_path=release_dir),
+    }
+
+def default_filters(repo_index):
+    """The sidebar selections of a fresh session: every date, category, star and fork count."""
+    start, end = (value.date() for value in repo_index.bounds('created_at'))
+    return {
+        'date_range': (start, end),
+        'selected_category': repo_index.categories('size_category'),
+        'star_range': tuple(int(value) for value in repo_index.bounds('stars')),
+        'fork_range': tuple(int(value) for value in repo_index.bounds('forks')),
+        'include_stale': True,
+    }
+
+def narrowed_filters(repo_index):
+    """A typical narrowed selection: a search term, no stale repositories, the upper half of the star range."""
+    filters = default_filters(repo_index)
+    low, high = filters['star_range']
+    return {**filters, 'search_term': 'data', 'include_stale': False, 'star_range': ((low + high) // 2, high)}
+
+def dashboard_stages(release_dir):
+    """
+    Stages of the dashboard data path, in the order a cold session runs them.
+
+    Returns:
+    - dict of stage name -> (setup, run, rows); see `harness.measure`
+    """
+    data = load_release(release_dir)
+    repo_data, issues_data, pr_data = data['repo_data'], data['issues_data'], data['pr_data']
+    rollups = filter_rollups(data['rollup_data'], repo_data['name']) if data['rollup_data'] is not None else None
+    repo_index = build_repository_index(repo_data)
+    selection = tuple(repo_data.nlargest(max(1, len(repo_data) // 10), 'stars')['name'])
+    activity_rows = len(issues_data) + len(pr_data)
+
+    def fresh_repository_indexes():
+        index = build_repository_index(repo_data)
+        return index, build_repository_search(index.frame)
+
+    def run_filters(indexes):
+        index, search_index = indexes
+        apply_filters(index, search_index, default_filters(index))
+        apply_filters(index, search_index, narrowed_filters(index))
+
+    def fresh_activity_indexes():
+        return build_activity_index('issues', issues_data), build_activity_index('pull_requests', pr_data)
+
+    def run_advanced_filters(indexes):
+        issues_index, pr_index = indexes
+        _, issue_query, pr_query = apply_advanced_filters(repo_index.frame, issues_index, pr_index)
+        issues_index.filter(**issue_query)
+        pr_index.filter(**pr_query)
+
+    stages = {
+        'load_data': (None, lambda _: load_release(release_dir), len(repo_data) + activity_rows),
+        'load_selection': (None, lambda _: (load_activity('issues', selection, base_path=release_dir),
+                                            load_activity('pull_requests', selection, base_path=release_dir)),
+                           activity_rows),
+        'build_indexes': (None, lambda _: (fresh_repository_indexes(), fresh_activity_indexes()),
+                          len(repo_data) + activity_rows),
+        'apply_filters': (fresh_repository_indexes, run_filters, len(repo_data)),
+        'apply_advanced_filters': (fresh_activity_indexes, run_advanced_filters, activity_rows),
+    }
+
+    view_data = {'repo_data': repo_index.frame, 'issues_data': issues_data, 'pr_data': pr_data, 'rollups': rollups,
+                 'quantile_sketches': data['quantile_sketches']}
+    for chart_id, (plot, arguments) in VIEW_CHARTS.items():
+        args = [view_data[name] for name in arguments]
+        stages[f"plot:{chart_id}"] = (None, lambda _, plot=plot, args=args: plot(*args),
+                                      sum(len(arg) for arg in args if isinstance(arg, pd.DataFrame)))
+
+    stages['key_metrics'] = (None, lambda _: key_metrics(repo_data, pr_data, data['contributor_sketches']),
+                             len(repo_data) + len(pr_data))
+    stages['executive_summary'] = (None, lambda _: generate_executive_summary(repo_data, None, None, rollups),
+                                   len(repo_data) + len(rollups))
+    stages['advanced_metrics'] = (None, lambda _: display_advanced_metrics(repo_data, None, None, rollups,
+                                                                           data['quantile_sketches']),
+                                  len(repo_data) + len(rollups))
+    return stages
+
+def run_dataset(name, data_dir, repeat, baseline=None, tolerance=DEFAULT_TOLERANCE):
+    """
+    Benchmark one dataset, generating its release in `data_dir` unless it is
+    there from an earlier run. Stages that look slower than `baseline` are re-measured.
+    """
+    repositories, issues = DATASETS[name]
+    release_dir = os.path.join(data_dir, f"{name}-{repositories}-{issues}")
+    if not os.path.exists(os.path.join(release_dir, 'repo_data.parquet')):
+        write_release(release_dir, repositories, issues)
+
+    results = {}
+    for stage, (setup, run, rows) in dashboard_stages(release_dir).items():
+        results[stage] = {**measure_against(run, setup, repeat, (baseline or {}).get(stage), tolerance), 'rows': rows}
+        logging.info(f"{name} {stage}: {results[stage]['seconds']}s, {results[stage]['peak_mib']} MiB")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard data path on synthetic datasets")
+    # Checked below: argparse rejects the default list itself when `choices` is set
+    parser.add_argument('datasets', nargs='*', default=['smoke'],
+                        help=f"datasets to run: {', '.join(DATASETS)} (default: smoke)")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'oss-pulse-bench'),
+                        help="where the synthetic releases are generated and reused")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage, the best one counts")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline results to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown or memory growth per stage, as a share of the baseline")
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the new baseline")
+    args = parser.parse_args()
+    unknown = [dataset for dataset in args.datasets if dataset not in DATASETS]
+    if unknown:
+        parser.error(f"unknown datasets: {', '.join(unknown)}")
+
+    # Components draw Streamlit elements; outside `streamlit run` those are no-ops, but Streamlit warns about each
+    logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').disabled = True
+
+    baseline = load_baseline(args.baseline)
+    all_results, regressions = {}, []
+    for dataset in args.datasets:
+        expected = None if args.update_baseline else baseline.get(dataset)
+        all_results[dataset] = run_dataset(dataset, args.data_dir, args.repeat, expected, args.tolerance)
+        print(f"\n{dataset} ({DATASETS[dataset][0]} repositories, {DATASETS[dataset][1]} issues)")
+        print(format_results(all_results[dataset], baseline.get(dataset)))
+        regressions += [f"{dataset} {regression}"
+                        for regression in compare(all_results[dataset], baseline.get(dataset, {}), args.tolerance)]
+
+    if args.update_baseline:
+        save_baseline(args.baseline, all_results)
+        print(f"\nBaseline updated: {args.baseline}")
+    elif regressions:
+        print("\nRegressions against the baseline:\n" + '\n'.join(regressions))
+        sys.exit(1)
@@ -0,0 +1,332 @@
+# benchmarks/fake_github.py
+
+import json
+import time
+import zlib
+import random
+import hashlib
+import argparse
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+# Largest number of issues (PRs come on top) generated for one repository
+MAX_ISSUES = 5000
+# Primary rate limit per token, as on github.com
+RATE_LIMIT = 5000
+RATE_LIMIT_WINDOW = 3600
+# Repositories whose issues and PRs are kept generated in memory
+CACHED_REPOSITORIES = 256
+
+_WORDS = ['fix', 'crash', 'when', 'parsing', 'add', 'support', 'for', 'config', 'docs', 'update', 'error', 'memory',
+          'leak', 'in', 'server', 'client', 'build', 'fails', 'on', 'windows', 'improve', 'performance', 'of', 'cache']
+
+def _timestamp(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _user(rng: random.Random, users: int) -> dict:
+    # A few heavy contributors and a long tail, like real projects
+    user_id = min(int(rng.paretovariate(1.1)), users)
+    return {'login': f"user{user_id}", 'id': user_id, 'type': 'User', 'site_admin': False}
+
+class SyntheticGitHub:
+    """
+    Deterministic GitHub-shaped data for any `owner/repo`.
+
+    Every repository is generated from its full name and `seed`, so any name
+    works (including the ones the scheduler collects) and every run serves
+    the same data. Sizes are heavy-tailed: most repositories have a few dozen
+    issues, a few have thousands (up to `max_issues`), with about half as
+    many pull requests. Activity falls within the two years before `now`.
+    """
+
+    def __init__(self, seed: int = 0, max_issues: int = MAX_ISSUES, now: Optional[datetime] = None):
+        self.seed = seed
+        self.max_issues = max_issues
+        self.now = (now or datetime.now(timezone.utc)).replace(microsecond=0)
+        self._items = lru_cache(maxsize=CACHED_REPOSITORIES)(self._generate_items)
+
+    def _rng(self, full_name: str, salt: str = '') -> random.Random:
+        return random.Random(zlib.crc32(f"{self.seed}:{full_name}:{salt}".encode()))
+
+    def repository(self, owner: str, repo: str) -> dict:
+        """The `GET /repos/{owner}/{repo}` payload."""
+        full_name = f"{owner}/{repo}"
+        rng = self._rng(full_name)
+        issues, pulls = self._sizes(full_name)
+        stars = int(min(rng.paretovariate(1.2) * 50 * (1 + issues / 100), 400_000))
+        created = self.now - timedelta(days=rng.randint(30, 4000))
+        return {
+            'id': zlib.crc32(full_name.encode()),
+            'node_id': hashlib.sha1(full_name.encode()).hexdigest()[:20],
+            'name': repo,
+            'full_name': full_name,
+            'owner': {'login': owner, 'id': zlib.crc32(owner.encode()), 'type': 'Organization'},
+            'private': False,
+            'description': ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(3, 12))).capitalize(),
+            'fork': False,
+            'created_at': _timestamp(created),
+            'updated_at': _timestamp(self.now - timedelta(hours=rng.randint(0, 2000))),
+            'pushed_at': _timestamp(self.now - timedelta(hours=rng.randint(0, 500))),
+            'homepage': None,
+            'size': rng.randint(100, 2_000_000),
+            'stargazers_count': stars,
+            'watchers_count': stars,
+            'language': rng.choice(['Python', 'JavaScript', 'Go', 'Rust', 'C++', 'Java', 'TypeScript']),
+            'forks_count': int(stars * rng.uniform(0.05, 0.4)),
+            'open_issues_count': sum(1 for item in self._items(full_name) if item['state'] == 'open'),
+            'default_branch': 'main',
+            'license': {'key': 'mit', 'name': 'MIT License'},
+        }
+
+    def _sizes(self, full_name: str) -> Tuple[int, int]:
+        rng = self._rng(full_name, 'size')
+        issues = min(int(rng.paretovariate(0.9) * 20), self.max_issues)
+        return issues, issues // 2 + rng.randint(0, 5)
+
+    def _generate_items(self, full_name: str) -> List[dict]:
+        """Issues and PRs of a repository, newest first, numbered in creation order like on GitHub."""
+        rng = self._rng(full_name, 'items')
+        issues, pulls = self._sizes(full_name)
+        kinds = ['issue'] * issues + ['pull'] * pulls
+        rng.shuffle(kinds)
+        users = max(10, (issues + pulls) // 5)
+        start = self.now - timedelta(days=730)
+        created = sorted(start + timedelta(seconds=rng.randint(0, 730 * 86400)) for _ in kinds)
+
+        items = []
+        for number, (kind, created_at) in enumerate(zip(kinds, created), start=1):
+            closed_at = created_at + timedelta(seconds=int(rng.expovariate(1 / (5 * 86400))))
+            if closed_at > self.now or rng.random() < 0.15:
+                closed_at = None
+            merged_at = closed_at if kind == 'pull' and closed_at is not None and rng.random() < 0.7 else None
+            updated_at = closed_at or created_at + timedelta(seconds=int(rng.expovariate(1 / 86400)))
+            url = f"https://api.github.com/repos/{full_name}/issues/{number}"
+            item = {
+                'url': url,
+                'html_url': f"https://github.com/{full_name}/{'pull' if kind == 'pull' else 'issues'}/{number}",
+                'id': zlib.crc32(f"{full_name}#{number}".encode()),
+                'number': number,
+                'title': ' '.join(rng.choice(_WORDS) for _ in range(rng.randint(3, 9))).capitalize(),
+                'user': _user(rng, users),
+                'labels': [{'name': rng.choice(['bug', 'enhancement', 'docs', 'question'])}] if rng.random() < 0.6 else [],
+                'state': 'open' if closed_at is None else 'closed',
+                'locked': False,
+                'comments': int(rng.expovariate(1 / 4)),
+                'created_at': _timestamp(created_at),
+                'updated_at': _timestamp(min(updated_at, self.now)),
+                'closed_at': _timestamp(closed_at) if closed_at else None,
+                'author_association': rng.choice(['MEMBER', 'CONTRIBUTOR', 'NONE']),
+                'body': ' '.join(rng.choice(_WORDS) for _ in range(int(rng.expovariate(1 / 60)))),
+                '_kind': kind,
+            }
+            if kind == 'pull':
+                item['pull_request'] = {'url': url.replace('/issues/', '/pulls/'), 'merged_at': _timestamp(merged_at) if merged_at else None}
+            items.append(item)
+        items.reverse()
+        return items
+
+    def issues(self, owner: str, repo: str, state: str = 'open', since: Optional[str] = None) -> List[dict]:
+        """`GET /repos/{owner}/{repo}/issues`: issues and PRs (PRs carry `pull_request`), newest first."""
+        items = self._items(f"{owner}/{repo}")
+        if since:
+            # GitHub takes ISO 8601; naive times are UTC
+            since = datetime.fromisoformat(since)
+            since = _timestamp(since if since.tzinfo else since.replace(tzinfo=timezone.utc))
+        return [_public(item) for item in items
+                if (state == 'all' or item['state'] == state) and (since is None or item['updated_at'] >= since)]
+
+    def pulls(self, owner: str, repo: str, state: str = 'open') -> List[dict]:
+        """`GET /repos/{owner}/{repo}/pulls`: pull requests, newest first."""
+        full_name = f"{owner}/{repo}"
+        base = {'ref': 'main', 'repo': {'full_name': full_name, 'name': repo}}
+        return [{**_public(item, 'pull_request'), 'url': item['pull_request']['url'],
+                 'merged_at': item['pull_request']['merged_at'], 'draft': False, 'base': base,
+                 'head': {'ref': f"branch-{item['number']}"}}
+                for item in self._items(full_name)
+                if item['_kind'] == 'pull' and (state == 'all' or item['state'] == state)]
+
+def _public(item: dict, *exclude: str) -> dict:
+    return {key: value for key, value in item.items() if not key.startswith('_') and key not in exclude}
+
+class RateLimiter:
+    """GitHub's primary rate limit: `limit` requests per token per window, reset all at once."""
+
+    def __init__(self, limit: int = RATE_LIMIT, window: int = RATE_LIMIT_WINDOW):
+        self.limit = limit
+        self.window = window
+        self._used: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def status(self, token: str, consume: bool) -> Tuple[bool, Dict[str, int]]:
+        """
+        Count one request for `token` if `consume`.
+
+        Returns:
+        - (whether the request is allowed, the X-RateLimit-* values to send back)
+        """
+        with self._lock:
+            now = time.time()
+            reset, used = self._used.get(token, (now + self.window, 0))
+            if now >= reset:
+                reset, used = now + self.window, 0
+            allowed = used < self.limit
+            if consume and allowed:
+                used += 1
+            self._used[token] = (reset, used)
+        return allowed, {'limit': self.limit, 'remaining': self.limit - used, 'reset': int(reset), 'used': used}
+
+class FakeGitHubServer(ThreadingHTTPServer):
+    """Threaded HTTP server answering the GitHub REST endpoints `data_collection/github_api.py` calls."""
+
+    daemon_threads = True
+
+    def __init__(self, address, data: SyntheticGitHub, rate_limiter: RateLimiter, latency: float = 0.0):
+        super().__init__(address, FakeGitHubHandler)
+        self.data = data
+        self.rate_limiter = rate_limiter
+        self.latency = latency
+        self.stats = {'requests': 0, 'not_modified': 0, 'rate_limited': 0, 'not_found': 0, 'bytes': 0}
+        self.stats_lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, **increments) -> None:
+        with self.stats_lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """
+    Serves repositories, issues, pulls and `/rate_limit` like api.github.com:
+
+    - `per_page` (max 100) / `page` pagination with a `Link` header (first,
+      prev, next, last)
+    - weak `ETag`s; `If-None-Match` with the current one gets `304 Not
+      Modified`, which does not count against the rate limit
+    - `X-RateLimit-*` headers per token, and `403` once a token's requests
+      in the current window are used up
+    - `GET /_stats` (not a GitHub endpoint) returns the server's counters
+    """
+
+    server: FakeGitHubServer
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logging.debug(f"{self.address_string()} {format % args}")
+
+    def _send(self, status: int, payload=None, headers: Optional[Dict[str, str]] = None, body: Optional[bytes] = None) -> None:
+        if body is None:
+            body = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.count(requests=1, bytes=len(body))
+
+    def _link_header(self, path: str, query: Dict[str, str], page: int, last: int) -> Optional[str]:
+        base = f"http://{self.headers.get('Host', '%s:%s' % self.server.server_address[:2])}{path}"
+        targets = ([('next', page + 1), ('last', last)] if page < last else []) + \
+                  ([('first', 1), ('prev', page - 1)] if page > 1 else [])
+        return ', '.join(f"<{base}?{urlencode({**query, 'page': target})}>; rel=\"{rel}\"" for rel, target in targets) or None
+
+    def do_GET(self):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part]
+
+        if parts == ['_stats']:
+            with self.server.stats_lock:
+                return self._send(200, dict(self.server.stats))
+
+        token = self.headers.get('Authorization', '').removeprefix('token ').removeprefix('Bearer ') or self.client_address[0]
+        # Like GitHub, /rate_limit is free; other requests are counted unless they end as a 304
+        allowed, rate = self.server.rate_limiter.status(token, consume=False)
+        headers = {'X-RateLimit-Limit': str(rate['limit']), 'X-RateLimit-Remaining': str(rate['remaining']),
+                   'X-RateLimit-Reset': str(rate['reset']), 'X-RateLimit-Used': str(rate['used']),
+                   'X-RateLimit-Resource': 'core'}
+
+        if parts == ['rate_limit']:
+            core = {key: rate[key] for key in ('limit', 'remaining', 'reset', 'used')}
+            return self._send(200, {'resources': {'core': core}, 'rate': core}, headers)
+        if not allowed:
+            self.server.count(rate_limited=1)
+            return self._send(403, {'message': "API rate limit exceeded for this token.",
+                                    'documentation_url': 'https://docs.github.com/rest/overview/rate-limits-for-the-rest-api'},
+                              {**headers, 'Retry-After': str(max(0, rate['reset'] - int(time.time())))})
+
+        data = self.server.data
+        if len(parts) == 3 and parts[0] == 'repos':
+            payload, paginated = data.repository(parts[1], parts[2]), False
+        elif len(parts) == 4 and parts[0] == 'repos' and parts[3] == 'issues':
+            payload, paginated = data.issues(parts[1], parts[2], query.get('state', 'open'), query.get('since')), True
+        elif len(parts) == 4 and parts[0] == 'repos' and parts[3] == 'pulls':
+            payload, paginated = data.pulls(parts[1], parts[2], query.get('state', 'open')), True
+        else:
+            self.server.count(not_found=1)
+            return self._send(404, {'message': 'Not Found'}, headers)
+
+        if paginated:
+            per_page = min(max(int(query.get('per_page', 30)), 1), 100)
+            page = max(int(query.get('page', 1)), 1)
+            last = max(1, -(-len(payload) // per_page))
+            link = self._link_header(url.path, {key: value for key, value in query.items() if key != 'page'}, page, last)
+            payload = payload[(page - 1) * per_page:page * per_page]
+            if link:
+                headers['Link'] = link
+
+        body = json.dumps(payload).encode()
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        headers['ETag'] = etag
+        if self.headers.get('If-None-Match') == etag:
+            self.server.count(not_modified=1)
+            return self._send(304, None, headers)
+
+        _, rate = self.server.rate_limiter.status(token, consume=True)
+        headers.update({'X-RateLimit-Remaining': str(rate['remaining']), 'X-RateLimit-Used': str(rate['used'])})
+        self._send(200, headers=headers, body=body)
+
+def serve(host: str = '127.0.0.1', port: int = 0, seed: int = 0, max_issues: int = MAX_ISSUES,
+          rate_limit: int = RATE_LIMIT, rate_window: int = RATE_LIMIT_WINDOW, latency: float = 0.0) -> FakeGitHubServer:
+    """
+    Start a fake GitHub API server on a background thread (`port=0` picks a free port).
+
+    Point the collector at it with `GITHUB_API_URL=<server.url>`; stop it with `server.shutdown()`.
+    """
+    server = FakeGitHubServer((host, port), SyntheticGitHub(seed, max_issues), RateLimiter(rate_limit, rate_window), latency)
+    threading.Thread(target=server.serve_forever, name='fake-github', daemon=True).start()
+    logging.info(f"Fake GitHub API listening on {server.url}")
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve synthetic GitHub data through the REST endpoints the collector uses")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-issues', type=int, default=MAX_ISSUES, help="largest issue count of a repository")
+    parser.add_argument('--rate-limit', type=int, default=RATE_LIMIT, help="requests per token per window")
+    parser.add_argument('--rate-window', type=int, default=RATE_LIMIT_WINDOW, help="rate limit window in seconds")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = FakeGitHubServer((args.host, args.port), SyntheticGitHub(args.seed, args.max_issues),
+                              RateLimiter(args.rate_limit, args.rate_window), args.latency)
+    logging.info(f"Fake GitHub API listening on {server.url}; run the collector with GITHUB_API_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
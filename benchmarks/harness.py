@@ -0,0 +1,203 @@
+# benchmarks/harness.py
+
+import os
+import gc
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Stages slower than their baseline by more than this share fail the run
+DEFAULT_TOLERANCE = 0.25
+# Timing differences below this many seconds are noise, whatever the ratio
+MIN_TIME_DELTA = 0.01
+# Peak memory differences below this many MiB are noise
+MIN_MEMORY_DELTA = 1.0
+# Differences of fewer allocated blocks than this are noise
+MIN_BLOCK_DELTA = 1000
+
+# Metrics `compare` checks by default: (metric, noise floor, unit, scales with machine speed).
+# Metrics that scale are compared after adjusting the baseline by the `calibration` times
+METRICS = (('seconds', MIN_TIME_DELTA, 's', True), ('peak_mib', MIN_MEMORY_DELTA, ' MiB', False))
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+_REFERENCE: Optional[pd.DataFrame] = None
+
+def _reference_workload() -> None:
+    """A fixed sample of the work the benchmarks time: a NumPy sort, a pandas group-by and string handling."""
+    global _REFERENCE
+    if _REFERENCE is None:
+        rng = np.random.default_rng(0)
+        _REFERENCE = pd.DataFrame({
+            'key': rng.integers(0, 1_000, 100_000),
+            'value': rng.random(100_000),
+            'text': rng.choice(np.array(['alpha', 'beta', 'gamma', 'delta'], dtype=object), 100_000),
+        })
+    np.sort(_REFERENCE['value'].to_numpy())
+    _REFERENCE.groupby('key')['value'].agg(['sum', 'max'])
+    _REFERENCE['text'].str.upper()
+
+def _time(run: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+def calibrate(repeat: int = 3) -> float:
+    """
+    Best time of a fixed reference workload over `repeat` runs: how fast
+    this machine is at the moment. Times are gated relative to it, so a
+    baseline holds on a faster or slower machine, and through slow spells
+    of a shared one.
+    """
+    _reference_workload()
+    return round(min(_time(_reference_workload) for _ in range(repeat)), 5)
+
+def measure(run: Callable[[Any], Any], setup: Optional[Callable[[], Any]] = None, repeat: int = 3) -> Dict[str, float]:
+    """
+    Time `run(setup())` and trace its peak memory.
+
+    `setup` builds fresh inputs before every run and is not measured, so
+    memoised state (filter indexes, caches) never carries over between runs.
+    Time is the best of `repeat` untraced runs; peak memory comes from one
+    extra run under tracemalloc, which counts NumPy and pandas buffers too.
+    That run also counts the memory blocks allocated by `run` and still held
+    when it returns (its result and anything it caches): one per Python
+    object, so object columns and per-row temporaries show up there.
+    Each timed run follows a run of the `calibrate` workload, whose best time
+    is kept as `calibration`, measured under the same machine conditions.
+
+    Returns:
+    - dict with `seconds`, `calibration`, `peak_mib` and `allocated_blocks`
+    """
+    timings, calibrations = [], []
+    _reference_workload()
+    for _ in range(repeat):
+        inputs = setup() if setup is not None else None
+        gc.collect()
+        calibrations.append(_time(_reference_workload))
+        start = time.perf_counter()
+        run(inputs)
+        timings.append(time.perf_counter() - start)
+        del inputs
+
+    inputs = setup() if setup is not None else None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        output = run(inputs)
+        _, peak = tracemalloc.get_traced_memory()
+        # Only allocations made since tracing started are in the snapshot, so no baseline snapshot is needed
+        blocks = sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+        del output
+    finally:
+        tracemalloc.stop()
+    return {'seconds': round(min(timings), 4), 'calibration': round(min(calibrations), 5),
+            'peak_mib': round(peak / 2**20, 2), 'allocated_blocks': blocks}
+
+def measure_against(run: Callable[[Any], Any], setup: Optional[Callable[[], Any]], repeat: int,
+                    expected: Optional[dict], tolerance: float = DEFAULT_TOLERANCE, retries: int = 2) -> Dict[str, float]:
+    """
+    `measure`, re-run up to `retries` more times while the result looks like a
+    regression against `expected`, keeping the best time and peak seen. A
+    single noisy run then does not fail the suite, while a real slowdown does.
+    """
+    result = measure(run, setup, repeat)
+    for _ in range(retries):
+        if not expected or not compare({'stage': result}, {'stage': expected}, tolerance):
+            break
+        result = best_of(result, measure(run, setup, repeat))
+    return result
+
+def best_of(result: dict, again: dict) -> dict:
+    """
+    The better of two measurements of the same stage: the time with the lower
+    ratio to its own calibration (time and calibration stay paired), and the
+    lower value of every other metric.
+    """
+    def relative(measurement):
+        return measurement['seconds'] / measurement['calibration'] if measurement.get('calibration') else measurement['seconds']
+
+    faster = min(result, again, key=relative)
+    best = {metric: min(value, again[metric]) if isinstance(value, (int, float)) and metric in again else value
+            for metric, value in result.items()}
+    best.update({metric: faster[metric] for metric in ('seconds', 'calibration') if metric in faster})
+    return best
+
+def machine_scale(result: dict, expected: dict) -> float:
+    """
+    How much slower the machine ran `result` than `expected`, from their
+    calibrations; 1 without them. Never below 1: a faster calibration does
+    not speed up every stage alike (I/O, SQLite), so baselines are only
+    relaxed, never tightened.
+    """
+    if result.get('calibration') and expected.get('calibration'):
+        return max(1.0, result['calibration'] / expected['calibration'])
+    return 1.0
+
+def load_baseline(path: str) -> Dict[str, Dict[str, dict]]:
+    """Stored results: {dataset: {stage: {'seconds': ..., 'peak_mib': ...}}}, empty if there are none yet."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_baseline(path: str, results: Dict[str, Dict[str, dict]]) -> None:
+    """Merge `results` into the baseline at `path`, replacing the datasets they cover."""
+    baseline = load_baseline(path)
+    baseline.update(results)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = DEFAULT_TOLERANCE,
+            metrics: Tuple[Tuple[str, float, str, bool], ...] = METRICS) -> List[str]:
+    """
+    Compare one dataset's stage results against its baseline.
+
+    Metrics that scale with machine speed are compared against the baseline
+    value times `machine_scale`, so a baseline recorded on a faster machine, or
+    during a quieter spell, still applies.
+
+    Returns:
+    - Descriptions of the stages whose `metrics` (by default time and peak
+      memory) grew by more than `tolerance` and by more than the metric's
+      noise floor; stages or metrics missing from the baseline are not compared
+    """
+    regressions = []
+    for stage, result in results.items():
+        expected = baseline.get(stage)
+        if expected is None:
+            continue
+        for metric, floor, unit, scales in metrics:
+            if metric not in expected or metric not in result:
+                continue
+            scale = machine_scale(result, expected) if scales else 1.0
+            reference = expected[metric] * scale
+            if result[metric] > reference * (1 + tolerance) and result[metric] - reference > floor * scale:
+                growth = f" (+{result[metric] / reference - 1:.0%})" if reference else ''
+                adjusted = f", {reference:.4g}{unit} at this machine's speed" if scale != 1.0 else ''
+                regressions.append(f"{stage}: {metric} {result[metric]}{unit}, "
+                                   f"baseline {expected[metric]}{unit}{adjusted}{growth}")
+    return regressions
+
+def format_results(results: Dict[str, dict], baseline: Optional[Dict[str, dict]] = None) -> str:
+    """Plain-text table of stage results, with the change against the baseline (time at this machine's speed)."""
+    baseline = baseline or {}
+    width = max([36] + [len(stage) for stage in results])
+    lines = [f"{'stage':<{width}} {'seconds':>10} {'Δ':>7} {'peak MiB':>10} {'Δ':>7} {'blocks':>10} {'Δ':>7} "
+             f"{'rows':>12}"]
+    for stage, result in results.items():
+        expected = baseline.get(stage, {})
+        scales = {'seconds': machine_scale(result, expected), 'peak_mib': 1.0, 'allocated_blocks': 1.0}
+        deltas = [f"{result[metric] / (expected[metric] * scales[metric]) - 1:+.0%}"
+                  if expected.get(metric) and metric in result else ''
+                  for metric in ('seconds', 'peak_mib', 'allocated_blocks')]
+        lines.append(f"{stage:<{width}} {result['seconds']:>10.4f} {deltas[0]:>7} {result['peak_mib']:>10.2f} "
+                     f"{deltas[1]:>7} {result.get('allocated_blocks', ''):>10} {deltas[2]:>7} "
+                     f"{result.get('rows', ''):>12}")
+    return '\n'.join(lines)
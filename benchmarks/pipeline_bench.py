@@ -0,0 +1,292 @@
+# benchmarks/pipeline_bench.py
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import resource
+import tempfile
+import subprocess
+from typing import Dict, List, Tuple
+import numpy as np
+from benchmarks.fake_github import serve
+from benchmarks.harness import (
+    BASELINES_DIR, DEFAULT_TOLERANCE, MIN_MEMORY_DELTA, MIN_TIME_DELTA, best_of, calibrate, compare, load_baseline,
+    machine_scale, save_baseline
+)
+
+BASELINE_FILE = os.path.join(BASELINES_DIR, 'pipeline.json')
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pipeline datasets: name -> repositories collected from the local GitHub stand-in
+PIPELINE_DATASETS = {
+    'smoke': 20,
+    'small': 200,
+    'medium': 1_000,
+}
+STAGES = ('collect', 'insert', 'extract', 'clean', 'transform', 'export')
+# Metrics a run is gated on: (metric, noise floor, unit, scales with machine speed). Records/sec
+# is gated through `seconds`, as every run processes the same records; RSS is page-granular and noisier
+PIPELINE_METRICS = (
+    ('seconds', MIN_TIME_DELTA, 's', True),
+    ('p99_ms', 5.0, ' ms', True),
+    ('peak_rss_mib', 8 * MIN_MEMORY_DELTA, ' MiB', False),
+    ('bytes_written', 256 * 1024, ' B', False),
+)
+
+def repository_names(n: int) -> List[Tuple[str, str]]:
+    """The (owner, repo) pairs a run collects; the stand-in generates data for any name."""
+    return [(f"org{i % 37}", f"project-{i}") for i in range(n)]
+
+def _peak_rss_mib() -> float:
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+def _disk_usage(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+
+def pipeline_environment(server_url: str, work_dir: str) -> Dict[str, str]:
+    """Environment pointing every pipeline stage at the stand-ins: the fake GitHub API, SQLite storage and `work_dir`."""
+    return {
+        **os.environ,
+        'GITHUB_API_URL': server_url,
+        'GITHUB_TOKEN': 'benchmark',
+        'STORAGE_BACKEND': 'sqlite',
+        'SQLITE_STORAGE_PATH': os.path.join(work_dir, 'storage', 'storage.sqlite3'),
+        'SNAPSHOT_STORE_PATH': os.path.join(work_dir, 'storage', 'snapshots'),
+        'EXPORT_DATA_DIR': os.path.join(work_dir, 'export'),
+    }
+
+def run_pipeline(repositories: int, work_dir: str) -> Dict[str, dict]:
+    """
+    Run collect → insert → extract → clean → transform → export once, in this
+    process, with the environment from `pipeline_environment`.
+
+    The stages are the steps of `data_inserter.insert_data` and
+    `fetch_data.fetch_and_prepare_data`, timed one by one. Collect and insert
+    report one latency per repository; the batch stages one per run.
+
+    Returns:
+    - dict of stage -> seconds, records, latencies_ms, peak_rss_mib (process
+      high-water mark after the stage), bytes_written and calibration (see
+      `harness.calibrate`, measured just before the stage)
+    """
+    # Imported here: these modules read GITHUB_API_URL, STORAGE_BACKEND and the paths at import time
+    from data_collection.github_api import fetch_and_process_data
+    from data_collection.data_inserter import insert_issues_data, insert_pull_requests_data, insert_repository_data
+    from dashboard.data_processing.cleaner import clean_all_data
+    from dashboard.data_processing.exporter import export_release
+    from dashboard.data_processing.fetch_data import fetch_data_from_pocketbase
+    from dashboard.data_processing.rollups import build_rollups
+    from dashboard.data_processing.sketches import build_contributor_sketches, build_quantile_sketches
+    from dashboard.data_processing.transformer import transform_all_data
+    from dashboard.prerender import render_default_view
+
+    # Per-repository INFO logs would time terminal I/O rather than the pipeline
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').disabled = True
+
+    results = {}
+    calibration = calibrate()
+
+    def finish(stage, start, records, latencies=None, bytes_written=0):
+        nonlocal calibration
+        seconds = time.perf_counter() - start
+        results[stage] = {
+            'seconds': seconds,
+            'calibration': calibration,
+            'records': records,
+            'latencies_ms': [latency * 1000 for latency in latencies or [seconds]],
+            'peak_rss_mib': _peak_rss_mib(),
+            'bytes_written': bytes_written,
+        }
+        # For the next stage, outside its timing
+        calibration = calibrate()
+
+    start, collected, latencies = time.perf_counter(), [], []
+    for owner, repo in repository_names(repositories):
+        began = time.perf_counter()
+        collected.append(fetch_and_process_data(owner, repo))
+        latencies.append(time.perf_counter() - began)
+    records = sum(1 + len(data['issues']) + len(data['pull_requests']) for data in collected)
+    finish('collect', start, records, latencies)
+
+    start, latencies = time.perf_counter(), []
+    for data in collected:
+        began = time.perf_counter()
+        repo_id = insert_repository_data(data['repository'])
+        insert_issues_data(data['issues'], repo_id)
+        insert_pull_requests_data(data['pull_requests'], repo_id)
+        latencies.append(time.perf_counter() - began)
+    finish('insert', start, records, latencies, _disk_usage(os.path.join(work_dir, 'storage')))
+
+    start = time.perf_counter()
+    raw = [fetch_data_from_pocketbase(collection) for collection in ('repositories', 'issues', 'pull_requests')]
+    records = sum(len(df) for df in raw)
+    finish('extract', start, records)
+
+    start = time.perf_counter()
+    cleaned = clean_all_data(*raw)
+    finish('clean', start, records)
+
+    start = time.perf_counter()
+    repo_df, issues_df, pr_df = transform_all_data(*cleaned)
+    tables = {
+        'repo_data': repo_df,
+        'issues_data': issues_df,
+        'pr_data': pr_df,
+        'quantile_sketches': build_quantile_sketches(issues_df, pr_df),
+        'contributor_sketches': build_contributor_sketches(issues_df, pr_df),
+        'rollups': build_rollups(issues_df, pr_df),
+    }
+    finish('transform', start, records)
+
+    start = time.perf_counter()
+    release_dir = export_release(tables, partitioned={'issues_data', 'pr_data'}, prerender=render_default_view)
+    finish('export', start, sum(len(df) for df in tables.values()), bytes_written=_disk_usage(release_dir))
+    return results
+
+def run_once(server, repositories: int, data_dir: str) -> Dict[str, dict]:
+    """
+    One pipeline run in a fresh process with empty storage, so peak RSS and
+    imports are its own. The fake GitHub server runs in this process.
+    """
+    work_dir = tempfile.mkdtemp(prefix='pipeline-', dir=data_dir)
+    requests_before = server.stats['requests']
+    try:
+        process = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.pipeline_bench', '--worker', str(repositories), '--work-dir', work_dir],
+            env=pipeline_environment(server.url, work_dir), cwd=ROOT_DIR, capture_output=True, text=True,
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"Pipeline run failed:\n{process.stderr}")
+    results = json.loads(process.stdout.strip().splitlines()[-1])
+    results['collect']['requests'] = server.stats['requests'] - requests_before
+    return results
+
+def summarize(runs: List[Dict[str, dict]]) -> Dict[str, dict]:
+    """
+    Per-stage results over several runs: median time and throughput, p50/p99
+    of the latencies of all runs, and the largest peak RSS and bytes written.
+    Every stage gets the median calibration of the whole dataset: a single
+    calibration before a short stage is too noisy to scale it by.
+    """
+    calibration = round(float(np.median([run[stage]['calibration'] for run in runs for stage in STAGES])), 5)
+    summary = {}
+    for stage in STAGES:
+        samples = [run[stage] for run in runs]
+        latencies = np.concatenate([sample['latencies_ms'] for sample in samples])
+        seconds = float(np.median([sample['seconds'] for sample in samples]))
+        summary[stage] = {
+            'seconds': round(seconds, 4),
+            'calibration': calibration,
+            'records': samples[0]['records'],
+            'records_per_s': round(samples[0]['records'] / seconds, 1) if seconds else None,
+            'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+            'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+            'peak_rss_mib': max(sample['peak_rss_mib'] for sample in samples),
+            'bytes_written': max(sample['bytes_written'] for sample in samples),
+        }
+        if 'requests' in samples[0]:
+            requests = float(np.median([sample['requests'] for sample in samples]))
+            summary[stage]['requests_per_s'] = round(requests / seconds, 1) if seconds else None
+    return summary
+
+def _best(results: Dict[str, dict], again: Dict[str, dict]) -> Dict[str, dict]:
+    """The better measurement of every stage from two summaries (see `harness.best_of`), with throughput following the time."""
+    best = {}
+    for stage, result in results.items():
+        best[stage] = best_of(result, again[stage])
+        faster = result if best[stage]['seconds'] == result['seconds'] else again[stage]
+        for rate in ('records_per_s', 'requests_per_s'):
+            if rate in faster:
+                best[stage][rate] = faster[rate]
+    return best
+
+def run_dataset(name, data_dir, repeat, baseline=None, tolerance=DEFAULT_TOLERANCE, latency=0.0, retries=2):
+    """
+    Run the pipeline `repeat` times over one dataset against a fresh fake
+    GitHub server. Results that look regressed against `baseline` are
+    re-measured up to `retries` times, keeping the best values seen.
+    """
+    repositories = PIPELINE_DATASETS[name]
+    os.makedirs(data_dir, exist_ok=True)
+    # The stand-in's own limit stays out of the way; the collector's client-side limit still applies
+    server = serve(rate_limit=10**9, latency=latency)
+    try:
+        results = summarize([run_once(server, repositories, data_dir) for _ in range(repeat)])
+        for _ in range(retries):
+            if not baseline or not compare(results, baseline, tolerance, PIPELINE_METRICS):
+                break
+            results = _best(results, summarize([run_once(server, repositories, data_dir) for _ in range(repeat)]))
+    finally:
+        server.shutdown()
+        server.server_close()
+    for stage, result in results.items():
+        logging.info(f"{name} {stage}: {result['seconds']}s, {result['records_per_s']} records/s")
+    return results
+
+def format_results(results: Dict[str, dict], baseline: Dict[str, dict] = None) -> str:
+    """Plain-text table of stage results, with the time change against the baseline where there is one."""
+    baseline = baseline or {}
+    lines = [f"{'stage':<10} {'seconds':>9} {'Δ':>6} {'records':>9} {'records/s':>11} {'requests/s':>11} "
+             f"{'p50 ms':>9} {'p99 ms':>9} {'peak RSS MiB':>13} {'bytes written':>14}"]
+    for stage, result in results.items():
+        expected = baseline.get(stage, {})
+        delta = (f"{result['seconds'] / (expected['seconds'] * machine_scale(result, expected)) - 1:+.0%}"
+                 if expected.get('seconds') else '')
+        lines.append(f"{stage:<10} {result['seconds']:>9.3f} {delta:>6} {result['records']:>9} "
+                     f"{result['records_per_s'] or '':>11} {result.get('requests_per_s') or '':>11} "
+                     f"{result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['peak_rss_mib']:>13.1f} "
+                     f"{result['bytes_written']:>14}")
+    return '\n'.join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the collection and processing pipeline end to end")
+    # Checked below: argparse rejects the default list itself when `choices` is set
+    parser.add_argument('datasets', nargs='*', default=['smoke'],
+                        help=f"datasets to run: {', '.join(PIPELINE_DATASETS)} (default: smoke)")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'oss-pulse-bench'),
+                        help="where the runs keep their storage and releases while they run")
+    parser.add_argument('--repeat', type=int, default=3, help="pipeline runs per dataset")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds the fake GitHub API adds to every response")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline results to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed regression per stage and metric, as a share of the baseline")
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the new baseline")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--work-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    unknown = [dataset for dataset in args.datasets if dataset not in PIPELINE_DATASETS]
+    if unknown:
+        parser.error(f"unknown datasets: {', '.join(unknown)}")
+
+    if args.worker is not None:
+        # One run in a child process; the parent reads the results from the last line
+        results = run_pipeline(args.worker, args.work_dir)
+        print(json.dumps({stage: {**result, 'seconds': round(result['seconds'], 6)} for stage, result in results.items()}))
+        sys.exit(0)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    baseline = load_baseline(args.baseline)
+    all_results, regressions = {}, []
+    for dataset in args.datasets:
+        expected = None if args.update_baseline else baseline.get(dataset)
+        all_results[dataset] = run_dataset(dataset, args.data_dir, args.repeat, expected, args.tolerance, args.latency)
+        print(f"\n{dataset} ({PIPELINE_DATASETS[dataset]} repositories)")
+        print(format_results(all_results[dataset], baseline.get(dataset)))
+        regressions += [f"{dataset} {regression}" for regression in
+                        compare(all_results[dataset], baseline.get(dataset, {}), args.tolerance, PIPELINE_METRICS)]
+
+    if args.update_baseline:
+        save_baseline(args.baseline, all_results)
+        print(f"\nBaseline updated: {args.baseline}")
+    elif regressions:
+        print("\nRegressions against the baseline:\n" + '\n'.join(regressions))
+        sys.exit(1)
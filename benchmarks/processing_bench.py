@@ -0,0 +1,234 @@
+# benchmarks/processing_bench.py
+
+import os
+import sys
+import logging
+import argparse
+import itertools
+from typing import Callable, Dict, Tuple
+import numpy as np
+import pandas as pd
+import data_processing.cleaner as scheduler_cleaner
+import data_processing.transformer as scheduler_transformer
+import dashboard.data_processing.cleaner as dashboard_cleaner
+import dashboard.data_processing.transformer as dashboard_transformer
+from benchmarks.harness import (
+    BASELINES_DIR, DEFAULT_TOLERANCE, METRICS, MIN_BLOCK_DELTA, best_of, compare, format_results, load_baseline,
+    measure, measure_against, save_baseline
+)
+
+BASELINE_FILE = os.path.join(BASELINES_DIR, 'processing.json')
+
+# Gated metrics: time and peak memory as for the other benchmarks, plus allocated blocks
+PROCESSING_METRICS = METRICS + (('allocated_blocks', MIN_BLOCK_DELTA, ' blocks', False),)
+
+# Parameter grids: suite -> values of rows, null ratio and repository cardinality, run as a cross product
+SUITES = {
+    'smoke': {'rows': (10_000,), 'null_ratio': (0.0, 0.3), 'repositories': (10, 1_000)},
+    'standard': {'rows': (100_000,), 'null_ratio': (0.0, 0.1, 0.5), 'repositories': (10, 1_000, 50_000)},
+    'full': {'rows': (10_000, 100_000, 1_000_000), 'null_ratio': (0.0, 0.1, 0.5),
+             'repositories': (10, 1_000, 100_000)},
+}
+
+_WORDS = np.array(['fix', 'crash', 'when', 'parsing', 'add', 'support', 'config', 'docs', 'update', 'error',
+                   'memory', 'leak', 'server', 'client', 'build', 'windows', 'performance', 'cache'], dtype=object)
+_START = pd.Timestamp('2022-01-01', tz='UTC')
+_END = pd.Timestamp('2024-06-01', tz='UTC')
+
+def _with_nulls(rng: np.random.Generator, values, null_ratio: float) -> pd.Series:
+    values = pd.Series(values)
+    return values.mask(rng.random(len(values)) < null_ratio) if null_ratio else values
+
+def _pocketbase_dates(moments: pd.Series) -> pd.Series:
+    """Timestamps as PocketBase returns date fields, e.g. '2024-01-02 03:04:05.000Z'; NaT becomes None."""
+    return moments.dt.strftime('%Y-%m-%d %H:%M:%S.000Z').astype(object).where(moments.notna(), None)
+
+def raw_activity(rows: int, repositories: int, null_ratio: float, kind: str = 'issue', seed: int = 0) -> pd.DataFrame:
+    """
+    Issue or PR records as the storage backend returns them: dates as strings,
+    numbers as floats, a few invalid states. `null_ratio` of titles, authors,
+    numbers and dates (besides `created_at`) are missing; closing and merge
+    times are missing for open items on top of that.
+    """
+    rng = np.random.default_rng(seed)
+    created = pd.Series(pd.to_datetime(rng.integers(_START.value, _END.value, rows), utc=True))
+    finished = created + pd.to_timedelta(rng.exponential(8 * 86400, rows).astype(np.int64), unit='s')
+    states = np.array(['open', 'closed', 'merged', 'unknown-state'] if kind == 'pr' else ['open', 'closed', 'reopened'],
+                      dtype=object)
+    state = states[np.minimum(rng.geometric(0.5, rows) - 1, len(states) - 1)]
+    authors = np.array([f"user{i}" for i in range(max(rows // 20, 10))], dtype=object)
+    df = pd.DataFrame({
+        'id': [f"{kind}{i:08d}" for i in range(rows)],
+        'number': _with_nulls(rng, np.arange(1, rows + 1, dtype='float64'), null_ratio),
+        'title': _with_nulls(rng, _WORDS[rng.integers(0, len(_WORDS), rows)] + ' ' +
+                             _WORDS[rng.integers(0, len(_WORDS), rows)], null_ratio),
+        'author': _with_nulls(rng, authors[rng.zipf(1.3, rows) % len(authors)], null_ratio),
+        'state': state,
+        'repository': [f"r{i:07d}" for i in rng.integers(0, repositories, rows)],
+        'created_at': _pocketbase_dates(created),
+        'updated_at': _pocketbase_dates(_with_nulls(rng, finished, null_ratio)),
+        'closed_at': _pocketbase_dates(_with_nulls(rng, finished.where(state != 'open'), null_ratio)),
+    })
+    if kind == 'pr':
+        df['merged_at'] = _pocketbase_dates(_with_nulls(rng, finished.where(state == 'merged'), null_ratio))
+    return df
+
+def raw_repositories(rows: int, null_ratio: float, seed: int = 0) -> pd.DataFrame:
+    """Repository records with heavy-tailed stars, forks and open issues, `null_ratio` of them missing."""
+    rng = np.random.default_rng(seed)
+    stars = np.minimum(rng.pareto(1.2, rows) * 200, 400_000).astype(np.int64)
+    return pd.DataFrame({
+        'id': [f"r{i:07d}" for i in range(rows)],
+        'name': [f"project-{i}" for i in range(rows)],
+        'full_name': [f"org{i % 997}/project-{i}" for i in range(rows)],
+        'stars': _with_nulls(rng, stars, null_ratio),
+        'forks': _with_nulls(rng, (stars * rng.uniform(0, 0.4, rows)).astype(np.int64), null_ratio),
+        'open_issues': _with_nulls(rng, rng.poisson(20, rows) * (rng.random(rows) < 0.8), null_ratio),
+    })
+
+def typed_activity(rows: int, repositories: int, null_ratio: float, kind: str = 'issue', seed: int = 0) -> pd.DataFrame:
+    """`raw_activity` after cleaning, with resolution or merge times in days as the transformer derives them."""
+    df = dashboard_cleaner.convert_to_datetime(raw_activity(rows, repositories, null_ratio, kind, seed),
+                                               dashboard_cleaner.DATE_COLUMNS['pull_requests' if kind == 'pr' else 'issues'])
+    if kind == 'pr':
+        return dashboard_transformer.calculate_pr_merge_time(df)
+    return dashboard_transformer.calculate_issue_resolution_time(df)
+
+def _copies(*frames):
+    """Setup that hands every run fresh copies, as the functions modify their inputs in place."""
+    return lambda: tuple(frame.copy() for frame in frames)
+
+# Inputs are built once per case and not measured: name -> (parameters it depends on, build(rows, nulls, repos) -> (setup, run))
+FUNCTIONS: Dict[str, Tuple[Tuple[str, ...], Callable]] = {
+    'convert_to_datetime': (('rows', 'null_ratio'), lambda rows, nulls, repos: (
+        _copies(raw_activity(rows, 1, nulls, 'pr')),
+        lambda inputs: scheduler_cleaner.convert_to_datetime(inputs[0], ['created_at', 'updated_at', 'closed_at', 'merged_at']),
+    )),
+    'dashboard.convert_to_datetime': (('rows', 'null_ratio'), lambda rows, nulls, repos: (
+        _copies(raw_activity(rows, 1, nulls, 'pr')),
+        lambda inputs: dashboard_cleaner.convert_to_datetime(inputs[0], dashboard_cleaner.DATE_COLUMNS['pull_requests']),
+    )),
+    'clean_issues_data': (('rows', 'null_ratio'), lambda rows, nulls, repos: (
+        _copies(raw_activity(rows, 1, nulls)),
+        lambda inputs: scheduler_cleaner.clean_issues_data(inputs[0]),
+    )),
+    'dashboard.clean_issues_data': (('rows', 'null_ratio'), lambda rows, nulls, repos: (
+        _copies(raw_activity(rows, 1, nulls)),
+        lambda inputs: dashboard_cleaner.clean_issues_data(inputs[0]),
+    )),
+    **{f"handle_outliers[{method}]": (('rows', 'null_ratio'), lambda rows, nulls, repos, method=method: (
+        _copies(raw_repositories(rows, nulls)),
+        lambda inputs: [scheduler_cleaner.handle_outliers(inputs[0], column, method=method)
+                        for column in ('stars', 'forks', 'open_issues')],
+    )) for method in ('iqr', 'percentile', 'zscore')},
+    'calculate_contributor_activity': (('rows', 'null_ratio', 'repositories'), lambda rows, nulls, repos: (
+        _copies(typed_activity(rows, repos, nulls), typed_activity(rows // 2, repos, nulls, 'pr', seed=1)),
+        lambda inputs: scheduler_transformer.calculate_contributor_activity(*inputs),
+    )),
+    'dashboard.calculate_contributor_activity': (('rows', 'null_ratio', 'repositories'), lambda rows, nulls, repos: (
+        _copies(typed_activity(rows, repos, nulls), typed_activity(rows // 2, repos, nulls, 'pr', seed=1)),
+        lambda inputs: dashboard_transformer.calculate_contributor_activity(*inputs),
+    )),
+    'aggregate_repository_metrics': (('rows', 'null_ratio', 'repositories'), lambda rows, nulls, repos: (
+        _copies(raw_repositories(repos, nulls), typed_activity(rows, repos, nulls),
+                typed_activity(rows // 2, repos, nulls, 'pr', seed=1)),
+        lambda inputs: scheduler_transformer.aggregate_repository_metrics(*inputs),
+    )),
+    'normalize_metrics': (('rows', 'null_ratio'), lambda rows, nulls, repos: (
+        _copies(raw_repositories(rows, nulls).assign(total_contributors=np.arange(rows) % 50)),
+        lambda inputs: scheduler_transformer.normalize_metrics(inputs[0]),
+    )),
+    'dashboard.normalize_metrics': (('rows', 'null_ratio'), lambda rows, nulls, repos: (
+        _copies(raw_repositories(rows, nulls).assign(total_contributors=np.arange(rows) % 50)),
+        lambda inputs: dashboard_transformer.normalize_metrics(inputs[0]),
+    )),
+}
+
+def _format_count(value: int) -> str:
+    for divisor, suffix in ((1_000_000, 'M'), (1_000, 'k')):
+        if value >= divisor and value % divisor == 0:
+            return f"{value // divisor}{suffix}"
+    return str(value)
+
+def suite_cases(suite: str, functions=None) -> Dict[str, Tuple[str, int, float, int]]:
+    """
+    The cases of a suite: `function[rows=..,nulls=..,repos=..]` -> (function, rows, null ratio, repositories).
+    Parameters a function does not depend on are left out of its cases, so
+    those are not run once per value. Repository counts above the row count are skipped.
+    """
+    grid = SUITES[suite]
+    cases = {}
+    for name in functions or FUNCTIONS:
+        parameters = FUNCTIONS[name][0]
+        for rows, nulls, repos in itertools.product(grid['rows'], grid['null_ratio'], grid['repositories']):
+            if repos > rows:
+                continue
+            labels = {'rows': f"rows={_format_count(rows)}", 'null_ratio': f"nulls={nulls:g}",
+                      'repositories': f"repos={_format_count(repos)}"}
+            key = f"{name}[{','.join(labels[parameter] for parameter in parameters)}]"
+            cases.setdefault(key, (name, rows, nulls, repos))
+    return cases
+
+def run_suite(suite, repeat, baseline=None, tolerance=DEFAULT_TOLERANCE, functions=None):
+    """
+    Measure every case of a suite. Cases that look slower than `baseline` are
+    re-measured once the whole suite ran, keeping the best results: a slow
+    spell of the machine then does not fail every case measured during it.
+    """
+    baseline = baseline or {}
+    cases = suite_cases(suite, functions)
+    results = {}
+    for case, (name, rows, nulls, repos) in cases.items():
+        setup, run = FUNCTIONS[name][1](rows, nulls, repos)
+        results[case] = {**measure(run, setup, repeat), 'rows': rows}
+        logging.info(f"{suite} {case}: {results[case]['seconds']}s, {results[case]['peak_mib']} MiB, "
+                     f"{results[case]['allocated_blocks']} blocks")
+
+    for case in [case for case in results if compare({case: results[case]}, baseline, tolerance, PROCESSING_METRICS)]:
+        name, rows, nulls, repos = cases[case]
+        setup, run = FUNCTIONS[name][1](rows, nulls, repos)
+        again = measure_against(run, setup, repeat, baseline[case], tolerance)
+        results[case] = {**best_of(results[case], again), 'rows': rows}
+        logging.info(f"{suite} {case} re-measured: {results[case]['seconds']}s, {results[case]['peak_mib']} MiB")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmark the cleaner and transformer functions")
+    # Checked below: argparse rejects the default list itself when `choices` is set
+    parser.add_argument('suites', nargs='*', default=['smoke'],
+                        help=f"parameter grids to run: {', '.join(SUITES)} (default: smoke)")
+    parser.add_argument('--function', action='append', dest='functions',
+                        help=f"only benchmark these functions (repeatable): {', '.join(FUNCTIONS)}")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case, the best one counts")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="baseline results to compare against")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown or memory growth per case, as a share of the baseline")
+    parser.add_argument('--update-baseline', action='store_true', help="store these results as the new baseline")
+    args = parser.parse_args()
+    unknown = [suite for suite in args.suites if suite not in SUITES]
+    unknown += [name for name in args.functions or () if name not in FUNCTIONS]
+    if unknown:
+        parser.error(f"unknown suites or functions: {', '.join(unknown)}")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    baseline = load_baseline(args.baseline)
+    all_results, regressions = {}, []
+    for suite in args.suites:
+        expected = None if args.update_baseline else baseline.get(suite)
+        all_results[suite] = run_suite(suite, args.repeat, expected, args.tolerance, args.functions)
+        print(f"\n{suite}")
+        print(format_results(all_results[suite], baseline.get(suite)))
+        regressions += [f"{suite} {regression}"
+                        for regression in compare(all_results[suite], baseline.get(suite, {}), args.tolerance,
+                                                  PROCESSING_METRICS)]
+
+    if args.update_baseline:
+        if args.functions:
+            # A partial run only replaces the cases it measured
+            all_results = {suite: {**baseline.get(suite, {}), **results} for suite, results in all_results.items()}
+        save_baseline(args.baseline, all_results)
+        print(f"\nBaseline updated: {args.baseline}")
+    elif regressions:
+        print("\nRegressions against the baseline:\n" + '\n'.join(regressions))
+        sys.exit(1)
@@ -0,0 +1,116 @@
+# benchmarks/synthetic.py
+
+import os
+import logging
+from typing import Tuple
+import numpy as np
+import pandas as pd
+from dashboard.data_processing.cleaner import clean_all_data
+from dashboard.data_processing.transformer import transform_all_data
+from dashboard.data_processing.sketches import build_contributor_sketches, build_quantile_sketches
+from dashboard.data_processing.rollups import build_rollups
+from dashboard.data_processing.exporter import write_partitioned, write_table
+
+# Benchmark datasets: name -> (repositories, issues); pull requests are half as many as issues
+DATASETS = {
+    'smoke': (100, 20_000),
+    'small': (1_000, 1_000_000),
+    'medium': (10_000, 1_000_000),
+    'large': (10_000, 10_000_000),
+    'xlarge': (100_000, 10_000_000),
+}
+
+_WORDS = np.array(['data', 'web', 'fast', 'tool', 'cli', 'api', 'ml', 'graph', 'cloud', 'rust', 'python', 'react',
+                   'server', 'parser', 'engine', 'kit', 'lib', 'sdk', 'db', 'stream', 'ui', 'async', 'test', 'build'],
+                  dtype=object)
+_START = pd.Timestamp('2015-01-01', tz='UTC')
+_END = pd.Timestamp('2024-06-01', tz='UTC')
+
+def _timestamps(rng: np.random.Generator, n: int, start: pd.Timestamp = _START, end: pd.Timestamp = _END) -> pd.Series:
+    return pd.Series(pd.to_datetime(rng.integers(start.value, end.value, n), utc=True))
+
+def _phrases(rng: np.random.Generator, n: int, words: int) -> np.ndarray:
+    """`n` space-joined phrases of `words` words; a few thousand distinct ones, shared between rows."""
+    vocabulary = np.array([' '.join(rng.choice(_WORDS, words)) for _ in range(min(n, 4096))], dtype=object)
+    return vocabulary[rng.integers(0, len(vocabulary), n)]
+
+def generate_repositories(n: int, seed: int = 0) -> pd.DataFrame:
+    """Raw repository records shaped like the PocketBase export, with heavy-tailed stars, forks and issues."""
+    rng = np.random.default_rng(seed)
+    created = _timestamps(rng, n)
+    stars = np.minimum(rng.pareto(1.2, n) * 200, 400_000).astype(np.int64)
+    return pd.DataFrame({
+        'id': [f"r{i:07d}" for i in range(n)],
+        'name': [f"{word}-{i}" for i, word in enumerate(rng.choice(_WORDS, n))],
+        'full_name': [f"org{i % 997}/{word}-{i}" for i, word in enumerate(rng.choice(_WORDS, n))],
+        'description': _phrases(rng, n, 6),
+        'stars': stars,
+        'forks': (stars * rng.uniform(0.05, 0.4, n)).astype(np.int64),
+        'open_issues': rng.poisson(20, n) + (stars // 500),
+        'created_at': created,
+        'updated_at': created + pd.to_timedelta(rng.integers(0, (_END - created).dt.days.clip(lower=1)), unit='D'),
+    })
+
+def generate_activity(repo_df: pd.DataFrame, n: int, kind: str, seed: int = 0) -> pd.DataFrame:
+    """
+    Raw issue (`kind='issue'`) or pull request (`kind='pr'`) records.
+
+    Popular repositories get more activity (weights follow stars), authors
+    come from a pool of about n/50 users, and closing/merge times are
+    exponential with a long tail.
+    """
+    rng = np.random.default_rng(seed + (1 if kind == 'issue' else 2))
+    weights = repo_df['stars'].to_numpy(dtype='float64') + 10
+    repository = repo_df['id'].to_numpy()[rng.choice(len(repo_df), n, p=weights / weights.sum())]
+    created = _timestamps(rng, n, pd.Timestamp('2023-01-01', tz='UTC'))
+    states = ['open', 'closed', 'merged'] if kind == 'pr' else ['open', 'closed']
+    state = np.asarray(states, dtype=object)[rng.integers(0, len(states), n)]
+    finished = created + pd.to_timedelta(rng.exponential(8 * 86400, n).astype(np.int64), unit='s')
+    authors = np.array([f"user{i}" for i in range(max(n // 50, 100))], dtype=object)
+    df = pd.DataFrame({
+        'id': [f"{kind}{i}" for i in range(n)],
+        'number': np.arange(n),
+        'title': _phrases(rng, n, 4),
+        'author': authors[rng.zipf(1.3, n) % len(authors)],
+        'state': state,
+        'created_at': created,
+        'updated_at': finished,
+        'repository': repository,
+    })
+    df['closed_at'] = finished.where(state != 'open')
+    if kind == 'pr':
+        df['merged_at'] = finished.where(state == 'merged')
+    return df
+
+def generate_raw(repositories: int, issues: int, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Raw (repositories, issues, pull requests) frames, as the pipeline gets them before cleaning."""
+    repo_df = generate_repositories(repositories, seed)
+    return repo_df, generate_activity(repo_df, issues, 'issue', seed), generate_activity(repo_df, issues // 2, 'pr', seed)
+
+def write_release(directory: str, repositories: int, issues: int, seed: int = 0) -> str:
+    """
+    Run the processing pipeline over a synthetic dataset and write its tables
+    into `directory`, laid out like a published release (without a manifest,
+    and without touching the live releases or the CURRENT pointer).
+
+    Returns:
+    - `directory`
+    """
+    repo_df, issues_df, pr_df = transform_all_data(*clean_all_data(*generate_raw(repositories, issues, seed)))
+    tables = {
+        'repo_data': repo_df,
+        'issues_data': issues_df,
+        'pr_data': pr_df,
+        'quantile_sketches': build_quantile_sketches(issues_df, pr_df),
+        'contributor_sketches': build_contributor_sketches(issues_df, pr_df),
+        'rollups': build_rollups(issues_df, pr_df),
+    }
+    os.makedirs(directory, exist_ok=True)
+    for name, df in tables.items():
+        path = os.path.join(directory, f"{name}.parquet")
+        if name in ('issues_data', 'pr_data'):
+            write_partitioned(df, path)
+        else:
+            write_table(df, path)
+    logging.info(f"Wrote synthetic release with {repositories} repositories and {issues} issues to {directory}")
+    return directory
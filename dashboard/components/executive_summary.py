@@ -1,27 +1,48 @@
 import streamlit as st
 import pandas as pd
+from dashboard.data_processing.rollups import count_by_state, distinct_authors, duration_quantiles, mean_duration
 
-def generate_executive_summary(repo_data: pd.DataFrame, issues_data: pd.DataFrame, pr_data: pd.DataFrame):
+def generate_executive_summary(repo_data: pd.DataFrame, issues_data: pd.DataFrame, pr_data: pd.DataFrame,
+                               rollup_data: pd.DataFrame = None):
     """
     Generates a concise executive summary of the key metrics and insights.
+    Issue and PR figures, including the p90 durations and distinct contributors,
+    come from the rollup cube when one is given.
     """
     total_repos = len(repo_data)
     total_stars = repo_data['stars'].sum()
     total_forks = repo_data['forks'].sum()
-    total_issues = len(issues_data)
-    total_prs = len(pr_data)
 
-    avg_issue_resolution = issues_data[issues_data['resolution_time_days'] >= 0]['resolution_time_days'].mean()
-    avg_pr_merge_time = pr_data[pr_data['merge_time_days'] >= 0]['merge_time_days'].mean()
+    if rollup_data is not None:
+        total_issues = count_by_state(rollup_data, 'issue')
+        total_prs = count_by_state(rollup_data, 'pull_request')
+        avg_issue_resolution = mean_duration(rollup_data, 'issue')
+        avg_pr_merge_time = mean_duration(rollup_data, 'pull_request')
+        issue_p90 = duration_quantiles(rollup_data, 'issue')[0.9]
+        pr_p90 = duration_quantiles(rollup_data, 'pull_request')[0.9]
+        contributors = distinct_authors(rollup_data) if rollup_data['author_sketch'].notna().any() else None
+    else:
+        total_issues = len(issues_data)
+        total_prs = len(pr_data)
+        avg_issue_resolution = issues_data[issues_data['resolution_time_days'] >= 0]['resolution_time_days'].mean()
+        avg_pr_merge_time = pr_data[pr_data['merge_time_days'] >= 0]['merge_time_days'].mean()
+        issue_p90 = issues_data[issues_data['resolution_time_days'] >= 0]['resolution_time_days'].quantile(0.9)
+        pr_p90 = pr_data[pr_data['merge_time_days'] >= 0]['merge_time_days'].quantile(0.9)
+        has_authors = 'author' in issues_data.columns and 'author' in pr_data.columns
+        contributors = pd.concat([issues_data['author'], pr_data['author']]).nunique() if has_authors else None
+
+    # Data collected before authors were captured has no contributors to count
+    contributors_note = (f" Their issues and pull requests were opened by about {contributors:,.0f} distinct contributors."
+                         if contributors is not None else "")
 
     summary = f"""
     📊 **OSS Pulse Summary**
 
-    Analyzing {total_repos:,} repositories with a total of {total_stars:,} stars and {total_forks:,} forks.
+    Analyzing {total_repos:,} repositories with a total of {total_stars:,} stars and {total_forks:,} forks.{contributors_note}
 
     🔍 **Key Insights:**
-    - {total_issues:,} issues tracked, with an average resolution time of {avg_issue_resolution:.2f} days.
-    - {total_prs:,} pull requests processed, merging on average in {avg_pr_merge_time:.2f} days.
+    - {total_issues:,} issues tracked, with an average resolution time of {avg_issue_resolution:.2f} days (90% within {issue_p90:.1f} days).
+    - {total_prs:,} pull requests processed, merging on average in {avg_pr_merge_time:.2f} days (90% within {pr_p90:.1f} days).
     - Top repository: {repo_data.iloc[0]['name']} with {repo_data.iloc[0]['stars']:,} stars.
 
     💡 **Trend Alert:** 
@@ -2,7 +2,7 @@
 import streamlit as st
 import pandas as pd
 
-def apply_advanced_filters(repo_data, issues_data, pr_data):
+def apply_advanced_filters(repo_data, issues_index, pr_index):
     st.sidebar.subheader("Advanced Filters")
 
     # Filter by stars
@@ -79,36 +79,42 @@ def apply_advanced_filters(repo_data, issues_data, pr_data):
         repo_data = repo_data[(repo_data['total_contributors'] >= contributor_range[0]) & (
                     repo_data['total_contributors'] <= contributor_range[1])]
 
-    # Filter issues and PRs based on the filtered repositories
-    filtered_repo_names = repo_data['name'].unique()
-    issues_data = issues_data[issues_data['repository'].isin(filtered_repo_names)]
-    pr_data = pr_data[pr_data['repository'].isin(filtered_repo_names)]
+    # Cascade into issues and PRs through the per-repository row offsets of their indexes
+    filtered_repo_names = tuple(sorted(repo_data['name'].unique()))
+    issue_ranges, pr_ranges = {}, {}
 
-    # Filter by issue resolution time
-    if not issues_data.empty:
+    # Issue/PR-level filters make pre-aggregated rollups unusable for this view
+    row_filters_active = False
+
+    # Filter by issue resolution time (slider bounds come from per-repository min/max)
+    if issues_index.count(filtered_repo_names):
+        resolution_bounds = tuple(float(value) for value in issues_index.bounds('resolution_time_days', filtered_repo_names))
         min_resolution_time, max_resolution_time = st.sidebar.slider(
             "Filter by Issue Resolution Time (days)",
-            float(issues_data['resolution_time_days'].min()),
-            float(issues_data['resolution_time_days'].max()),
-            (float(issues_data['resolution_time_days'].min()), float(issues_data['resolution_time_days'].max()))
+            resolution_bounds[0],
+            resolution_bounds[1],
+            resolution_bounds
         )
-        issues_data = issues_data[
-            (issues_data['resolution_time_days'] >= min_resolution_time) &
-            (issues_data['resolution_time_days'] <= max_resolution_time)
-        ]
+        row_filters_active |= (min_resolution_time, max_resolution_time) != resolution_bounds
+        issue_ranges['resolution_time_days'] = (min_resolution_time, max_resolution_time)
 
     # Filter by PR merge time
-    if not pr_data.empty:
+    if pr_index.count(filtered_repo_names):
+        merge_bounds = tuple(float(value) for value in pr_index.bounds('merge_time_days', filtered_repo_names))
         min_merge_time, max_merge_time = st.sidebar.slider(
             "Filter by PR Merge Time (days)",
-            float(pr_data['merge_time_days'].min()),
-            float(pr_data['merge_time_days'].max()),
-            (float(pr_data['merge_time_days'].min()), float(pr_data['merge_time_days'].max()))
+            merge_bounds[0],
+            merge_bounds[1],
+            merge_bounds
         )
-        pr_data = pr_data[
-            (pr_data['merge_time_days'] >= min_merge_time) &
-            (pr_data['merge_time_days'] <= max_merge_time)
-        ]
+        row_filters_active |= (min_merge_time, max_merge_time) != merge_bounds
+        pr_ranges['merge_time_days'] = (min_merge_time, max_merge_time)
+
+    # Issue/PR rows are selected by the caller, only if a view needs them
+    issue_query = {'ranges': issue_ranges, 'groups': filtered_repo_names}
+    pr_query = {'ranges': pr_ranges, 'groups': filtered_repo_names}
+
+    st.session_state['row_filters_active'] = row_filters_active
 
     # Filter repositories by selected time period
     time_period = st.sidebar.selectbox(
@@ -117,7 +123,7 @@ def apply_advanced_filters(repo_data, issues_data, pr_data):
     )
 
     if time_period != "All Time":
-        end_date = pd.Timestamp.now()
+        end_date = pd.Timestamp.now(tz='UTC')
         if time_period == "Last Week":
             start_date = end_date - pd.Timedelta(days=7)
         elif time_period == "Last Month":
@@ -131,5 +137,17 @@ def apply_advanced_filters(repo_data, issues_data, pr_data):
 
         repo_data = repo_data[(repo_data['created_at'] >= start_date) & (repo_data['created_at'] <= end_date)]
 
-    # Return the filtered data after all filters have been applied
-    return repo_data, issues_data, pr_data
+    # The selections that determined the filtered frames; cached figures are keyed on them
+    st.session_state['advanced_filters'] = {
+        'star_range': star_range,
+        'fork_range': fork_range,
+        'issue_range': issue_range,
+        'contributor_range': contributor_range if 'total_contributors' in repo_data.columns else None,
+        'issue_ranges': issue_ranges,
+        'pr_ranges': pr_ranges,
+        # Relative periods move with the clock; cached figures for them are reused within the hour
+        'time_period': (time_period, pd.Timestamp.now(tz='UTC').floor('h') if time_period != "All Time" else None),
+    }
+
+    # Return the filtered repositories and the issue/PR index queries after all filters have been applied
+    return repo_data, issue_query, pr_query
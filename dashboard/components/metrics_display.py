@@ -2,45 +2,97 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from dashboard.data_processing.sketches import DEFAULT_QUANTILES, QUANTILE_METRICS, estimate_contributors, sketch_quantiles
+from dashboard.data_processing.rollups import mean_duration
 
-def display_key_metrics(repo_data: pd.DataFrame, issues_data: pd.DataFrame, pr_data: pd.DataFrame):
+def key_metrics(repo_data: pd.DataFrame, pr_data: pd.DataFrame, contributor_sketches: pd.DataFrame = None) -> dict:
     """
-    Displays key metrics for repositories, issues, and pull requests.
+    Computes the key metrics shown at the top of the Overview.
+
+    When contributor sketches are available, distinct contributors are
+    estimated across the filtered repositories by merging their sketches.
+
+    Returns:
+    - dict of metric label -> formatted value, in display order
+    """
+    metrics = {
+        "Total Repositories": f"{len(repo_data):,}",
+        "Total Stars": f"{repo_data['stars'].sum():,}",
+        "Open Issues": f"{repo_data['open_issues'].sum():,}",
+        "Total Forks": f"{repo_data['forks'].sum():,}",
+        "Active PRs": f"{len(pr_data[pr_data['state'] == 'open']):,}",
+        "Avg. Contributors": f"{repo_data['total_contributors'].mean():.2f}",
+    }
+    if contributor_sketches is not None:
+        distinct_contributors = estimate_contributors(contributor_sketches, repo_data['name'])
+        metrics["Distinct Contributors"] = f"{distinct_contributors:,.0f}"
+    return metrics
+
+def display_key_metrics(metrics: dict):
+    """
+    Displays key metrics for repositories, issues, and pull requests, as computed by `key_metrics`.
     """
+    labels = list(metrics)
     col1, col2, col3 = st.columns(3)
 
-    with col1:
-        st.metric("Total Repositories", f"{len(repo_data):,}")
-        st.metric("Total Stars", f"{repo_data['stars'].sum():,}")
+    for col, column_labels in zip((col1, col2, col3), (labels[:2], labels[2:4], labels[4:])):
+        with col:
+            for label in column_labels:
+                st.metric(label, metrics[label])
 
-    with col2:
-        st.metric("Open Issues", f"{repo_data['open_issues'].sum():,}")
-        st.metric("Total Forks", f"{repo_data['forks'].sum():,}")
+def duration_percentiles(data: pd.DataFrame, collection: str, quantile_sketches: pd.DataFrame = None) -> str:
+    """
+    p50 / p90 / p99 of issue resolution or PR merge times, formatted for a metric.
 
-    with col3:
-        st.metric("Active PRs", f"{len(pr_data[pr_data['state'] == 'open']):,}")
-        st.metric("Avg. Contributors", f"{repo_data['total_contributors'].mean():.2f}")
+    Served by merging the quantile sketches of the selected repositories when
+    they are given, otherwise computed from the completed rows.
+    """
+    metric = QUANTILE_METRICS[collection]
+    if quantile_sketches is not None:
+        values = list(sketch_quantiles(quantile_sketches, metric).values())
+    else:
+        values = data.loc[data[metric] >= 0, metric].quantile(list(DEFAULT_QUANTILES)).tolist()
+    return ' / '.join(f"{value:.1f}" for value in values)
 
-def display_advanced_metrics(repo_data: pd.DataFrame, issues_data: pd.DataFrame, pr_data: pd.DataFrame):
+def display_advanced_metrics(repo_data: pd.DataFrame, issues_data: pd.DataFrame, pr_data: pd.DataFrame,
+                             rollup_data: pd.DataFrame = None, quantile_sketches: pd.DataFrame = None):
     """
     Displays advanced metrics and insights.
+
+    Issue and PR aggregates are answered from the rollup cube when one is given,
+    and duration percentiles from the quantile sketches.
     """
+    if rollup_data is not None:
+        avg_resolution_time = mean_duration(rollup_data, 'issue')
+        avg_merge_time = mean_duration(rollup_data, 'pull_request')
+        total_issues = int(rollup_data.loc[rollup_data['kind'] == 'issue', 'count'].sum())
+    else:
+        avg_resolution_time = issues_data[issues_data['resolution_time_days'] >= 0]['resolution_time_days'].mean()
+        avg_merge_time = pr_data[pr_data['merge_time_days'] >= 0]['merge_time_days'].mean()
+        total_issues = len(issues_data)
+
     col1, col2 = st.columns(2)
 
     with col1:
-        avg_resolution_time = issues_data[issues_data['resolution_time_days'] >= 0]['resolution_time_days'].mean()
         st.metric("Avg. Issue Resolution (days)", f"{avg_resolution_time:.2f}")
 
         stars_per_fork = repo_data['stars'].sum() / repo_data['forks'].sum() if repo_data['forks'].sum() > 0 else 0
         st.metric("Stars per Fork", f"{stars_per_fork:.2f}")
 
     with col2:
-        avg_merge_time = pr_data[pr_data['merge_time_days'] >= 0]['merge_time_days'].mean()
         st.metric("Avg. PR Merge Time (days)", f"{avg_merge_time:.2f}")
 
-        issues_per_repo = len(issues_data) / len(repo_data) if len(repo_data) > 0 else 0
+        issues_per_repo = total_issues / len(repo_data) if len(repo_data) > 0 else 0
         st.metric("Issues per Repository", f"{issues_per_repo:.2f}")
 
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Issue Resolution p50 / p90 / p99 (days)",
+                  duration_percentiles(issues_data, 'issues', quantile_sketches))
+    with col2:
+        st.metric("PR Merge Time p50 / p90 / p99 (days)",
+                  duration_percentiles(pr_data, 'pull_requests', quantile_sketches))
+
     # Activity heatmap
     activity_data = repo_data.copy()
     activity_data['Year'] = activity_data['created_at'].dt.year
@@ -5,21 +5,27 @@ from datetime import datetime, timedelta
 from streamlit_lottie import st_lottie
 import json
 
-def display_sidebar(repo_data, issues_data, pr_data):
+def display_sidebar(repo_index, search_index, max_resolution_days, max_merge_days):
     st.sidebar.header("Filter Options")
 
     filters = {}
 
-    # Filter by repository name or full name
-    search_term = st.sidebar.text_input("Search by Repository Name or Full Name", "")
+    # Search repository names, full names and descriptions through the prebuilt n-gram index
+    search_term = st.sidebar.text_input(
+        "Search Repositories", "",
+        help="Matches names, full names and descriptions; close matches are shown when nothing matches exactly."
+    )
     if search_term:
         filters['search_term'] = search_term
+        suggestions = search_index.suggest(search_term)
+        if suggestions:
+            st.sidebar.caption("Suggestions: " + ", ".join(suggestions))
+        if search_index.is_fuzzy(search_term):
+            st.sidebar.info(f"No exact match for '{search_term}', showing close matches.")
 
-    # Filter by date range
+    # Filter by date range; bounds are read off the repository index
     try:
-        repo_data['created_at'] = pd.to_datetime(repo_data['created_at'], errors='coerce')
-        min_date = repo_data['created_at'].min().date()
-        max_date = repo_data['created_at'].max().date()
+        min_date, max_date = (value.date() for value in repo_index.bounds('created_at'))
     except Exception as e:
         st.sidebar.error(f"Error parsing dates: {str(e)}")
         st.sidebar.error("Using default date range due to parsing errors.")
@@ -40,7 +46,7 @@ def display_sidebar(repo_data, issues_data, pr_data):
         filters['date_range'] = (min_date, max_date)
 
     # Repository size category filter
-    size_categories = repo_data['size_category'].unique().tolist()
+    size_categories = repo_index.categories('size_category')
     filters['selected_category'] = st.sidebar.multiselect(
         "Select Repository Size Categories",
         options=size_categories,
@@ -48,36 +54,38 @@ def display_sidebar(repo_data, issues_data, pr_data):
     )
 
     # Stars and Forks range filters
+    min_stars, max_stars = (int(value) for value in repo_index.bounds('stars'))
+    min_forks, max_forks = (int(value) for value in repo_index.bounds('forks'))
     col1, col2 = st.sidebar.columns(2)
     with col1:
         filters['star_range'] = st.slider(
             "Stars Range",
-            min_value=int(repo_data['stars'].min()),
-            max_value=int(repo_data['stars'].max()),
-            value=(int(repo_data['stars'].min()), int(repo_data['stars'].max()))
+            min_value=min_stars,
+            max_value=max_stars,
+            value=(min_stars, max_stars)
         )
     with col2:
         filters['fork_range'] = st.slider(
             "Forks Range",
-            min_value=int(repo_data['forks'].min()),
-            max_value=int(repo_data['forks'].max()),
-            value=(int(repo_data['forks'].min()), int(repo_data['forks'].max()))
+            min_value=min_forks,
+            max_value=max_forks,
+            value=(min_forks, max_forks)
         )
 
     # Issue resolution time filter
     filters['issue_resolution_time'] = st.sidebar.slider(
         "Issue Resolution Time (days)",
         min_value=0,
-        max_value=int(issues_data['resolution_time_days'].max()),
-        value=(0, int(issues_data['resolution_time_days'].max()))
+        max_value=int(max_resolution_days),
+        value=(0, int(max_resolution_days))
     )
 
     # PR merge time filter
     filters['pr_merge_time'] = st.sidebar.slider(
         "PR Merge Time (days)",
         min_value=0,
-        max_value=int(pr_data['merge_time_days'].max()),
-        value=(0, int(pr_data['merge_time_days'].max()))
+        max_value=int(max_merge_days),
+        value=(0, int(max_merge_days))
     )
 
     # Stale repository filter
@@ -85,44 +93,29 @@ def display_sidebar(repo_data, issues_data, pr_data):
 
     return filters
 
-def apply_filters(repo_data, issues_data, pr_data, filters):
-    # Apply search filter on repository name or full name
-    if 'search_term' in filters and filters['search_term']:
-        search_term = filters['search_term'].lower()
-        repo_data = repo_data[
-            repo_data['name'].str.contains(search_term, case=False, na=False) |
-            repo_data['full_name'].str.contains(search_term, case=False, na=False)
-            ]
-
-    # Apply date range filter
+def apply_filters(repo_index, search_index, filters):
+    # Range and category filters are answered from the repository index and memoised per filter tuple
     start_date, end_date = filters['date_range']
-    repo_data = repo_data[
-        (repo_data['created_at'].dt.date >= start_date) &
-        (repo_data['created_at'].dt.date <= end_date)
-        ]
-
-    # Apply size category filter
+    ranges = {
+        'created_at': (pd.Timestamp(start_date, tz='UTC'),
+                       pd.Timestamp(end_date, tz='UTC') + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')),
+        'stars': filters['star_range'],
+        'forks': filters['fork_range'],
+    }
+    categories = {}
     if filters['selected_category']:
-        repo_data = repo_data[repo_data['size_category'].isin(filters['selected_category'])]
-
-    # Apply stars and forks range filters
-    repo_data = repo_data[
-        (repo_data['stars'] >= filters['star_range'][0]) &
-        (repo_data['stars'] <= filters['star_range'][1]) &
-        (repo_data['forks'] >= filters['fork_range'][0]) &
-        (repo_data['forks'] <= filters['fork_range'][1])
-        ]
-
-    # Apply stale repository filter
+        categories['size_category'] = filters['selected_category']
     if not filters['include_stale']:
-        repo_data = repo_data[~repo_data['stale']]
+        categories['stale'] = [False]
+    mask = repo_index.mask(ranges, categories)
 
-    # Filter issues and PRs based on the filtered repositories
-    filtered_repo_names = repo_data['name'].unique()
-    issues_data = issues_data[issues_data['repository'].isin(filtered_repo_names)]
-    pr_data = pr_data[pr_data['repository'].isin(filtered_repo_names)]
+    # The search index is built over the same rows as the repository index, so the masks line up
+    if 'search_term' in filters and filters['search_term']:
+        mask = mask & search_index.mask(filters['search_term'])
+    repo_data = repo_index.select(mask)
 
-    return repo_data, issues_data, pr_data
+    # Issues and PRs are loaded afterwards for just the remaining repositories
+    return repo_data
 
     # Sidebar Footer
     st.sidebar.markdown("---")
@@ -1,35 +1,232 @@
 # data_loader.py
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import os
-from typing import Tuple, Optional
+from typing import Callable, Iterable, List, Tuple, Optional
+from dashboard.data_processing.cleaner import DATE_COLUMNS, convert_to_datetime
+from dashboard.data_processing.rollups import ROLLUP_GRAIN
+from dashboard.data_processing import analytics_store
+from dashboard.data_processing.exporter import DATA_DIR, current_release_dir, read_manifest
+from data_collection.snapshot_store import read_snapshots, downsample_snapshots
 
-def load_data() -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+def data_path(filename: str, base_path: Optional[str] = None) -> str:
     """
-    Load repository, issues, and pull request data from parquet files.
+    Resolve an exported dataset in `base_path`, by default the live release,
+    falling back to the flat data directory used before releases were introduced.
+    """
+    return os.path.join(base_path or current_release_dir() or DATA_DIR, filename)
+
+def load_manifest() -> dict:
+    """
+    Load the manifest of the live release.
 
     Returns:
-    - Tuple of DataFrames (repo_data, issues_data, pr_data)
-    - Returns None for any DataFrame if the corresponding file is not found
+    - dict with the release `version`, its `path` and, for releases that
+      record them, per-dataset row counts, schema hashes and per-file
+      checksums under `datasets`
+    - Flat (pre-release) data directories get a version derived from file
+      modification times and no `datasets`
     """
-    base_path = os.path.join('dashboard', 'data_processing', 'data')
+    release_dir = current_release_dir()
+    if release_dir is None:
+        mtimes = [entry.stat().st_mtime_ns for entry in os.scandir(DATA_DIR) if entry.name.endswith('.parquet')] \
+            if os.path.isdir(DATA_DIR) else []
+        return {'version': f"flat-{max(mtimes, default=0)}", 'path': DATA_DIR, 'datasets': {}}
+
+    manifest = read_manifest(release_dir)
+    return {**manifest, 'version': manifest.get('version', os.path.basename(release_dir)), 'path': release_dir,
+            'datasets': manifest.get('datasets', {})}
 
+# Columns the dashboard views read from each activity dataset; everything else stays on disk
+ACTIVITY_COLUMNS = {
+    'issues': ['repository', 'state', 'created_at', 'resolution_time_days'],
+    'pull_requests': ['repository', 'state', 'created_at', 'merge_time_days'],
+}
+ACTIVITY_FILES = {'issues': 'issues_data.parquet', 'pull_requests': 'pr_data.parquet'}
+
+def _read_table(path: str, collection: str, columns: Optional[List[str]] = None,
+                repositories: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Read a Parquet file or repository-partitioned dataset through a memory map.
+
+    Only `columns` are decoded; a `repositories` filter prunes whole
+    partitions (and row groups of flat files) before anything is read.
+    """
+    # A typed value set, so an empty selection (nothing matched the filters) reads no rows instead of failing
+    filters = ds.field('repository').isin(pa.array(sorted(repositories), type=pa.string())) \
+        if repositories is not None else None
+    df = pq.read_table(path, columns=columns, filters=filters, memory_map=True).to_pandas()
+    if 'repository' in df.columns:
+        df['repository'] = df['repository'].astype(object)
+    return convert_to_datetime(df, DATE_COLUMNS[collection])
+
+def load_repositories(base_path: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Load the repository table (one row per repository, always read in full).
+
+    Returns:
+    - DataFrame of repositories, or None if the file is not found
+    """
     try:
-        repo_data = pd.read_parquet(os.path.join(base_path, 'repo_data.parquet'))
+        return _read_table(os.path.join(base_path or current_release_dir() or DATA_DIR, 'repo_data.parquet'),
+                           'repositories')
     except FileNotFoundError:
         print("Repository data file not found.")
-        repo_data = None
+        return None
+
+def load_activity(collection: str, repositories: Optional[Iterable[str]] = None,
+                  columns: Optional[List[str]] = None, base_path: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Load issues or pull requests for a set of repositories.
+
+    Parameters:
+    - collection: 'issues' or 'pull_requests'
+    - repositories: repository names to load, or None for all of them
+    - columns: columns to read, defaults to ACTIVITY_COLUMNS for the collection
 
+    Returns:
+    - DataFrame, or None if the file is not found
+    """
     try:
-        issues_data = pd.read_parquet(os.path.join(base_path, 'issues_data.parquet'))
+        if analytics_store.enabled():
+            df = analytics_store.query_activity(collection, repositories, columns or ACTIVITY_COLUMNS[collection], base_path)
+            return convert_to_datetime(df, DATE_COLUMNS[collection])
+        return _read_table(os.path.join(base_path or current_release_dir() or DATA_DIR, ACTIVITY_FILES[collection]),
+                           collection, columns or ACTIVITY_COLUMNS[collection], repositories)
+    except FileNotFoundError:
+        print(f"{collection.replace('_', ' ').capitalize()} data file not found.")
+        return None
+
+def load_column_max(collection: str, column: str, base_path: Optional[str] = None) -> Optional[float]:
+    """
+    Maximum of an activity column, taken from Parquet row-group statistics without reading any rows.
+
+    Falls back to reading just that column when a file carries no statistics.
+    Returns None if the dataset is not found.
+    """
+    path = data_path(ACTIVITY_FILES[collection], base_path)
+    try:
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    except FileNotFoundError:
+        return None
+
+    maxima = []
+    for fragment in dataset.get_fragments():
+        metadata = fragment.metadata
+        index = metadata.schema.names.index(column)
+        for row_group in range(metadata.num_row_groups):
+            statistics = metadata.row_group(row_group).column(index).statistics
+            if statistics is None or not statistics.has_min_max:
+                return _read_table(path, collection, [column])[column].max()
+            maxima.append(statistics.max)
+    return max(maxima) if maxima else None
+
+def load_partition(base_path: str, relative_path: str, partition: str, collection: str,
+                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Load one repository partition file of an activity dataset.
+
+    The partition value is not stored in the file and is added back as the
+    `repository` column.
+    """
+    columns = [col for col in columns or ACTIVITY_COLUMNS[collection] if col != 'repository']
+    df = _read_table(os.path.join(base_path, relative_path), collection, columns)
+    df.insert(0, 'repository', partition)
+    return df
+
+def load_activity_partitions(manifest: dict, collection: str, repositories: Iterable[str],
+                             read_partition: Optional[Callable[..., pd.DataFrame]] = None) -> Optional[pd.DataFrame]:
+    """
+    Load issues or pull requests for `repositories` partition by partition, as listed in the manifest.
+
+    `read_partition(base_path, relative_path, partition, collection, checksum)`
+    lets callers cache partitions by checksum, so a new release only reloads
+    the partitions whose content changed. Falls back to `load_activity` for
+    releases without a manifest or partitioned files, and when the DuckDB
+    analytics backend answers the query instead.
+    """
+    dataset = manifest.get('datasets', {}).get(ACTIVITY_FILES[collection].removesuffix('.parquet'))
+    partitioned = dataset and all(entry['partition'] is not None for entry in dataset['files'].values())
+    if not partitioned or analytics_store.enabled():
+        return load_activity(collection, repositories, base_path=manifest.get('path'))
+
+    if read_partition is None:
+        def read_partition(base_path, relative_path, partition, collection, checksum):
+            return load_partition(base_path, relative_path, partition, collection)
+
+    selected = set(repositories)
+    frames = [read_partition(manifest['path'], relative_path, entry['partition'], collection, entry['sha256'])
+              for relative_path, entry in sorted(dataset['files'].items()) if entry['partition'] in selected]
+    if not frames:
+        return load_activity(collection, [], base_path=manifest['path'])
+    return pd.concat(frames, ignore_index=True)
+
+def load_data() -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """
+    Load repository, issues, and pull request data from parquet files.
+
+    Returns:
+    - Tuple of DataFrames (repo_data, issues_data, pr_data) with all columns
+    - Returns None for any DataFrame if the corresponding file is not found
+
+    Timestamp columns are returned as UTC datetimes. Files exported with typed
+    columns are used as-is; older string-typed files are parsed here once.
+    """
+    # Resolve the release once so all three frames come from the same export
+    base_path = current_release_dir() or DATA_DIR
+    repo_data = load_repositories(base_path)
+
+    try:
+        issues_data = _read_table(os.path.join(base_path, ACTIVITY_FILES['issues']), 'issues')
     except FileNotFoundError:
         print("Issues data file not found.")
         issues_data = None
 
     try:
-        pr_data = pd.read_parquet(os.path.join(base_path, 'pr_data.parquet'))
+        pr_data = _read_table(os.path.join(base_path, ACTIVITY_FILES['pull_requests']), 'pull_requests')
     except FileNotFoundError:
         print("Pull request data file not found.")
         pr_data = None
 
-    return repo_data, issues_data, pr_data
\ No newline at end of file
+    return repo_data, issues_data, pr_data
+
+def load_sketches(base_path: Optional[str] = None) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """
+    Load the quantile and contributor sketches persisted by the exporter.
+
+    Returns:
+    - Tuple of DataFrames (quantile_sketches, contributor_sketches)
+    - Returns None for any sketch file that has not been exported yet
+    """
+    sketches = []
+    for filename in ('quantile_sketches.parquet', 'contributor_sketches.parquet'):
+        try:
+            sketches.append(pd.read_parquet(data_path(filename, base_path)))
+        except FileNotFoundError:
+            sketches.append(None)
+    return tuple(sketches)
+
+def load_snapshots(freq: str = 'D') -> pd.DataFrame:
+    """
+    Load repository star/fork/open-issue history from the snapshot store.
+
+    Returns:
+    - DataFrame with one row per repository (full name) and `freq` period,
+      empty if no snapshots have been collected yet
+    """
+    return downsample_snapshots(read_snapshots(), freq)
+
+def load_rollups(grain: str = ROLLUP_GRAIN, base_path: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    Load the pre-aggregated issue/PR rollup cube for one grain.
+
+    Returns:
+    - DataFrame of rollup cells, or None if the exporter has not produced one
+    """
+    try:
+        return pd.read_parquet(data_path('rollups.parquet', base_path), filters=[('grain', '=', grain)])
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,112 @@
+# dashboard/data_processing/analytics_store.py
+
+import os
+import logging
+from dotenv import load_dotenv
+from dashboard.data_processing.exporter import DATA_DIR, current_release_dir
+
+try:
+    import duckdb
+except ImportError:  # Optional dependency: poetry install -E analytics
+    duckdb = None
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 'duckdb' answers contributor counts and filtered issue/PR reads with SQL; 'pandas' (default) keeps
+# everything in pandas. Transforms and rollups stay in pandas either way: their cells carry sketches
+ANALYTICS_BACKEND = os.getenv("ANALYTICS_BACKEND", "pandas")
+
+# Views created over the exported release, keyed by view name -> dataset file
+ANALYTICS_VIEWS = {
+    'repositories': 'repo_data.parquet',
+    'issues': 'issues_data.parquet',
+    'pull_requests': 'pr_data.parquet',
+    'rollups': 'rollups.parquet',
+}
+
+if ANALYTICS_BACKEND == 'duckdb' and duckdb is None:
+    logging.warning("ANALYTICS_BACKEND=duckdb but duckdb is not installed, using pandas")
+
+
+def enabled():
+    """Whether the DuckDB backend is selected and installed."""
+    return ANALYTICS_BACKEND == 'duckdb' and duckdb is not None
+
+
+def _sql_string(value):
+    """Quote a value as a SQL string literal; DDL such as CREATE VIEW cannot take parameters."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def connect(base_path=None):
+    """Open an in-memory DuckDB database with a view over each dataset of the release.
+
+    Views read the exported Parquet in place (partition pruning and column
+    projection included), so nothing is copied and no server is involved.
+    """
+    base_path = base_path or current_release_dir() or DATA_DIR
+    con = duckdb.connect()
+    con.execute("SET TimeZone = 'UTC'")
+    for view, filename in ANALYTICS_VIEWS.items():
+        path = os.path.join(base_path, filename)
+        if os.path.isdir(path):
+            source = f"read_parquet({_sql_string(os.path.join(path, '**', '*.parquet'))}, hive_partitioning = true)"
+        elif os.path.exists(path):
+            source = f"read_parquet({_sql_string(path)})"
+        else:
+            continue
+        con.execute(f"CREATE VIEW {view} AS SELECT * FROM {source}")
+    return con
+
+
+def query_activity(collection, repositories=None, columns=None, base_path=None):
+    """Filtered, projected read of issues or pull requests.
+
+    Raises FileNotFoundError if the release has no such dataset, like the
+    Parquet readers it replaces.
+    """
+    con = connect(base_path)
+    try:
+        if not con.execute("SELECT count(*) FROM duckdb_views() WHERE view_name = ?", [collection]).fetchone()[0]:
+            raise FileNotFoundError(f"No {collection} dataset in the release")
+        projection = ', '.join(f'"{col}"' for col in columns) if columns else '*'
+        query = f"SELECT {projection} FROM {collection}"
+        if repositories is None:
+            return con.execute(query).df()
+        return con.execute(f"{query} WHERE list_contains(?, repository)", [list(repositories)]).df()
+    finally:
+        con.close()
+
+
+def contributor_counts(issues_df, pr_df):
+    """Distinct issue, PR and overall authors per repository, as in sketches.contributor_counts.
+
+    Counts are exact: DuckDB's columnar hash aggregation over the in-memory
+    frames is fast enough that the sketch approximation is not needed here.
+    """
+    con = duckdb.connect()
+    try:
+        con.register('issue_authors', issues_df[['repository', 'author']])
+        con.register('pr_authors', pr_df[['repository', 'author']])
+        return con.execute("""
+            WITH activity AS (
+                SELECT repository, author, 'issue' AS kind FROM issue_authors
+                UNION ALL
+                SELECT repository, author, 'pull_request' AS kind FROM pr_authors
+            )
+            SELECT repository,
+                   count(DISTINCT author) FILTER (WHERE kind = 'issue') AS issue_contributors,
+                   count(DISTINCT author) FILTER (WHERE kind = 'pull_request') AS pr_contributors,
+                   count(DISTINCT author) AS total_contributors
+            FROM activity
+            WHERE repository IS NOT NULL
+            GROUP BY repository
+            ORDER BY repository
+        """).df().astype({'issue_contributors': int, 'pr_contributors': int, 'total_contributors': int})
+    finally:
+        con.close()
+
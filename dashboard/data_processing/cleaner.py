@@ -6,11 +6,22 @@ import logging
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Timestamp columns per dataset; parsed once at ingest and kept typed downstream
+DATE_COLUMNS = {
+    'repositories': ['created_at', 'updated_at'],
+    'issues': ['created_at', 'updated_at', 'closed_at'],
+    'pull_requests': ['created_at', 'updated_at', 'closed_at', 'merged_at'],
+}
+
 def convert_to_datetime(df, columns):
-    """Convert specified columns to datetime with UTC timezone."""
+    """Convert specified columns to datetime with UTC timezone.
+
+    Columns that already hold datetimes are left untouched, so calling this on
+    typed data (e.g. loaded from Parquet) costs nothing.
+    """
     for col in columns:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce', utc=True)
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors='coerce', utc=True, format='ISO8601')
     return df
 
 def clean_repository_data(repo_df):
@@ -27,7 +38,7 @@ def clean_repository_data(repo_df):
     repo_df['description'] = repo_df['description'].fillna('')
 
     # Convert date columns to datetime
-    repo_df = convert_to_datetime(repo_df, ['created_at', 'updated_at'])
+    repo_df = convert_to_datetime(repo_df, DATE_COLUMNS['repositories'])
 
     # Handle numeric columns
     numeric_columns = ['stars', 'forks', 'open_issues']
@@ -46,7 +57,7 @@ def clean_issues_data(issues_df):
     issues_df = issues_df.drop(columns=columns_to_drop, errors='ignore')
 
     # Convert date columns to datetime
-    issues_df = convert_to_datetime(issues_df, ['created_at', 'updated_at', 'closed_at'])
+    issues_df = convert_to_datetime(issues_df, DATE_COLUMNS['issues'])
 
     return issues_df
 
@@ -61,7 +72,7 @@ def clean_pull_requests_data(pr_df):
     pr_df = pr_df.drop(columns=columns_to_drop, errors='ignore')
 
     # Convert date columns to datetime
-    pr_df = convert_to_datetime(pr_df, ['created_at', 'updated_at', 'closed_at', 'merged_at'])
+    pr_df = convert_to_datetime(pr_df, DATE_COLUMNS['pull_requests'])
 
     return pr_df
 
@@ -0,0 +1,257 @@
+# dashboard/data_processing/exporter.py
+
+import os
+import glob
+import json
+import shutil
+import uuid
+import hashlib
+from urllib.parse import unquote
+import logging
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Exported datasets live in versioned release directories; CURRENT names the live one
+DATA_DIR = os.getenv("EXPORT_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+RELEASES_DIR = os.path.join(DATA_DIR, 'releases')
+CURRENT_FILE = os.path.join(DATA_DIR, 'CURRENT')
+MANIFEST_FILE = 'manifest.json'
+RELEASES_TO_KEEP = 3
+
+# Parquet layout: zstd pages, row groups sized for pruning, min/max statistics on every column
+COMPRESSION = 'zstd'
+ROW_GROUP_SIZE = 128 * 1024
+
+
+def _to_arrow(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # Low-cardinality text columns (repository, state, author, ...) are dictionary encoded
+    dictionary_columns = [field.name for field in table.schema
+                          if pa.types.is_string(field.type) or pa.types.is_dictionary(field.type)]
+    return table, dictionary_columns
+
+
+def write_table(df, path, sort_by=None):
+    """Write a DataFrame as a single Parquet file."""
+    if sort_by:
+        df = df.sort_values(sort_by)
+    table, dictionary_columns = _to_arrow(df)
+    pq.write_table(
+        table, path,
+        compression=COMPRESSION,
+        use_dictionary=dictionary_columns,
+        row_group_size=ROW_GROUP_SIZE,
+        write_statistics=True,
+    )
+
+
+def write_partitioned(df, path, partition_column='repository', sort_by='created_at', replace_partitions=False):
+    """Write a DataFrame as a Hive-partitioned Parquet dataset, one directory per `partition_column` value.
+
+    Rows are sorted by `sort_by` within each partition so row-group min/max
+    statistics allow range filters to skip most of the data. With
+    `replace_partitions`, partitions present in `df` replace those already at
+    `path` and all other partitions are left untouched.
+    """
+    if sort_by in df.columns:
+        df = df.sort_values([partition_column, sort_by])
+    table, dictionary_columns = _to_arrow(df)
+    file_options = ds.ParquetFileFormat().make_write_options(
+        compression=COMPRESSION,
+        use_dictionary=[col for col in dictionary_columns if col != partition_column],
+        write_statistics=True,
+    )
+    ds.write_dataset(
+        table, path,
+        format='parquet',
+        partitioning=[partition_column],
+        partitioning_flavor='hive',
+        file_options=file_options,
+        max_rows_per_group=ROW_GROUP_SIZE,
+        min_rows_per_group=min(ROW_GROUP_SIZE, 8 * 1024),
+        existing_data_behavior='delete_matching' if replace_partitions else 'error',
+        # One partition per repository; pyarrow's default cap of 1024 would fail larger exports
+        max_partitions=max(1024, len(table.column(partition_column).unique())),
+    )
+
+
+def current_release_dir():
+    """Return the directory of the live release, or None if nothing has been exported yet."""
+    try:
+        with open(CURRENT_FILE) as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    release_dir = os.path.join(RELEASES_DIR, version)
+    return release_dir if os.path.isdir(release_dir) else None
+
+
+def read_manifest(release_dir):
+    """Return the manifest of a release, or an empty dict for releases written without one."""
+    try:
+        with open(os.path.join(release_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _link_tree(source, destination):
+    """Recreate `source` at `destination` with hard links, copying where linking is not supported."""
+    shutil.copytree(source, destination, copy_function=_link_or_copy)
+
+
+def _link_or_copy(source, destination):
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def _file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _build_manifest(release_dir, version, watermark, base_release=None):
+    """Describe every file of a release: checksum, row count and size, plus a schema hash per dataset.
+
+    Files hard-linked from `base_release` keep their recorded entry instead of
+    being hashed again.
+    """
+    base_files = {}
+    if base_release:
+        for dataset in read_manifest(base_release).get('datasets', {}).values():
+            base_files.update(dataset['files'])
+
+    datasets = {}
+    for entry in sorted(os.listdir(release_dir)):
+        if not entry.endswith('.parquet'):
+            continue
+        path = os.path.join(release_dir, entry)
+        paths = sorted(glob.glob(os.path.join(path, '**', '*.parquet'), recursive=True)) if os.path.isdir(path) else [path]
+
+        files = {}
+        for file_path in paths:
+            relative = os.path.relpath(file_path, release_dir)
+            base_path = os.path.join(base_release, relative) if base_release else None
+            if relative in base_files and os.path.exists(base_path) and os.path.samefile(file_path, base_path):
+                files[relative] = base_files[relative]
+                continue
+            # Hive directory names carry the URI-encoded partition value
+            partition = next((unquote(part.split('=', 1)[1]) for part in relative.split(os.sep) if '=' in part), None)
+            files[relative] = {
+                'sha256': _file_checksum(file_path),
+                'rows': pq.ParquetFile(file_path).metadata.num_rows,
+                'bytes': os.path.getsize(file_path),
+                'partition': partition,
+            }
+
+        schema = ds.dataset(path, format='parquet', partitioning='hive').schema.remove_metadata()
+        datasets[entry.removesuffix('.parquet')] = {
+            'rows': sum(file['rows'] for file in files.values()),
+            'schema_hash': hashlib.sha256(schema.to_string().encode()).hexdigest(),
+            'files': files,
+        }
+
+    return {
+        'version': version,
+        'created_at': pd.Timestamp.now(tz='UTC').isoformat(),
+        'watermark': watermark,
+        'datasets': datasets,
+    }
+
+
+def _publish(version):
+    """Point CURRENT at a fully written release with a single atomic rename."""
+    tmp_file = f"{CURRENT_FILE}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_file, 'w') as f:
+        f.write(version)
+    os.replace(tmp_file, CURRENT_FILE)
+
+
+def _prune_releases(keep=RELEASES_TO_KEEP):
+    """Remove all but the newest `keep` releases, never the live one."""
+    current = current_release_dir()
+    releases = sorted(name for name in os.listdir(RELEASES_DIR) if not name.startswith('.'))
+    for version in releases[:-keep]:
+        release_dir = os.path.join(RELEASES_DIR, version)
+        if release_dir != current:
+            shutil.rmtree(release_dir, ignore_errors=True)
+
+
+def export_release(tables, partitioned, watermark=None, base_release=None, prerender=None):
+    """Write a new release and atomically make it the live one.
+
+    `tables` maps dataset names (e.g. 'repo_data') to DataFrames; names in
+    `partitioned` are written as repository-partitioned datasets, all others
+    as single files. Readers keep using the previous release until CURRENT is
+    swapped, so they never see a half-written export.
+
+    With `base_release`, partitioned datasets start as hard links to that
+    release and only the partitions present in `tables` are rewritten; any
+    dataset missing from `tables` is carried over unchanged. `watermark` (the
+    newest PocketBase `updated` value exported) is recorded in the manifest
+    for the next incremental export. The manifest also lists every file with
+    its checksum and row count, which the dashboard uses to reload only what
+    changed.
+
+    `prerender(release_dir)`, if given, runs once the datasets are written and
+    may add derived files (e.g. pre-rendered figures) that are published with
+    them. Derived files are never carried over from `base_release`, and a
+    failing `prerender` is logged without stopping the export.
+    """
+    # Microseconds keep versions in publication order, which pruning relies on
+    version = f"{pd.Timestamp.now(tz='UTC').strftime('%Y%m%dT%H%M%S%fZ')}-{uuid.uuid4().hex[:8]}"
+    staging_dir = os.path.join(RELEASES_DIR, f".staging-{version}")
+    os.makedirs(staging_dir)
+
+    try:
+        if base_release:
+            for entry in os.listdir(base_release):
+                if not entry.endswith('.parquet'):
+                    continue
+                name = entry.removesuffix('.parquet')
+                source = os.path.join(base_release, entry)
+                if name in partitioned and os.path.isdir(source):
+                    _link_tree(source, os.path.join(staging_dir, entry))
+                elif name not in tables:
+                    _link_or_copy(source, os.path.join(staging_dir, entry))
+
+        for name, df in tables.items():
+            if df is None or df.empty:
+                logging.warning(f"Skipping empty dataset {name}")
+                continue
+            path = os.path.join(staging_dir, f"{name}.parquet")
+            if name in partitioned:
+                write_partitioned(df, path, replace_partitions=base_release is not None)
+            else:
+                write_table(df, path)
+            logging.info(f"Wrote {len(df)} rows to {name}.parquet")
+
+        if prerender is not None:
+            try:
+                prerender(staging_dir)
+            except Exception as e:
+                logging.error(f"Pre-rendering failed, the release is published without derived files: {e}")
+
+        with open(os.path.join(staging_dir, MANIFEST_FILE), 'w') as f:
+            json.dump(_build_manifest(staging_dir, version, watermark, base_release), f, indent=1)
+
+        release_dir = os.path.join(RELEASES_DIR, version)
+        os.rename(staging_dir, release_dir)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    _publish(version)
+    _prune_releases()
+    logging.info(f"Published release {version}")
+    return release_dir
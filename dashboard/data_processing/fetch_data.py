@@ -2,13 +2,23 @@
 
 import pandas as pd
 import os
-from pocketbase import PocketBase
-from pocketbase.client import ClientResponseError
+import argparse
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import logging
-from cleaner import clean_all_data
-from transformer import transform_all_data
-from pocketbase_config import authenticate_pocketbase
+from dashboard.data_processing.cleaner import (
+    clean_all_data, clean_issues_data, clean_pull_requests_data, clean_repository_data
+)
+from dashboard.data_processing.transformer import (
+    calculate_contributor_activity, transform_activity, transform_repositories
+)
+from dashboard.data_processing.sketches import build_contributor_sketches, build_quantile_sketches
+from dashboard.data_processing.rollups import build_rollups
+from dashboard.data_processing.exporter import current_release_dir, export_release, read_manifest
+from dashboard.prerender import render_default_view
+from dashboard.data_processing.pocketbase_config import POCKETBASE_URL, auth_token
+from data_collection.storage import STORAGE_BACKEND, get_storage, pocketbase_filter
 
 # Load environment variables
 load_dotenv()
@@ -16,36 +26,150 @@ load_dotenv()
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def fetch_data_from_pocketbase(collection_name, page_size=500):
-    """Fetch data from a PocketBase collection and return as a DataFrame."""
+# Fields requested per collection; PocketBase serialises nothing else
+# (`updated` is PocketBase's own modification time, used as the incremental export watermark)
+COLLECTION_FIELDS = {
+    'repositories': ['id', 'updated', 'name', 'full_name', 'description', 'stars', 'forks', 'open_issues',
+                     'created_at', 'updated_at'],
+    'issues': ['id', 'updated', 'repository', 'number', 'title', 'author', 'state',
+               'created_at', 'updated_at', 'closed_at'],
+    'pull_requests': ['id', 'updated', 'repository', 'number', 'title', 'author', 'state',
+                      'created_at', 'updated_at', 'closed_at', 'merged_at'],
+}
+# Pages after the first are fetched concurrently by this many workers
+FETCH_WORKERS = int(os.getenv("POCKETBASE_FETCH_WORKERS", "8"))
+REQUEST_TIMEOUT = 60
+
+def _fetch_page(session, collection_name, page, page_size, fields, filter_query=None, skip_total=True):
+    """Fetch one page of raw records as decoded JSON, re-authenticating once on 401."""
+    url = f"{POCKETBASE_URL.rstrip('/')}/api/collections/{collection_name}/records"
+    params = {'page': page, 'perPage': page_size, 'fields': ','.join(fields)}
+    if filter_query:
+        params['filter'] = filter_query
+    if skip_total:
+        params['skipTotal'] = 1
+    token = None
+    for _ in range(2):
+        token = auth_token(rejected=token)
+        response = session.get(url, params=params, headers={'Authorization': token}, timeout=REQUEST_TIMEOUT)
+        if response.status_code != 401:
+            break
+    response.raise_for_status()
+    return response.json()
+
+def _to_columns(items, fields):
+    """Decode a page of JSON items straight into one list per field."""
+    return {field: [item.get(field) for item in items] for field in fields}
+
+def _fetch_collection(collection_name, page_size=500, fields=None, filters=None):
+    """Fetch all records of a collection matching `filters` into a DataFrame with one column per field.
+
+    `filters` are (field, operator, value) conditions as understood by the
+    storage backends. Non-PocketBase backends are scanned in process.
+    """
+    fields = fields or COLLECTION_FIELDS[collection_name]
+    if STORAGE_BACKEND != 'pocketbase':
+        items = list(get_storage().scan_all(collection_name, fields, filters, per_page=page_size))
+        logging.info(f"Scanned {len(items)} records from {collection_name} ({STORAGE_BACKEND} storage)")
+        return pd.DataFrame(_to_columns(items, fields))
+
+    filter_query = pocketbase_filter(filters) if filters else None
+    with requests.Session() as session:
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=FETCH_WORKERS)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        first = _fetch_page(session, collection_name, 1, page_size, fields, filter_query, skip_total=False)
+        pages = [_to_columns(first['items'], fields)]
+        total_pages = first.get('totalPages', 1)
+        logging.info(f"Fetching {total_pages} pages ({first.get('totalItems', 0)} records) from {collection_name}")
+
+        if total_pages > 1:
+            with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+                results = executor.map(
+                    lambda page: _to_columns(
+                        _fetch_page(session, collection_name, page, page_size, fields, filter_query)['items'],
+                        fields),
+                    range(2, total_pages + 1),
+                )
+                pages.extend(results)
+
+    return pd.DataFrame({field: [value for page in pages for value in page[field]] for field in fields})
+
+def fetch_data_from_pocketbase(collection_name, page_size=500, fields=None, filters=None):
+    """Fetch data from a PocketBase collection and return as a DataFrame.
+
+    Only `fields` (default: COLLECTION_FIELDS for the collection) are requested.
+    The first page reports `totalPages`; the remaining pages are fetched in
+    parallel and concatenated column by column in page order.
+    """
     try:
-        pb = authenticate_pocketbase()
-        all_records = []
-        page = 1
-        while True:
-            records = pb.collection(collection_name).get_list(page=page, per_page=page_size, query_params={"$autoCancel": False})
-            if not records.items:
-                break
-            all_records.extend(records.items)
-            if len(records.items) < page_size:
-                break
-            page += 1
-            logging.info(f"Fetched page {page} from {collection_name}")
-
-        if not all_records:
+        df = _fetch_collection(collection_name, page_size, fields, filters)
+        if df.empty:
             logging.warning(f"No records found in {collection_name}")
             return pd.DataFrame()
 
-        df = pd.DataFrame([{k: v for k, v in record.__dict__.items() if not k.startswith('_')} for record in all_records])
         logging.info(f"Successfully fetched {len(df)} records from {collection_name}")
         return df
-    except ClientResponseError as e:
+    except requests.RequestException as e:
         logging.error(f"Error fetching data from {collection_name}: {e}")
         return pd.DataFrame()
     except Exception as e:
         logging.error(f"Unexpected error fetching data from {collection_name}: {e}")
         return pd.DataFrame()
 
+def _watermark(df, previous=None):
+    """Newest PocketBase `updated` value of a collection's fetched records and the ids carrying it.
+
+    The watermark is kept per collection: collections are fetched one after
+    another, so a single maximum across them could lie past records written
+    to an earlier collection while a later one was downloading. Starting from
+    `previous`, ids are accumulated while the newest value stays the same.
+    Returns None when there is neither data nor a previous watermark.
+    """
+    if df.empty or 'updated' not in df.columns or not df['updated'].notna().any():
+        return previous
+    newest = df['updated'].max()
+    ids = set(df.loc[df['updated'] == newest, 'id'])
+    if previous and previous['updated'] > newest:
+        return previous
+    if previous and previous['updated'] == newest:
+        ids |= set(previous['ids'])
+    return {'updated': newest, 'ids': sorted(ids)}
+
+def _watermarks(**collections):
+    """Per-collection watermarks of fetched DataFrames, keyed by collection name; None if nothing was fetched."""
+    marks = {name: _watermark(df) for name, df in collections.items()}
+    marks = {name: mark for name, mark in marks.items() if mark}
+    return marks or None
+
+def _read_watermarks(manifest):
+    """Per-collection watermarks of a release manifest.
+
+    Releases written before watermarks were kept per collection store one
+    `updated` value for all of them; it is used for every collection, and
+    records exactly at it are fetched again (the upsert by id absorbs them).
+    """
+    watermark = manifest.get('watermark')
+    if isinstance(watermark, str):
+        return {name: {'updated': watermark, 'ids': []} for name in COLLECTION_FIELDS}
+    return watermark or None
+
+def _fetch_changes(collection_name, watermark):
+    """Records of a collection changed since its `watermark`: `updated` at or after it, minus those already exported.
+
+    The comparison is inclusive because several records can share the
+    watermark's timestamp, and not all of them need to have been exported;
+    the ids recorded with it tell which ones were.
+    """
+    if not watermark:
+        return _fetch_collection(collection_name)
+    df = _fetch_collection(collection_name, filters=[('updated', '>=', watermark['updated'])])
+    if df.empty:
+        return df
+    seen = (df['updated'] == watermark['updated']) & df['id'].isin(watermark['ids'])
+    return df[~seen].reset_index(drop=True)
+
 def fetch_and_prepare_data():
     try:
         # Fetch raw data
@@ -54,6 +178,9 @@ def fetch_and_prepare_data():
         issues_df = fetch_data_from_pocketbase('issues')
         pr_df = fetch_data_from_pocketbase('pull_requests')
 
+        # Taken from the raw records, before cleaning drops any of them
+        watermark = _watermarks(repositories=repo_df, issues=issues_df, pull_requests=pr_df)
+
         # Log the shape of each DataFrame
         logging.info(f"Fetched data shapes: repositories: {repo_df.shape}, issues: {issues_df.shape}, pull_requests: {pr_df.shape}")
 
@@ -67,42 +194,159 @@ def fetch_and_prepare_data():
 
         # Transform data for analysis
         logging.info("Transforming data for dashboard visualization...")
-        repo_transformed, issues_transformed, pr_transformed = transform_all_data(repo_df, issues_df, pr_df)
-
-        # Create data directory if it doesn't exist
-        os.makedirs('data', exist_ok=True)
-
-        # Save transformed data to csv files
-        if not repo_transformed.empty:
-            try:
-                repo_transformed.to_csv('data/repo_data.csv')
-            except Exception as e:
-                logging.error(f"Error saving repository data to csv: {e}")
-                # Fallback to CSV if csv fails
-                repo_transformed.to_csv('data/repo_data.csv', index=False)
-                logging.info("Saved repository data to CSV as a fallback")
-
-        if not issues_transformed.empty:
-            try:
-                issues_transformed.to_csv('data/issues_data.csv')
-            except Exception as e:
-                logging.error(f"Error saving issues data to csv: {e}")
-                issues_transformed.to_csv('data/issues_data.csv', index=False)
-                logging.info("Saved issues data to CSV as a fallback")
-
-        if not pr_transformed.empty:
-            try:
-                pr_transformed.to_csv('data/pr_data.csv')
-            except Exception as e:
-                logging.error(f"Error saving pull requests data to csv: {e}")
-                pr_transformed.to_csv('data/pr_data.csv', index=False)
-                logging.info("Saved pull requests data to CSV as a fallback")
-
-        logging.info("Data processing complete. Files saved in data/")
+        issues_transformed, pr_transformed = transform_activity(repo_df, issues_df, pr_df)
+
+        # Derived sketches and rollups ship in the same release as the rows they summarise. The quantile
+        # sketches are built once: the per-repository percentiles of repo_data are served from them
+        sketch_df = build_quantile_sketches(issues_transformed, pr_transformed)
+        repo_transformed = transform_repositories(
+            repo_df, calculate_contributor_activity(issues_transformed, pr_transformed), sketch_df
+        )
+        contributor_sketch_df = build_contributor_sketches(issues_transformed, pr_transformed)
+        rollup_df = build_rollups(issues_transformed, pr_transformed)
+
+        # Write typed Parquet directly; issues and PRs are partitioned by repository
+        release_dir = export_release(
+            {
+                'repo_data': repo_transformed,
+                'issues_data': issues_transformed,
+                'pr_data': pr_transformed,
+                'quantile_sketches': sketch_df,
+                'contributor_sketches': contributor_sketch_df,
+                'rollups': rollup_df,
+            },
+            partitioned={'issues_data', 'pr_data'},
+            watermark=watermark,
+            prerender=render_default_view,
+        )
+
+        logging.info(f"Data processing complete. Files saved in {release_dir}")
+        return release_dir
 
     except Exception as e:
         logging.error(f"Error fetching and preparing data: {e}")
         raise
 
+def _upsert(existing, changes, key='id'):
+    """Replace rows of `existing` whose `key` appears in `changes` and append the new ones."""
+    if existing.empty:
+        return changes
+    if changes.empty:
+        return existing
+    return pd.concat([existing[~existing[key].isin(changes[key])], changes], ignore_index=True)
+
+def _read_release_table(release_dir, name, repositories=None):
+    """Read a dataset from a release, restricted to `repositories` if given; empty if it was never written."""
+    path = os.path.join(release_dir, f"{name}.parquet")
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    filters = [('repository', 'in', sorted(repositories))] if repositories is not None else None
+    df = pd.read_parquet(path, filters=filters)
+    if 'repository' in df.columns:
+        df['repository'] = df['repository'].astype(object)
+    return df
+
+def _replace_repositories(previous, updated, repositories):
+    """Swap the rows of `repositories` in a per-repository derived table."""
+    if previous.empty:
+        return updated
+    return pd.concat([previous[~previous['repository'].isin(repositories)], updated], ignore_index=True)
+
+def export_incremental():
+    """Export only the records changed since the live release and publish them as a new release.
+
+    Repositories, issues and PRs whose PocketBase `updated` time is at or after
+    their collection's watermark in the live release, and that the release does
+    not already hold at that time, are fetched and upserted by record id. Only
+    the issue/PR partitions of affected repositories are rewritten (the rest
+    are hard-linked from the live release), and contributor counts, sketches
+    and rollups are recomputed for those repositories only. Falls back to a
+    full export when the live release has no watermark. Deleted records are
+    only dropped by a full export.
+    """
+    base_release = current_release_dir()
+    watermarks = _read_watermarks(read_manifest(base_release)) if base_release else None
+    if not watermarks:
+        logging.info("No export watermark found, running a full export")
+        return fetch_and_prepare_data()
+
+    try:
+        # Errors propagate here: skipping a failed collection would advance the watermark past its changes
+        logging.info(f"Fetching records changed since {({name: mark['updated'] for name, mark in watermarks.items()})}...")
+        repo_changes = _fetch_changes('repositories', watermarks.get('repositories'))
+        issue_changes = _fetch_changes('issues', watermarks.get('issues'))
+        pr_changes = _fetch_changes('pull_requests', watermarks.get('pull_requests'))
+        logging.info(f"Changed records: repositories: {len(repo_changes)}, issues: {len(issue_changes)}, pull_requests: {len(pr_changes)}")
+
+        next_watermarks = {name: mark for name, mark in (
+            (name, _watermark(changes, watermarks.get(name))) for name, changes in
+            (('repositories', repo_changes), ('issues', issue_changes), ('pull_requests', pr_changes))
+        ) if mark}
+
+        if repo_changes.empty and issue_changes.empty and pr_changes.empty:
+            logging.info("No changes since the last export")
+            return base_release
+
+        # Repositories are small; upsert their raw columns and re-derive metrics for all of them
+        repo_previous = _read_release_table(base_release, 'repo_data')
+        repo_columns = [col for col in COLLECTION_FIELDS['repositories'] if col in repo_previous.columns]
+        repo_df = _upsert(repo_previous[repo_columns], clean_repository_data(repo_changes))
+
+        issue_changes, pr_changes = transform_activity(
+            repo_df, clean_issues_data(issue_changes), clean_pull_requests_data(pr_changes)
+        )
+        affected = set(issue_changes['repository'].dropna()) | set(pr_changes['repository'].dropna())
+
+        tables = {}
+        contributors_df = repo_previous[['name', 'issue_contributors', 'pr_contributors', 'total_contributors']]
+        contributors_df = contributors_df.rename(columns={'name': 'repository'})
+        if affected:
+            logging.info(f"Rewriting partitions of {len(affected)} repositories")
+            issues_df = _upsert(_read_release_table(base_release, 'issues_data', affected), issue_changes)
+            pr_df = _upsert(_read_release_table(base_release, 'pr_data', affected), pr_changes)
+            issues_df = issues_df.drop_duplicates(subset=['number', 'repository'], keep='last')
+            pr_df = pr_df.drop_duplicates(subset=['number', 'repository'], keep='last')
+
+            contributors_df = _replace_repositories(
+                contributors_df, calculate_contributor_activity(issues_df, pr_df), affected
+            )
+            derived = {
+                'quantile_sketches': build_quantile_sketches(issues_df, pr_df),
+                'contributor_sketches': build_contributor_sketches(issues_df, pr_df),
+                'rollups': build_rollups(issues_df, pr_df),
+            }
+            tables.update(issues_data=issues_df, pr_data=pr_df)
+            for name, updated in derived.items():
+                tables[name] = _replace_repositories(_read_release_table(base_release, name), updated, affected)
+
+        # Percentiles of unaffected repositories come from their sketches in the live release
+        sketch_df = tables.get('quantile_sketches')
+        if sketch_df is None:
+            sketch_df = _read_release_table(base_release, 'quantile_sketches')
+        tables['repo_data'] = transform_repositories(
+            repo_df, contributors_df, sketch_df if not sketch_df.empty else None
+        )
+        release_dir = export_release(
+            tables,
+            partitioned={'issues_data', 'pr_data'},
+            watermark=next_watermarks,
+            base_release=base_release,
+            prerender=render_default_view,
+        )
+
+        logging.info(f"Incremental export complete. Files saved in {release_dir}")
+        return release_dir
+
+    except Exception as e:
+        logging.error(f"Error during incremental export: {e}")
+        raise
+
 if __name__ == "__main__":
-    fetch_and_prepare_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Export PocketBase data for the dashboard")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only merge records changed since the last export")
+    args = parser.parse_args()
+    if args.incremental:
+        export_incremental()
+    else:
+        fetch_and_prepare_data()
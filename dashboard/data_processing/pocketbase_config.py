@@ -1,6 +1,10 @@
 # dashboard/data_processing/pocketbase_config.py
 
 import os
+import json
+import time
+import base64
+import threading
 from pocketbase import PocketBase
 from pocketbase.client import ClientResponseError
 from dotenv import load_dotenv
@@ -20,20 +24,48 @@ pb = PocketBase(POCKETBASE_URL)
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def authenticate_pocketbase():
-    """Authenticate with PocketBase using admin credentials."""
+# Re-authenticate when the cached token expires within this many seconds
+TOKEN_REFRESH_MARGIN = 60
+
+# Serialises the token check and refresh across the fetch worker threads
+_auth_lock = threading.Lock()
+
+def _token_expired(token):
+    """Check the `exp` claim of a PocketBase JWT."""
     try:
-        # Authenticate PocketBase admin
-        pb.admins.auth_with_password(POCKETBASE_EMAIL, POCKETBASE_PASSWORD)
-        logging.info("Successfully authenticated with PocketBase")
-        return pb
-    except ClientResponseError as e:
-        logging.error(f"Failed to authenticate with PocketBase: {e}")
-        raise
-    except Exception as e:
-        logging.error(f"Unexpected error during PocketBase authentication: {e}")
-        raise
+        payload = token.split('.')[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return claims['exp'] - TOKEN_REFRESH_MARGIN <= time.time()
+    except (IndexError, KeyError, ValueError):
+        return True
+
+def authenticate_pocketbase(force=False, rejected=None):
+    """Authenticate with PocketBase using admin credentials.
+
+    The admin token is cached on the shared client and reused until it is
+    about to expire, so repeated calls do not log in again. Pass the token a
+    request was refused with as `rejected`: threads that hit the same 401 then
+    share one login instead of each logging in again.
+    """
+    with _auth_lock:
+        token = pb.auth_store.token
+        if not force and token and not _token_expired(token) and (rejected is None or token != rejected):
+            return pb
+        try:
+            # Authenticate PocketBase admin
+            pb.admins.auth_with_password(POCKETBASE_EMAIL, POCKETBASE_PASSWORD)
+            logging.info("Successfully authenticated with PocketBase")
+            return pb
+        except ClientResponseError as e:
+            logging.error(f"Failed to authenticate with PocketBase: {e}")
+            raise
+        except Exception as e:
+            logging.error(f"Unexpected error during PocketBase authentication: {e}")
+            raise
 
+def auth_token(force=False, rejected=None):
+    """Return a valid admin token for raw HTTP requests against the PocketBase API."""
+    return authenticate_pocketbase(force=force, rejected=rejected).auth_store.token
 
 if __name__ == "__main__":
     # Test the PocketBase authentication
@@ -0,0 +1,121 @@
+# dashboard/data_processing/rollups.py
+
+import numpy as np
+import pandas as pd
+import logging
+from dashboard.data_processing.sketches import (
+    DEFAULT_QUANTILES, QUANTILE_METRICS, HyperLogLog, grouped_digests, grouped_hll_sketches, merge_sketches
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Cells are monthly; the grain is stored with them so finer grains can be added without a new file format
+ROLLUP_GRAIN = 'month'
+ROLLUP_FREQ = 'M'
+ROLLUP_KEYS = ['grain', 'repository', 'period', 'kind', 'state']
+ROLLUP_COLUMNS = ROLLUP_KEYS + ['count', 'duration_sum', 'duration_count', 'duration_sketch', 'author_sketch']
+
+
+def _activity_frame(kind, df, metric):
+    """Project issues or PRs onto the common columns the cube is built from."""
+    return pd.DataFrame({
+        'repository': df['repository'],
+        'kind': kind,
+        'state': df['state'],
+        'created_at': df['created_at'],
+        'duration': df[metric].where(df[metric] >= 0),
+        'author': df['author'] if 'author' in df.columns else None,
+    }).dropna(subset=['repository', 'created_at'])
+
+
+def build_rollups(issues_df, pr_df):
+    """Pre-aggregate issues and PRs per (repository, month, kind, state).
+
+    Each cell has the item `count`, the `duration_sum`/`duration_count` of
+    resolution (issues) or merge (PRs) times, a serialized t-digest of those
+    durations and a HyperLogLog of authors, so any filtered view can be
+    answered by re-aggregating the cube.
+
+    Items without a repository or creation date have no cell and are left out;
+    items without a state are counted in cells with a missing state.
+    """
+    frames = [_activity_frame(kind, df, QUANTILE_METRICS[collection])
+              for kind, collection, df in (('issue', 'issues', issues_df), ('pull_request', 'pull_requests', pr_df))
+              if not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+    activity = pd.concat(frames, ignore_index=True)
+    activity['period'] = activity['created_at'].dt.tz_localize(None).dt.to_period(ROLLUP_FREQ).dt.start_time
+    grouped = activity.groupby(['repository', 'period', 'kind', 'state'], sort=True, observed=True, dropna=False)
+    cube = grouped.agg(
+        count=('kind', 'size'),
+        duration_sum=('duration', 'sum'),
+        duration_count=('duration', 'count'),
+    ).reset_index()
+
+    # Sketches are built for all cells at once, keyed by the cell's position in the cube
+    cells = grouped.ngroup().to_numpy()
+    present, payloads, _ = grouped_digests(cells, activity['duration'].to_numpy())
+    cube['duration_sketch'] = None
+    cube.loc[present, 'duration_sketch'] = pd.Series(payloads, index=present, dtype=object)
+    cube['author_sketch'] = None
+    if activity['author'].notna().any():
+        authors = grouped_hll_sketches(activity.assign(cell=cells), 'cell', 'author')
+        cube.loc[authors.index, 'author_sketch'] = authors
+
+    rollups = cube.assign(grain=ROLLUP_GRAIN)[ROLLUP_COLUMNS]
+    logging.info(f"Built {len(rollups)} rollup cells from {len(activity)} issues and pull requests")
+    return rollups
+
+
+def filter_rollups(rollup_df, repositories=None, grain=ROLLUP_GRAIN, start=None, end=None):
+    """Select the cells of one grain for a set of repositories and period range."""
+    selected = rollup_df[rollup_df['grain'] == grain]
+    if repositories is not None:
+        selected = selected[selected['repository'].isin(list(repositories))]
+    if start is not None:
+        selected = selected[selected['period'] >= pd.Timestamp(start)]
+    if end is not None:
+        selected = selected[selected['period'] <= pd.Timestamp(end)]
+    return selected
+
+
+def aggregate_rollups(rollup_df, by=('kind', 'state')):
+    """Re-aggregate cube cells by the given columns, summing counts and durations."""
+    by = list(by)
+    if rollup_df.empty:
+        return pd.DataFrame(columns=by + ['count', 'duration_sum', 'duration_count'])
+    return rollup_df.groupby(by, observed=True)[['count', 'duration_sum', 'duration_count']].sum().reset_index()
+
+
+def count_by_state(rollup_df, kind, state=None):
+    """Total items of one kind (optionally one state) in the selected cells."""
+    selected = rollup_df[rollup_df['kind'] == kind]
+    if state is not None:
+        selected = selected[selected['state'] == state]
+    return int(selected['count'].sum())
+
+
+def mean_duration(rollup_df, kind):
+    """Mean resolution/merge time in days across the selected cells; NaN if none completed."""
+    selected = rollup_df[rollup_df['kind'] == kind]
+    completed = selected['duration_count'].sum()
+    return selected['duration_sum'].sum() / completed if completed else np.nan
+
+
+def duration_quantiles(rollup_df, kind, quantiles=DEFAULT_QUANTILES):
+    """Merge duration sketches of the selected cells into quantile estimates."""
+    payloads = rollup_df.loc[rollup_df['kind'] == kind, 'duration_sketch'].dropna()
+    digest = merge_sketches(payloads)
+    return {q: float(v) for q, v in zip(quantiles, np.atleast_1d(digest.quantile(quantiles)))}
+
+
+def distinct_authors(rollup_df):
+    """Estimate distinct authors across the selected cells."""
+    sketch = None
+    for payload in rollup_df['author_sketch'].dropna():
+        other = HyperLogLog.from_bytes(payload)
+        sketch = other if sketch is None else sketch.merge(other)
+    return sketch.estimate() if sketch is not None else 0.0
@@ -0,0 +1,430 @@
+# dashboard/data_processing/sketches.py
+
+import numpy as np
+import pandas as pd
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Duration columns summarised by quantile sketches; negative values mark unresolved/unmerged rows
+QUANTILE_METRICS = {
+    'issues': 'resolution_time_days',
+    'pull_requests': 'merge_time_days',
+}
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+DEFAULT_COMPRESSION = 200
+
+
+class TDigest:
+    """Mergeable t-digest for streaming quantile estimation.
+
+    Values are folded into about `compression / 2` weighted centroids, with
+    finer resolution near the tails. Two digests merge by pooling their
+    centroids and compressing again, so per-repository digests can be combined
+    into the digest of any set of repositories without revisiting raw rows.
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        """Add a batch of values to the digest."""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(values.size)]))
+        return self
+
+    def merge(self, other):
+        """Fold another digest into this one."""
+        if other.weights.size == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='mergesort')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # Assign each centroid to a unit-width bucket of the k1 scale function,
+        # evaluated at its left cumulative weight; each bucket becomes one centroid.
+        q_left = (np.cumsum(weights) - weights) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(np.clip(2 * q_left - 1, -1, 1))
+        buckets = np.floor(k - k[0]).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+
+        merged_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / merged_weights
+        self.weights = merged_weights
+
+    def quantile(self, q):
+        """Estimate one or more quantiles (0 <= q <= 1); NaN for an empty digest."""
+        q = np.asarray(q, dtype=float)
+        if self.weights.size == 0:
+            return np.full(q.shape, np.nan) if q.ndim else float('nan')
+        centers = np.cumsum(self.weights) - self.weights / 2
+        xs = np.r_[0.0, centers, self.count]
+        ys = np.r_[self.min, self.means, self.max]
+        result = np.interp(q * self.count, xs, ys)
+        return result if q.ndim else float(result)
+
+    def to_bytes(self):
+        header = np.array([self.compression, self.min, self.max, self.means.size], dtype=float)
+        return np.concatenate([header, self.means, self.weights]).tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload):
+        data = np.frombuffer(payload, dtype=float)
+        compression, min_value, max_value, size = data[:4]
+        size = int(size)
+        digest = cls(compression=int(compression))
+        digest.min, digest.max = min_value, max_value
+        digest.means = data[4:4 + size].copy()
+        digest.weights = data[4 + size:4 + 2 * size].copy()
+        return digest
+
+
+def grouped_digests(codes, values, compression=DEFAULT_COMPRESSION):
+    """Serialized t-digest of the values of each group, all groups compressed in one vectorized pass.
+
+    `codes` are integer group codes (negative codes and NaN values are left
+    out). Each digest is the one `TDigest(compression).update(values)` builds
+    for the group, without a Python-level compression per group.
+
+    Returns the sorted codes of the non-empty groups, their payloads and value counts.
+    """
+    codes, values = np.asarray(codes), np.asarray(values, dtype=float)
+    keep = (codes >= 0) & ~np.isnan(values)
+    codes, values = codes[keep], values[keep]
+    if values.size == 0:
+        return np.empty(0, dtype=np.int64), [], np.empty(0, dtype=np.int64)
+    # Stable: within a group, equal values keep their order, as in TDigest._compress
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+
+    group_starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    sizes = np.diff(np.r_[group_starts, codes.size])
+    ranks = np.arange(codes.size) - np.repeat(group_starts, sizes)
+    # The k1 bucket of every value, as TDigest._compress assigns them to a digest of unit weights
+    q_left = ranks / np.repeat(sizes, sizes).astype(float)
+    k = compression / (2 * np.pi) * np.arcsin(np.clip(2 * q_left - 1, -1, 1))
+    buckets = np.floor(k - np.repeat(k[group_starts], sizes)).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, (buckets[1:] != buckets[:-1]) | (codes[1:] != codes[:-1])])
+
+    weights = np.add.reduceat(np.ones(values.size), starts)
+    means = np.add.reduceat(values, starts) / weights
+    # Centroid ranges of each group
+    bounds = np.searchsorted(starts, np.r_[group_starts, codes.size])
+    mins, maxs = values[group_starts], values[np.r_[group_starts[1:], codes.size] - 1]
+
+    payloads = []
+    for i in range(group_starts.size):
+        first, last = bounds[i], bounds[i + 1]
+        header = np.array([compression, mins[i], maxs[i], last - first], dtype=float)
+        payloads.append(np.concatenate([header, means[first:last], weights[first:last]]).tobytes())
+    return codes[group_starts], payloads, sizes
+
+
+def build_quantile_sketches(issues_df, pr_df, compression=DEFAULT_COMPRESSION):
+    """Build one t-digest per (repository, metric) from transformed issues and PRs.
+
+    Returns a DataFrame with `repository`, `metric`, `count` and the serialized
+    `sketch`, ready to be persisted next to the exported data.
+    """
+    frames = []
+    for df, metric in ((issues_df, QUANTILE_METRICS['issues']), (pr_df, QUANTILE_METRICS['pull_requests'])):
+        if df.empty or metric not in df.columns:
+            continue
+        completed = df[df[metric] >= 0]
+        # Sorted like groupby('repository') orders its groups
+        codes, repositories = pd.factorize(completed['repository'], sort=True)
+        present, payloads, counts = grouped_digests(codes, completed[metric].to_numpy(), compression)
+        frames.append(pd.DataFrame({'repository': np.asarray(repositories)[present], 'metric': metric,
+                                    'count': counts.astype(int), 'sketch': payloads}))
+
+    sketch_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=['repository', 'metric', 'count', 'sketch'])
+    logging.info(f"Built {len(sketch_df)} quantile sketches")
+    return sketch_df
+
+
+def merge_sketches(payloads):
+    """Merge serialized t-digests into a single digest, at the compression of the first one."""
+    digests = (TDigest.from_bytes(payload) for payload in payloads)
+    digest = next(digests, None) or TDigest()
+    for other in digests:
+        digest.merge(other)
+    return digest
+
+
+def sketch_quantiles(sketch_df, metric, repositories=None, quantiles=DEFAULT_QUANTILES):
+    """Serve quantiles of `metric` for one repository or any union of repositories.
+
+    `repositories=None` means all repositories in `sketch_df`.
+    """
+    selected = sketch_df[sketch_df['metric'] == metric]
+    if repositories is not None:
+        selected = selected[selected['repository'].isin(list(repositories))]
+    digest = merge_sketches(selected['sketch'])
+    return {q: float(v) for q, v in zip(quantiles, np.atleast_1d(digest.quantile(quantiles)))}
+
+
+def repository_quantiles(sketch_df, metric, quantiles=DEFAULT_QUANTILES, prefix=None):
+    """Return one row per repository with `p50`/`p90`/... columns for `metric`."""
+    prefix = prefix or metric
+    columns = [f"{prefix}_p{round(q * 100):d}" for q in quantiles]
+    selected = sketch_df[sketch_df['metric'] == metric]
+    rows = [
+        [repository] + list(np.atleast_1d(TDigest.from_bytes(payload).quantile(quantiles)))
+        for repository, payload in zip(selected['repository'], selected['sketch'])
+    ]
+    return pd.DataFrame(rows, columns=['repository'] + columns)
+
+
+def repository_box_statistics(sketch_df, metric):
+    """Per-repository box statistics of `metric` estimated from its sketches, for box plots without raw rows.
+
+    Quartiles come from the digests; the whiskers are the Tukey limits
+    (1.5 IQR past the quartiles) clamped to the observed minimum and maximum,
+    as the digest does not keep the most extreme values inside the limits.
+
+    Returns a DataFrame indexed by repository with q1, median, q3, mean,
+    total, lowerfence and upperfence, ordered by total descending.
+    """
+    selected = sketch_df[sketch_df['metric'] == metric]
+    rows = []
+    for payload in selected['sketch']:
+        digest = TDigest.from_bytes(payload)
+        q1, median, q3 = digest.quantile([0.25, 0.5, 0.75])
+        total = float((digest.means * digest.weights).sum())
+        rows.append([q1, median, q3, total / digest.count, total, digest.min, digest.max])
+    stats = pd.DataFrame(rows, columns=['q1', 'median', 'q3', 'mean', 'total', 'min', 'max'],
+                         index=pd.Index(selected['repository'], name='repository'))
+    iqr = stats['q3'] - stats['q1']
+    stats['lowerfence'] = np.maximum(stats['min'], stats['q1'] - 1.5 * iqr)
+    stats['upperfence'] = np.minimum(stats['max'], stats['q3'] + 1.5 * iqr)
+    return stats.drop(columns=['min', 'max']).sort_values('total', ascending=False)
+
+
+DEFAULT_HLL_PRECISION = 12
+
+
+def _hash_values(values):
+    """Hash values to uint64 with pandas' vectorized, process-stable hashing."""
+    series = pd.Series(values, dtype=object).dropna().astype(str)
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+def _register_ranks(hashes, precision):
+    """Split 64-bit hashes into register indices and HyperLogLog ranks."""
+    index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+    remainder = hashes << np.uint64(precision)
+
+    # Count leading zeros exactly by looking at each 32-bit half separately
+    high = (remainder >> np.uint64(32)).astype(np.float64)
+    low = (remainder & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    with np.errstate(divide='ignore'):
+        leading_zeros = np.where(high > 0, 31 - np.floor(np.log2(high)),
+                                 np.where(low > 0, 63 - np.floor(np.log2(low)), 64))
+    rank = np.minimum(leading_zeros + 1, 64 - precision + 1)
+    return index, rank.astype(np.uint8)
+
+
+def _hll_estimate(m, zeros, nonzero_harmonic_sum):
+    """HyperLogLog estimate from register statistics; works element-wise on arrays.
+
+    `nonzero_harmonic_sum` is the sum of 2**-rank over non-zero registers; each
+    zero register contributes 1 to the harmonic sum.
+    """
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / (zeros + nonzero_harmonic_sum)
+    # Linear counting is more accurate for small cardinalities
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+def _encode_sparse(precision, index, rank):
+    """Serialize non-zero registers in the sparse or dense layout, whichever is smaller."""
+    m = 1 << precision
+    if index.size * 3 < m:
+        return bytes([precision, 1]) + index.astype(np.uint16).tobytes() + rank.astype(np.uint8).tobytes()
+    registers = np.zeros(m, dtype=np.uint8)
+    registers[index] = rank
+    return bytes([precision, 0]) + registers.tobytes()
+
+
+class HyperLogLog:
+    """Mergeable HyperLogLog sketch for distinct counting.
+
+    Uses 2**precision one-byte registers (4 KiB at the default precision, about
+    1.6% standard error) regardless of how many values are added. Merging is an
+    element-wise max of registers, so sketches for any set of repositories or
+    time windows combine into the sketch of their union.
+    """
+
+    def __init__(self, precision=DEFAULT_HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values):
+        """Add a batch of values (e.g. author logins); nulls are ignored."""
+        hashes = _hash_values(values)
+        if hashes.size:
+            index, rank = _register_ranks(hashes, self.precision)
+            np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other):
+        """Fold another sketch with the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precisions")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        nonzero = self.registers[self.registers > 0]
+        return float(_hll_estimate(self.registers.size, self.registers.size - nonzero.size,
+                                   np.ldexp(1.0, -nonzero.astype(np.int64)).sum()))
+
+    def to_bytes(self):
+        """Serialize, storing only non-zero registers while the sketch is sparse."""
+        nonzero = np.flatnonzero(self.registers)
+        return _encode_sparse(self.precision, nonzero, self.registers[nonzero])
+
+    @classmethod
+    def from_bytes(cls, payload):
+        sketch = cls(precision=payload[0])
+        body = np.frombuffer(payload, dtype=np.uint8, offset=2)
+        if payload[1]:
+            size = body.size // 3
+            index = body[:2 * size].view(np.uint16)
+            sketch.registers[index] = body[2 * size:]
+        else:
+            sketch.registers[:] = body
+        return sketch
+
+
+def grouped_distinct_counts(df, group_columns, value_column, precision=DEFAULT_HLL_PRECISION):
+    """Estimate distinct `value_column` values per group with one HLL per group.
+
+    All groups are sketched in a single vectorized pass over sparse registers,
+    so memory follows the number of rows rather than groups x 2**precision.
+    """
+    groups, cells = _grouped_sparse_registers(df, group_columns, value_column, precision)
+    m = 1 << precision
+    per_group = cells.groupby('code').agg(nonzero=('rank', 'size'), harmonic=('weight', 'sum'))
+    per_group = per_group.reindex(range(len(groups)), fill_value=0)
+    estimates = _hll_estimate(m, m - per_group['nonzero'].to_numpy(), per_group['harmonic'].to_numpy())
+    return pd.Series(estimates, index=groups, dtype=float)
+
+
+def grouped_hll_sketches(df, group_columns, value_column, precision=DEFAULT_HLL_PRECISION):
+    """Build one serialized HyperLogLog per group; returns a Series of bytes indexed by group."""
+    groups, cells = _grouped_sparse_registers(df, group_columns, value_column, precision)
+    codes = cells['code'].to_numpy()
+    bounds = np.searchsorted(codes, np.arange(len(groups) + 1))
+    index, rank = cells['index'].to_numpy(), cells['rank'].to_numpy()
+    payloads = [_encode_sparse(precision, index[lo:hi], rank[lo:hi]) for lo, hi in zip(bounds[:-1], bounds[1:])]
+    return pd.Series(payloads, index=groups, dtype=object)
+
+
+def _grouped_sparse_registers(df, group_columns, value_column, precision):
+    """Return the sorted group keys and one row per non-zero (group, register) pair."""
+    group_columns = [group_columns] if isinstance(group_columns, str) else list(group_columns)
+    valid = df[group_columns + [value_column]].dropna()
+    grouped = valid.groupby(group_columns, sort=True, observed=True)
+    groups = grouped.size().index
+    index, rank = _register_ranks(_hash_values(valid[value_column]), precision)
+    cells = (pd.DataFrame({'code': grouped.ngroup().to_numpy(), 'index': index, 'rank': rank})
+             .groupby(['code', 'index'], sort=True)['rank'].max().reset_index())
+    cells['weight'] = np.ldexp(1.0, -cells['rank'].to_numpy().astype(np.int64))
+    return groups, cells
+
+
+def build_contributor_sketches(issues_df, pr_df, freq='M', precision=DEFAULT_HLL_PRECISION):
+    """Build one HyperLogLog of issue/PR authors per (repository, time window).
+
+    Windows are keyed by the start of the `freq` period containing `created_at`.
+    Returns a DataFrame with `repository`, `window` and the serialized `sketch`.
+    """
+    frames = [df[['repository', 'author', 'created_at']]
+              for df in (issues_df, pr_df) if not df.empty and 'author' in df.columns]
+    if not frames:
+        logging.warning("No author data available, skipping contributor sketches")
+        return pd.DataFrame(columns=['repository', 'window', 'sketch'])
+
+    activity = pd.concat(frames, ignore_index=True).dropna(subset=['created_at'])
+    activity['window'] = activity['created_at'].dt.tz_localize(None).dt.to_period(freq).dt.start_time
+
+    sketches = grouped_hll_sketches(activity, ['repository', 'window'], 'author', precision)
+    sketch_df = pd.DataFrame({
+        'repository': sketches.index.get_level_values('repository'),
+        'window': sketches.index.get_level_values('window'),
+        'sketch': sketches.to_numpy(),
+    })
+    logging.info(f"Built {len(sketch_df)} contributor sketches")
+    return sketch_df
+
+
+def estimate_contributors(sketch_df, repositories=None, start=None, end=None):
+    """Estimate distinct contributors across any set of repositories and time windows.
+
+    `repositories=None` means all repositories; `start`/`end` bound the window
+    start dates (inclusive) and may be left open.
+    """
+    selected = sketch_df
+    if repositories is not None:
+        selected = selected[selected['repository'].isin(list(repositories))]
+    if start is not None:
+        selected = selected[selected['window'] >= pd.Timestamp(start)]
+    if end is not None:
+        selected = selected[selected['window'] <= pd.Timestamp(end)]
+
+    sketch = None
+    for payload in selected['sketch']:
+        other = HyperLogLog.from_bytes(payload)
+        sketch = other if sketch is None else sketch.merge(other)
+    return sketch.estimate() if sketch is not None else 0.0
+
+
+def contributor_counts(issues_df, pr_df, fallback_column='title'):
+    """Count distinct issue, PR and overall contributors (authors) per repository.
+
+    `total_contributors` is the distinct count over the union of issue and PR
+    authors, not the sum of both. Data collected before authors were captured
+    has no `author` column; `fallback_column` is then counted instead, as before.
+    """
+    counts = {}
+    for name, df in (('issue_contributors', issues_df), ('pr_contributors', pr_df)):
+        if 'author' in df.columns:
+            counts[name] = grouped_distinct_counts(df, 'repository', 'author')
+        else:
+            logging.warning(f"No author column, counting distinct '{fallback_column}' for {name}")
+            counts[name] = df.groupby('repository')[fallback_column].nunique().astype(float)
+
+    contributors_df = pd.DataFrame(counts).rename_axis('repository').fillna(0).round()
+    if 'author' in issues_df.columns and 'author' in pr_df.columns:
+        authors = pd.concat([issues_df[['repository', 'author']], pr_df[['repository', 'author']]])
+        contributors_df['total_contributors'] = grouped_distinct_counts(authors, 'repository', 'author').round()
+    else:
+        contributors_df['total_contributors'] = contributors_df['issue_contributors'] + contributors_df['pr_contributors']
+
+    return contributors_df.fillna(0).astype(int).reset_index()
@@ -1,15 +1,17 @@
 import pandas as pd
 import logging
+from dashboard.data_processing.sketches import QUANTILE_METRICS, contributor_counts, repository_quantiles
+from dashboard.data_processing import analytics_store
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
 def calculate_issue_resolution_time(issues_df):
-    """Calculate issue resolution time in days."""
-    issues_df['created_at'] = pd.to_datetime(issues_df['created_at'], utc=True, errors='coerce')
-    issues_df['closed_at'] = pd.to_datetime(issues_df['closed_at'], utc=True, errors='coerce')
+    """Calculate issue resolution time in days.
 
+    Expects `created_at`/`closed_at` to already be typed by the cleaner.
+    """
     # Calculate resolution time in days
     issues_df['resolution_time_days'] = (issues_df['closed_at'] - issues_df['created_at']).dt.total_seconds() / (
                 24 * 3600)
@@ -20,9 +22,10 @@ def calculate_issue_resolution_time(issues_df):
     return issues_df
 
 def calculate_pr_merge_time(pr_df):
-    """Calculate pull request merge time in days."""
-    pr_df['created_at'] = pd.to_datetime(pr_df['created_at'], utc=True, errors='coerce')
-    pr_df['merged_at'] = pd.to_datetime(pr_df['merged_at'], utc=True, errors='coerce')
+    """Calculate pull request merge time in days.
+
+    Expects `created_at`/`merged_at` to already be typed by the cleaner.
+    """
     pr_df['merge_time_days'] = (pr_df['merged_at'] - pr_df['created_at']).dt.total_seconds() / (24 * 3600)
     pr_df['merge_time_days'] = pr_df['merge_time_days'].fillna(-1)
     return pr_df
@@ -36,14 +39,13 @@ def categorize_repositories(repo_df):
 
 def flag_stale_repositories(repo_df):
     """Flag repositories that haven't been updated in over 6 months as stale."""
-    # Ensure 'updated_at' is in datetime format and handle invalid values
-    repo_df['updated_at'] = pd.to_datetime(repo_df['updated_at'], errors='coerce', utc=True)
+    now = pd.Timestamp.now(tz='UTC')
 
     # Fill any missing or invalid 'updated_at' with the current timestamp
-    repo_df['updated_at'] = repo_df['updated_at'].fillna(pd.Timestamp.utcnow())
+    repo_df['updated_at'] = repo_df['updated_at'].fillna(now)
 
     # Calculate the stale flag using pd.Timedelta
-    repo_df['stale'] = (pd.Timestamp.utcnow() - repo_df['updated_at']) > pd.Timedelta(days=180)
+    repo_df['stale'] = (now - repo_df['updated_at']) > pd.Timedelta(days=180)
 
     return repo_df
 
@@ -55,23 +57,13 @@ def normalize_metrics(repo_df):
     return repo_df
 
 def calculate_contributor_activity(issues_df, pr_df):
-    """Calculate the number of contributors per repository from issues and PRs."""
-    # Count unique contributors in issues
-    issues_contributors = issues_df.groupby('repository')['title'].nunique().reset_index()
-    issues_contributors.columns = ['repository', 'issue_contributors']
-
-    # Count unique contributors in PRs
-    pr_contributors = pr_df.groupby('repository')['title'].nunique().reset_index()
-    pr_contributors.columns = ['repository', 'pr_contributors']
-
-    # Merge both datasets and calculate total contributors
-    contributors_df = pd.merge(issues_contributors, pr_contributors, on='repository', how='outer').fillna(0)
-    contributors_df['total_contributors'] = contributors_df['issue_contributors'] + contributors_df['pr_contributors']
+    """Estimate the number of distinct contributors per repository from issue and PR authors."""
+    if analytics_store.enabled() and 'author' in issues_df.columns and 'author' in pr_df.columns:
+        return analytics_store.contributor_counts(issues_df, pr_df)
+    return contributor_counts(issues_df, pr_df, fallback_column='title')
 
-    return contributors_df
-
-def transform_all_data(repo_df, issues_df, pr_df):
-    """Apply all transformations to the data."""
+def transform_activity(repo_df, issues_df, pr_df):
+    """Compute issue/PR durations and replace repository IDs with repository names."""
     # Create a mapping of repository IDs to names
     repo_id_to_name = dict(zip(repo_df['id'], repo_df['name']))
 
@@ -85,9 +77,31 @@ def transform_all_data(repo_df, issues_df, pr_df):
         # Map repository IDs to names in pr_df
         pr_df['repository'] = pr_df['repository'].map(repo_id_to_name)
 
-    # Merge calculated contributor metrics into the repository data
-    contributors_df = calculate_contributor_activity(issues_df, pr_df)
-    repo_df = pd.merge(repo_df, contributors_df, left_on='name', right_on='repository', how='left').fillna(0)
+    return issues_df, pr_df
+
+def add_repository_quantiles(repo_df, sketch_df):
+    """Merge p50/p90/p99 resolution and merge times per repository, served from the quantile sketches.
+
+    Repositories without completed issues or PRs get -1, like the mean durations.
+    """
+    for collection, prefix in (('issues', 'issue_resolution_days'), ('pull_requests', 'pr_merge_time_days')):
+        percentiles = repository_quantiles(sketch_df, QUANTILE_METRICS[collection], prefix=prefix)
+        columns = percentiles.columns.drop('repository')
+        repo_df = repo_df.drop(columns=columns, errors='ignore')
+        repo_df = repo_df.merge(percentiles.rename(columns={'repository': 'name'}), on='name', how='left')
+        repo_df[columns] = repo_df[columns].fillna(-1)
+    return repo_df
+
+def transform_repositories(repo_df, contributors_df, sketch_df=None):
+    """Merge contributor counts into the repository data and derive repository metrics.
+
+    With `sketch_df` (as built by `build_quantile_sketches`), per-repository
+    duration percentiles are added from it.
+    """
+    repo_df = pd.merge(repo_df, contributors_df, left_on='name', right_on='repository', how='left')
+    # Repositories without issues or PRs have no contributor row; keep their key a name, not a filled-in 0
+    repo_df['repository'] = repo_df['name']
+    repo_df = repo_df.fillna(0)
 
     # Infer objects to avoid future warnings
     repo_df = repo_df.infer_objects(copy=False)
@@ -97,4 +111,17 @@ def transform_all_data(repo_df, issues_df, pr_df):
     repo_df = flag_stale_repositories(repo_df)
     repo_df = normalize_metrics(repo_df)
 
-    return repo_df, issues_df, pr_df
\ No newline at end of file
+    if sketch_df is not None:
+        repo_df = add_repository_quantiles(repo_df, sketch_df)
+
+    return repo_df
+
+def transform_all_data(repo_df, issues_df, pr_df):
+    """Apply all transformations to the data."""
+    issues_df, pr_df = transform_activity(repo_df, issues_df, pr_df)
+
+    # Merge calculated contributor metrics into the repository data
+    contributors_df = calculate_contributor_activity(issues_df, pr_df)
+    repo_df = transform_repositories(repo_df, contributors_df)
+
+    return repo_df, issues_df, pr_df
@@ -0,0 +1,134 @@
+# downloads.py
+
+import os
+import gzip
+import shutil
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Hashable, Optional, Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Download formats: name -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+}
+# Rows converted and written at a time; the whole frame is never encoded in one piece
+EXPORT_CHUNK_ROWS = 64 * 1024
+# Finished files kept on disk for repeated downloads of the same view
+EXPORT_FILES_TO_KEEP = 16
+EXPORT_WORKERS = 2
+# zlib level for CSV downloads; 6 is gzip's default, noticeably faster than 9 for a similar size
+EXPORT_GZIP_LEVEL = 6
+
+_INFERRED_TYPES = {
+    'string': pa.string(), 'unicode': pa.string(), 'bytes': pa.binary(), 'boolean': pa.bool_(),
+    'integer': pa.int64(), 'floating': pa.float64(), 'mixed-integer-float': pa.float64(),
+}
+
+def _export_schema(df: pd.DataFrame) -> pa.Schema:
+    """
+    Arrow schema for writing `df` chunk by chunk.
+
+    Types are taken from the first chunk; columns that are all-null there are
+    typed from the whole column, and dictionary (categorical) columns are
+    written as plain values so every format and reader accepts them.
+    """
+    schema = pa.Schema.from_pandas(df.head(EXPORT_CHUNK_ROWS), preserve_index=False)
+    fields = []
+    for field in schema:
+        if pa.types.is_null(field.type):
+            field = field.with_type(_INFERRED_TYPES.get(pd.api.types.infer_dtype(df[field.name], skipna=True), pa.string()))
+        elif pa.types.is_dictionary(field.type):
+            field = field.with_type(field.type.value_type)
+        fields.append(field)
+    return pa.schema(fields)
+
+def _batches(df: pd.DataFrame, schema: pa.Schema, chunk_rows: int):
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        categorical = [col for col in chunk.columns if isinstance(chunk[col].dtype, pd.CategoricalDtype)]
+        if categorical:
+            chunk = chunk.astype({col: object for col in categorical})
+        yield pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False)
+
+def write_export(df: pd.DataFrame, path: str, export_format: str, chunk_rows: int = EXPORT_CHUNK_ROWS) -> str:
+    """
+    Write `df` to `path` in one of EXPORT_FORMATS, `chunk_rows` rows at a time.
+
+    Returns:
+    - `path`
+    """
+    schema = _export_schema(df)
+    if export_format == 'CSV (gzip)':
+        with gzip.open(path, 'wb', compresslevel=EXPORT_GZIP_LEVEL) as sink, pa_csv.CSVWriter(sink, schema) as writer:
+            for batch in _batches(df, schema, chunk_rows):
+                writer.write_batch(batch)
+    elif export_format == 'Parquet':
+        with pq.ParquetWriter(path, schema, compression='zstd') as writer:
+            for batch in _batches(df, schema, chunk_rows):
+                writer.write_batch(batch)
+    elif export_format == 'Arrow':
+        with pa.OSFile(path, 'wb') as sink, pa.ipc.new_file(
+                sink, schema, options=pa.ipc.IpcWriteOptions(compression='zstd')) as writer:
+            for batch in _batches(df, schema, chunk_rows):
+                writer.write_batch(batch)
+    else:
+        raise ValueError(f"Unsupported export format {export_format!r}, expected one of {list(EXPORT_FORMATS)}")
+    return path
+
+def _log_failure(job: Future, file_name: str, export_format: str) -> None:
+    if job.exception() is not None:
+        logging.error(f"Export of {file_name} as {export_format} failed: {job.exception()}")
+
+class ExportJobs:
+    """
+    Background export of filtered frames, one job per (data version, filter fingerprint, dataset, format).
+
+    Jobs run on a small thread pool so the dashboard stays responsive while a
+    large file is written. Finished files are reused for identical requests;
+    the oldest are deleted once more than EXPORT_FILES_TO_KEEP exist.
+    """
+
+    def __init__(self, workers: int = EXPORT_WORKERS, keep: int = EXPORT_FILES_TO_KEEP):
+        self.directory = tempfile.mkdtemp(prefix='oss-pulse-exports-')
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='export')
+        self._jobs: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, key: Tuple[Hashable, ...], file_name: str, df: pd.DataFrame, export_format: str) -> Future:
+        """Start exporting `df` to `file_name` (unless the export for `key` exists already) and return its future."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not (job.done() and job.exception() is not None):
+                self._jobs.move_to_end(key)
+                return job
+
+            extension, _ = EXPORT_FORMATS[export_format]
+            job_dir = tempfile.mkdtemp(dir=self.directory)
+            path = os.path.join(job_dir, f"{file_name}.{extension}")
+            job = self._executor.submit(write_export, df, path, export_format)
+            job.add_done_callback(lambda done: _log_failure(done, file_name, export_format))
+            self._jobs[key] = job
+            self._evict()
+            return job
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Future]:
+        """The export job for `key`, if one was submitted."""
+        with self._lock:
+            return self._jobs.get(key)
+
+    def _evict(self) -> None:
+        finished = [key for key, job in self._jobs.items() if job.done()]
+        for key in finished[:max(0, len(self._jobs) - self.keep)]:
+            job = self._jobs.pop(key)
+            if job.exception() is None:
+                shutil.rmtree(os.path.dirname(job.result()), ignore_errors=True)
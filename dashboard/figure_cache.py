@@ -0,0 +1,104 @@
+# figure_cache.py
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Hashable, Tuple
+import numpy as np
+import pandas as pd
+
+# Total serialized size of the figures kept in memory, in bytes
+FIGURE_CACHE_BYTES = int(os.getenv("FIGURE_CACHE_BYTES", str(64 * 1024 * 1024)))
+
+def _normalize(value: Any) -> Any:
+    """Turn filter values into a canonical JSON-serializable form (sorted dicts, lists for tuples)."""
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple, set, frozenset, pd.Index, np.ndarray)):
+        items = [_normalize(item) for item in value]
+        return sorted(items, key=repr) if isinstance(value, (set, frozenset)) else items
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def filter_fingerprint(*filters: Any) -> str:
+    """Stable digest of the filter selections that produced a view."""
+    payload = json.dumps(_normalize(filters), sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+class FigureCache:
+    """
+    LRU cache of Plotly figures keyed by (dataset version, filter fingerprint, chart id).
+
+    Keys identify the data a figure was built from, so the (possibly large)
+    filtered frames are never hashed. Entries are weighed by their serialized
+    size and evicted least recently used first once `max_bytes` is exceeded.
+    Cached figures are shared between sessions and must not be modified.
+    """
+
+    def __init__(self, max_bytes: int = FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key: Tuple[Hashable, ...], build: Callable[[], Any]):
+        """Return the cached figure for `key`, building (and caching) it on a miss."""
+        return self.get_or_build_entry(key, build)[0]
+
+    def get_or_build_entry(self, key: Tuple[Hashable, ...], build: Callable[[], Any]) -> Tuple[Any, bool, int]:
+        """
+        Like `get_or_build`, for callers that also report on the lookup.
+
+        Returns:
+        - (figure, whether it was a cache hit, serialized size in bytes)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0], True, entry[1]
+            self._misses += 1
+
+        figure = build()
+        size = len(figure.to_json())
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (figure, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+        if size > self.max_bytes:
+            logging.warning(f"Figure {key[-1]} ({size} bytes) exceeds the figure cache budget of {self.max_bytes} bytes")
+        return figure, False, size
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters, hit rate and memory use of the cache."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,249 @@
+# filter_engine.py
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+# Filter results kept per index, keyed by the normalised filter tuple
+MEMO_ENTRIES = 32
+
+def _sort_key(values: pd.Series) -> np.ndarray:
+    """Numeric view of a column that orders like the column: datetimes as int64 nanoseconds."""
+    if isinstance(values.dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(values.dtype):
+        return values.dt.as_unit('ns').array.asi8
+    return values.to_numpy(dtype='float64', na_value=np.nan)
+
+def _bound_key(value, column_dtype) -> float:
+    if isinstance(column_dtype, pd.DatetimeTZDtype) or pd.api.types.is_datetime64_dtype(column_dtype):
+        timestamp = pd.Timestamp(value)
+        if isinstance(column_dtype, pd.DatetimeTZDtype) and timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize(column_dtype.tz)
+        return timestamp.as_unit('ns').value
+    return float(value)
+
+class FilterIndex:
+    """
+    Precomputed indexes over one DataFrame for the dashboard filters.
+
+    - Range columns keep their row positions sorted by value, so a range
+      filter is two binary searches instead of a comparison per row.
+    - Category columns keep one bitmap (boolean array) per distinct value.
+    - The group column (e.g. `repository`) is laid out contiguously and keeps
+      (start, stop) row offsets per value, plus per-group min/max of every
+      range column for cascading slider bounds.
+
+    Masks are memoised per filter tuple. The indexed frame is shared between
+    reruns and sessions and must not be modified; `filter` returns copies or
+    copy-on-write views.
+    """
+
+    def __init__(self, df: pd.DataFrame, range_columns: Sequence[str] = (),
+                 category_columns: Sequence[str] = (), group_column: Optional[str] = None):
+        self.group_column = group_column
+        self._group_offsets: Dict[Hashable, Tuple[int, int]] = {}
+        if group_column is not None and group_column in df.columns:
+            codes, uniques = pd.factorize(df[group_column])
+            if np.count_nonzero(np.diff(codes)) + 1 > len(uniques):
+                # Rows of a group are scattered: lay them out contiguously, keeping their relative order
+                df = df.take(np.argsort(codes, kind='stable'))
+                codes, uniques = pd.factorize(df[group_column])
+            starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], dtype=int)
+            stops = np.r_[starts[1:], len(codes)]
+            self._group_offsets = {uniques[codes[start]]: (int(start), int(stop))
+                                   for start, stop in zip(starts, stops) if codes[start] >= 0}
+        self.frame = df
+        self._length = len(df)
+
+        self._ranges: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._group_bounds: Dict[str, pd.DataFrame] = {}
+        for column in range_columns:
+            if column not in df.columns:
+                continue
+            keys = _sort_key(df[column])
+            valid = np.flatnonzero(~pd.isna(df[column]).to_numpy())
+            order = valid[np.argsort(keys[valid], kind='stable')]
+            self._ranges[column] = (order, keys[order])
+            if self._group_offsets:
+                self._group_bounds[column] = df.groupby(group_column, sort=False, observed=True)[column].agg(['min', 'max'])
+
+        self._bitmaps: Dict[str, Dict[Hashable, np.ndarray]] = {}
+        self._categories: Dict[str, list] = {}
+        for column in category_columns:
+            if column not in df.columns:
+                continue
+            codes, uniques = pd.factorize(df[column])
+            self._categories[column] = list(uniques)
+            self._bitmaps[column] = {value: codes == code for code, value in enumerate(uniques)}
+
+        self._memo: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def categories(self, column: str) -> list:
+        """Distinct non-null values of a category column, in order of first appearance."""
+        return list(self._categories.get(column, []))
+
+    def groups(self) -> list:
+        return list(self._group_offsets)
+
+    def count(self, groups: Optional[Iterable[Hashable]] = None) -> int:
+        """Number of rows, or of rows in `groups`, straight from the group offsets."""
+        if groups is None:
+            return self._length
+        return sum(stop - start for start, stop in (self._group_offsets.get(group, (0, 0)) for group in groups))
+
+    def bounds(self, column: str, groups: Optional[Iterable[Hashable]] = None):
+        """
+        Min and max of a range column, over all rows or only the rows in `groups`.
+
+        Returns:
+        - (min, max) in the column's own type, or None if there are no values
+        """
+        frame_dtype = self.frame[column].dtype
+        if groups is None:
+            order, _ = self._ranges[column]
+            if not len(order):
+                return None
+            values = self.frame[column]
+            return values.iat[order[0]], values.iat[order[-1]]
+
+        per_group = self._group_bounds[column].reindex(list(groups)).dropna(how='all')
+        if per_group.empty:
+            return None
+        lower, upper = per_group['min'].min(), per_group['max'].max()
+        if pd.api.types.is_integer_dtype(frame_dtype):
+            lower, upper = int(lower), int(upper)
+        return lower, upper
+
+    def _range_mask(self, column: str, lower, upper) -> np.ndarray:
+        order, keys = self._ranges[column]
+        dtype = self.frame[column].dtype
+        start = 0 if lower is None else np.searchsorted(keys, _bound_key(lower, dtype), side='left')
+        stop = len(keys) if upper is None else np.searchsorted(keys, _bound_key(upper, dtype), side='right')
+        mask = np.zeros(self._length, dtype=bool)
+        mask[order[start:stop]] = True
+        return mask
+
+    def _category_mask(self, column: str, values: Iterable[Hashable]) -> np.ndarray:
+        mask = np.zeros(self._length, dtype=bool)
+        for value in values:
+            bitmap = self._bitmaps[column].get(value)
+            if bitmap is not None:
+                mask |= bitmap
+        return mask
+
+    def _group_mask(self, groups: Iterable[Hashable]) -> np.ndarray:
+        mask = np.zeros(self._length, dtype=bool)
+        for offsets in map(self._group_offsets.get, groups):
+            if offsets is not None:
+                mask[offsets[0]:offsets[1]] = True
+        return mask
+
+    def mask(self, ranges: Optional[Dict[str, Tuple]] = None, categories: Optional[Dict[str, Iterable]] = None,
+             groups: Optional[Iterable[Hashable]] = None) -> np.ndarray:
+        """
+        Boolean row mask for inclusive `ranges` ({column: (min, max)}, either end
+        may be None), `categories` ({column: allowed values}) and `groups`.
+
+        Rows with a null value in a filtered range column never match.
+        """
+        ranges = {column: tuple(bounds) for column, bounds in (ranges or {}).items()}
+        categories = {column: tuple(values) for column, values in (categories or {}).items()}
+        groups = tuple(groups) if groups is not None else None
+        key = (tuple(sorted(ranges.items())), tuple(sorted(categories.items())), groups)
+
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+
+        mask = self._group_mask(groups) if groups is not None else np.ones(self._length, dtype=bool)
+        for column, values in categories.items():
+            mask &= self._category_mask(column, values)
+        for column, (lower, upper) in ranges.items():
+            mask &= self._range_mask(column, lower, upper)
+        mask.flags.writeable = False
+
+        with self._lock:
+            self._memo[key] = mask
+            while len(self._memo) > MEMO_ENTRIES:
+                self._memo.popitem(last=False)
+        return mask
+
+    def select(self, mask: np.ndarray) -> pd.DataFrame:
+        """
+        Rows of the indexed frame where `mask` is set.
+
+        With pandas copy-on-write enabled, a mask selecting one contiguous run
+        of rows (all rows, or the rows of adjacent groups) gives a zero-copy
+        view of the shared frame, copied only if the caller modifies it. Other
+        masks copy the matching rows.
+        """
+        count = np.count_nonzero(mask)
+        if count and pd.get_option('mode.copy_on_write'):
+            first, last = int(mask.argmax()), self._length - 1 - int(mask[::-1].argmax())
+            if last - first + 1 == count:
+                return self.frame.iloc[first:last + 1]
+        return self.frame[mask]
+
+    def filter(self, ranges: Optional[Dict[str, Tuple]] = None, categories: Optional[Dict[str, Iterable]] = None,
+               groups: Optional[Iterable[Hashable]] = None) -> pd.DataFrame:
+        """Rows of the indexed frame matching the filters (see `mask` and `select`)."""
+        return self.select(self.mask(ranges, categories, groups))
+
+class DeferredIndex:
+    """
+    Stand-in for a group-indexed FilterIndex whose rows are read only when needed.
+
+    The row count and range-column bounds over all groups are known up front
+    (from the pre-rendered default view), so the filter widgets can be drawn
+    for a selection covering every group without reading any rows. Anything
+    else loads the index through `load`, at most once.
+    """
+
+    def __init__(self, load: Callable[[], FilterIndex], groups: Iterable[Hashable], rows: int,
+                 bounds: Dict[str, Optional[Sequence]]):
+        self._load = load
+        self._groups = frozenset(groups)
+        self._rows = rows
+        self._bounds = {column: tuple(values) if values is not None else None for column, values in bounds.items()}
+        self._index: Optional[FilterIndex] = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> FilterIndex:
+        with self._lock:
+            if self._index is None:
+                self._index = self._load()
+            return self._index
+
+    def _covers_all(self, groups: Optional[Iterable[Hashable]]) -> bool:
+        return groups is None or self._groups.issubset(groups)
+
+    def count(self, groups: Optional[Iterable[Hashable]] = None) -> int:
+        return self._rows if self._covers_all(groups) else self.index.count(groups)
+
+    def bounds(self, column: str, groups: Optional[Iterable[Hashable]] = None):
+        if self._covers_all(groups) and column in self._bounds:
+            return self._bounds[column]
+        return self.index.bounds(column, groups)
+
+    def filter(self, ranges: Optional[Dict[str, Tuple]] = None, categories: Optional[Dict[str, Iterable]] = None,
+               groups: Optional[Iterable[Hashable]] = None) -> pd.DataFrame:
+        return self.index.filter(ranges, categories, groups)
+
+# Columns indexed for the sidebar and advanced filters
+REPOSITORY_RANGE_COLUMNS = ['created_at', 'stars', 'forks', 'open_issues', 'total_contributors']
+REPOSITORY_CATEGORY_COLUMNS = ['size_category', 'stale']
+ACTIVITY_RANGE_COLUMNS = {'issues': ['resolution_time_days'], 'pull_requests': ['merge_time_days']}
+
+def build_repository_index(repo_df: pd.DataFrame) -> FilterIndex:
+    return FilterIndex(repo_df, REPOSITORY_RANGE_COLUMNS, REPOSITORY_CATEGORY_COLUMNS)
+
+def build_activity_index(collection: str, activity_df: pd.DataFrame) -> FilterIndex:
+    """Index issues or pull requests by repository, with row offsets per repository."""
+    return FilterIndex(activity_df, ACTIVITY_RANGE_COLUMNS[collection], group_column='repository')
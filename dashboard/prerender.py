@@ -0,0 +1,128 @@
+# prerender.py
+
+import os
+import json
+import shutil
+import logging
+from typing import Optional
+import pandas as pd
+import plotly.io as pio
+from dashboard.components.metrics_display import key_metrics
+from dashboard.data_loader import load_activity, load_repositories, load_rollups, load_sketches
+from dashboard.data_processing.rollups import filter_rollups
+from dashboard.filter_engine import ACTIVITY_RANGE_COLUMNS, build_activity_index, build_repository_index
+from dashboard.visualizations import (
+    plot_repository_growth,
+    plot_issue_resolution_time,
+    plot_pull_request_merge_time,
+    plot_contributor_activity,
+    plot_repository_size_distribution,
+    plot_correlation_heatmap,
+    plot_issue_pr_funnel,
+    plot_repository_treemap,
+    plot_issues_vs_prs,
+    plot_top_repositories
+)
+
+# Pre-rendered default view, written into each release next to its manifest
+DEFAULT_VIEW_DIR = 'default_view'
+SUMMARY_FILE = 'summary.json'
+
+# Charts of the dashboard views: chart id -> (plot function, names of the view data it is drawn from)
+VIEW_CHARTS = {
+    'repository_growth': (plot_repository_growth, ('repo_data',)),
+    'contributor_activity': (plot_contributor_activity, ('repo_data',)),
+    'repository_size_distribution': (plot_repository_size_distribution, ('repo_data',)),
+    'top_repositories': (plot_top_repositories, ('repo_data',)),
+    'issue_resolution_time': (plot_issue_resolution_time, ('issues_data', 'quantile_sketches')),
+    'pull_request_merge_time': (plot_pull_request_merge_time, ('pr_data', 'quantile_sketches')),
+    'issue_pr_funnel': (plot_issue_pr_funnel, ('issues_data', 'pr_data', 'rollups')),
+    'issues_vs_prs': (plot_issues_vs_prs, ('repo_data', 'issues_data', 'pr_data', 'rollups')),
+    'correlation_heatmap': (plot_correlation_heatmap, ('repo_data',)),
+    'repository_treemap': (plot_repository_treemap, ('repo_data',)),
+}
+
+def _activity_summary(index, collection: str) -> dict:
+    """Row count and range-column bounds of an activity index over all repositories."""
+    bounds = {}
+    for column in ACTIVITY_RANGE_COLUMNS[collection]:
+        column_bounds = index.bounds(column, index.groups())
+        bounds[column] = [float(value) for value in column_bounds] if column_bounds is not None else None
+    return {'rows': len(index), 'bounds': bounds}
+
+def render_default_view(release_dir: str) -> Optional[str]:
+    """
+    Render the unfiltered dashboard views of a release: every chart of VIEW_CHARTS
+    as Plotly JSON, plus the key metrics and the issue/PR row counts and slider
+    bounds the filters need, into `release_dir`/DEFAULT_VIEW_DIR.
+
+    The data is read back from the release and prepared as the dashboard does
+    (filter indexes, rollups, sketches), so the figures match what it would compute live.
+
+    Returns:
+    - Path of the written directory, or None if the release has no repository or activity data
+    """
+    repo_data = load_repositories(release_dir)
+    issues_data = load_activity('issues', base_path=release_dir)
+    pr_data = load_activity('pull_requests', base_path=release_dir)
+    if repo_data is None or issues_data is None or pr_data is None or repo_data.empty:
+        logging.warning("Release has no repository or activity data, not pre-rendering the default view")
+        return None
+
+    repo_data = build_repository_index(repo_data).frame
+    issues_index = build_activity_index('issues', issues_data)
+    pr_index = build_activity_index('pull_requests', pr_data)
+    rollup_data = load_rollups(base_path=release_dir)
+    quantile_sketches, contributor_sketches = load_sketches(release_dir)
+    view_data = {
+        'repo_data': repo_data,
+        'issues_data': issues_index.frame,
+        'pr_data': pr_index.frame,
+        'rollups': filter_rollups(rollup_data, repo_data['name']) if rollup_data is not None else None,
+        'quantile_sketches': quantile_sketches,
+    }
+
+    # Written next to the final location and renamed, so the directory is either complete or absent
+    output_dir = os.path.join(release_dir, DEFAULT_VIEW_DIR)
+    staging_dir = f"{output_dir}.tmp"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+    for chart_id, (plot, arguments) in VIEW_CHARTS.items():
+        figure = plot(*(view_data[name] for name in arguments))
+        with open(os.path.join(staging_dir, f"{chart_id}.json"), 'w') as f:
+            f.write(figure.to_json())
+
+    summary = {
+        'created_at': pd.Timestamp.now(tz='UTC').isoformat(),
+        'repositories': len(repo_data),
+        'metrics': key_metrics(repo_data, pr_index.frame, contributor_sketches),
+        'activity': {
+            'issues': _activity_summary(issues_index, 'issues'),
+            'pull_requests': _activity_summary(pr_index, 'pull_requests'),
+        },
+        'charts': list(VIEW_CHARTS),
+    }
+    with open(os.path.join(staging_dir, SUMMARY_FILE), 'w') as f:
+        json.dump(summary, f, indent=1)
+    os.rename(staging_dir, output_dir)
+    logging.info(f"Pre-rendered {len(VIEW_CHARTS)} default view charts to {output_dir}")
+    return output_dir
+
+def load_default_view(base_path: str) -> Optional[dict]:
+    """
+    Load the summary of a release's pre-rendered default view.
+
+    Returns:
+    - dict with `metrics`, per-collection `activity` row counts and bounds and the
+      pre-rendered `charts`, or None if the release has none
+    """
+    try:
+        with open(os.path.join(base_path, DEFAULT_VIEW_DIR, SUMMARY_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def load_default_figure(base_path: str, chart_id: str):
+    """Load one pre-rendered chart of a release as a Plotly figure."""
+    with open(os.path.join(base_path, DEFAULT_VIEW_DIR, f"{chart_id}.json")) as f:
+        return pio.from_json(f.read())
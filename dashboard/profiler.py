@@ -0,0 +1,127 @@
+# profiler.py
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+# Profile every rerun of every session (otherwise only sessions opened with `?profile` in the URL)
+RENDER_PROFILER = os.getenv("RENDER_PROFILER", "").lower() in ("1", "true", "yes")
+# JSON lines file the profiled reruns are appended to; without it they are written to stderr
+RENDER_PROFILE_LOG = os.getenv("RENDER_PROFILE_LOG")
+# Samples kept per component for the rolling percentiles
+RENDER_PROFILE_WINDOW = int(os.getenv("RENDER_PROFILE_WINDOW", "1000"))
+PERCENTILES = (50, 90, 99)
+
+def _sink() -> logging.Logger:
+    logger = logging.getLogger("oss_pulse.render_profile")
+    if not logger.handlers:
+        handler = logging.FileHandler(RENDER_PROFILE_LOG) if RENDER_PROFILE_LOG else logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+class RenderProfiler:
+    """
+    Per-component timings of dashboard reruns.
+
+    Each profiled rerun collects one record per measured component: wall time,
+    rows processed, cache hit or miss (None for uncached work) and payload
+    bytes (serialized figure size). Records go to the log sink, one JSON line
+    per rerun, and into a rolling window per component from which p50/p90/p99
+    are computed. Reruns are tracked per thread, i.e. per Streamlit session;
+    outside a profiled rerun `measure` does nothing but hand out a record.
+    """
+
+    def __init__(self, window: int = RENDER_PROFILE_WINDOW):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sink = _sink()
+
+    def _active(self) -> Optional[list]:
+        return getattr(self._local, 'records', None)
+
+    @contextmanager
+    def rerun(self, enabled: bool, **context):
+        """Profile the rerun's components if `enabled`; yields the list the records are collected in."""
+        if not enabled:
+            yield []
+            return
+        records: List[dict] = []
+        self._local.records, self._local.stack = records, []
+        try:
+            with self.measure('rerun'):
+                yield records
+        finally:
+            self._local.records = None
+            self._sink.info(json.dumps({'time': pd.Timestamp.now(tz='UTC').isoformat(), **context,
+                                        'components': records}, default=str))
+
+    @contextmanager
+    def measure(self, component: str, cached: bool = False):
+        """
+        Time the enclosed block as `component`. The yielded record's `rows`,
+        `cache` and `bytes` may be filled in by the block; for `cached` blocks
+        the cache defaults to a hit unless `note_miss` is called inside.
+        """
+        record = {'component': component, 'ms': 0.0, 'rows': 0, 'cache': None, 'bytes': None}
+        records = self._active()
+        if records is None:
+            yield record
+            return
+        stack = self._local.stack
+        stack.append((record, cached))
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['ms'] = round((time.perf_counter() - start) * 1000, 3)
+            stack.pop()
+            if cached and record['cache'] is None:
+                record['cache'] = 'hit'
+            records.append(record)
+            with self._lock:
+                samples = self._samples.setdefault(component, deque(maxlen=self.window))
+                samples.append((record['ms'], record['rows'], record['cache'], record['bytes']))
+
+    def note_miss(self) -> None:
+        """Mark the innermost cached block being measured as a cache miss (call where the cached value is built)."""
+        if self._active() is None:
+            return
+        for record, cached in reversed(self._local.stack):
+            if cached:
+                record['cache'] = 'miss'
+                return
+
+    def percentiles(self) -> pd.DataFrame:
+        """Rolling wall-time percentiles, mean rows, hit rate and median payload per component."""
+        with self._lock:
+            samples = {component: list(values) for component, values in self._samples.items()}
+        rows = []
+        for component, values in sorted(samples.items()):
+            wall = np.array([value[0] for value in values])
+            lookups = [value[2] for value in values if value[2] is not None]
+            payloads = [value[3] for value in values if value[3] is not None]
+            rows.append({
+                'component': component,
+                'samples': len(values),
+                **{f"p{p} ms": float(np.percentile(wall, p)) for p in PERCENTILES},
+                'mean rows': float(np.mean([value[1] for value in values])),
+                'hit rate': lookups.count('hit') / len(lookups) if lookups else None,
+                'median bytes': float(np.median(payloads)) if payloads else None,
+            })
+        return pd.DataFrame(rows)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
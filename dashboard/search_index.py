@@ -0,0 +1,263 @@
+# search_index.py
+
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+
+# Searchable text columns and the weight of a full match in each
+SEARCH_FIELDS = {'name': 1.0, 'full_name': 0.9, 'description': 0.5}
+# Fields also indexed by 1- and 2-grams: one- and two-letter queries are answered from the index, and
+# longer queries are compared by bigrams, which survive typos in short names better
+SHORT_QUERY_FIELDS = ('name', 'full_name')
+# Share of the query's n-grams a field must contain to count as a fuzzy match
+SEARCH_FUZZY_THRESHOLD = 0.4
+# A transposition breaks up to three bigrams of a short query ('raect' keeps one of 'react''s four), so
+# queries of this many characters also match names starting within one edit (two from 8 characters),
+# counting a transposition as one edit
+SEARCH_EDIT_QUERY_CHARS = (4, 12)
+# Query results kept per index
+SEARCH_MEMO_ENTRIES = 64
+
+def normalize(text) -> str:
+    """Case-folded, whitespace-collapsed form of a search text or query."""
+    return ' '.join(str(text).casefold().split()) if isinstance(text, str) else ''
+
+def _grams(text: str, n: int) -> set:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def _max_edits(query: str) -> int:
+    """Edits a name prefix may be away from `query` to count as a fuzzy match."""
+    shortest, longest = SEARCH_EDIT_QUERY_CHARS
+    if not shortest <= len(query) <= longest:
+        return 0
+    return 1 if len(query) < 8 else 2
+
+def _prefix_edit_distances(query: str, codes: np.ndarray, lengths: np.ndarray, max_edits: int) -> np.ndarray:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions)
+    from `query` to the closest prefix of every text, for all texts at once.
+
+    `codes` holds the first characters of each text as code points, one row per
+    text. Only the band of `max_edits` around the diagonal is computed, so
+    distances above `max_edits` are reported as `max_edits + 1`.
+    """
+    query_codes = [ord(char) for char in query]
+    width = min(codes.shape[1], len(query) + max_edits)
+    columns = np.arange(width + 1, dtype=np.int16)
+    beyond = np.int16(max_edits + 1)
+    previous, current = None, np.broadcast_to(np.minimum(columns, beyond), (len(codes), width + 1)).copy()
+    for i, char in enumerate(query_codes, start=1):
+        before, previous = previous, current
+        current = np.full_like(previous, beyond)
+        if i <= max_edits:
+            current[:, 0] = i
+        for j in range(max(1, i - max_edits), min(width, i + max_edits) + 1):
+            substitution = previous[:, j - 1] + (codes[:, j - 1] != char)
+            cell = np.minimum(np.minimum(previous[:, j], current[:, j - 1]) + 1, substitution)
+            if i > 1 and j > 1:
+                swapped = (codes[:, j - 2] == char) & (codes[:, j - 1] == query_codes[i - 2])
+                cell = np.where(swapped, np.minimum(cell, before[:, j - 2] + 1), cell)
+            current[:, j] = np.minimum(cell, beyond)
+    # Prefixes run up to the text's own length
+    current[:, columns > 0] = np.where(columns[None, 1:] > lengths[:, None], beyond, current[:, 1:])
+    return current[:, max(0, len(query) - max_edits):].min(axis=1)
+
+def _postings(texts: Sequence[str], n: int) -> Dict[str, np.ndarray]:
+    """Map every n-gram to the sorted positions of the texts containing it."""
+    postings: Dict[str, list] = {}
+    for position, text in enumerate(texts):
+        for gram in _grams(text, n):
+            postings.setdefault(gram, []).append(position)
+    return {gram: np.asarray(positions, dtype=np.int32) for gram, positions in postings.items()}
+
+class SearchIndex:
+    """
+    N-gram and prefix index over the repository name, full name and description.
+
+    - Names and full names keep 1- and 2-gram postings (sorted row positions
+      per n-gram), descriptions keep trigram postings.
+    - Substring matches are the rows holding every n-gram of the query,
+      verified against those candidate texts only.
+    - Fuzzy matches are rows containing at least SEARCH_FUZZY_THRESHOLD of the
+      query's n-grams in some field, which tolerates typos, and rows whose
+      name or full name starts within one or two edits of the query, which
+      catches transpositions in short queries.
+    - A sorted list of names and full names answers prefix lookups for
+      typeahead with two binary searches.
+
+    Positions refer to the rows of the indexed frame, in order. Build one per
+    dataset version; the index is read-only and shared between sessions.
+    """
+
+    def __init__(self, df: pd.DataFrame, fields: Dict[str, float] = SEARCH_FIELDS, popularity: Optional[str] = 'stars'):
+        self.fields = {field: weight for field, weight in fields.items() if field in df.columns}
+        self._length = len(df)
+        self._texts = {field: [normalize(text) for text in df[field]] for field in self.fields}
+        self._short = {field: {n: _postings(self._texts[field], n) for n in (1, 2)}
+                       for field in SHORT_QUERY_FIELDS if field in self._texts}
+        self._trigrams = {field: _postings(texts, 3) for field, texts in self._texts.items() if field not in self._short}
+        self._gram_counts = {field: np.asarray([len(_grams(text, 2)) for text in self._texts[field]])
+                             for field in self._short}
+        # Leading characters of names and full names as code points, for edit distances to their prefixes
+        width = SEARCH_EDIT_QUERY_CHARS[1] + 2
+        self._prefix_codes = {field: (np.asarray(self._texts[field], dtype=f'<U{width}').view(np.uint32)
+                                      .reshape(self._length, width),
+                                      np.asarray([len(text) for text in self._texts[field]]))
+                              for field in self._short}
+        self._labels = df['full_name'].astype(str).tolist() if 'full_name' in df.columns else [str(i) for i in range(len(df))]
+        self._popularity = (df[popularity].to_numpy(dtype='float64', na_value=0) if popularity in df.columns
+                            else np.zeros(len(df)))
+
+        prefixes = sorted((text, position) for field in SHORT_QUERY_FIELDS if field in self._texts
+                          for position, text in enumerate(self._texts[field]) if text)
+        self._prefix_keys = [text for text, _ in prefixes]
+        self._prefix_positions = np.asarray([position for _, position in prefixes], dtype=np.int32)
+
+        self._memo: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Slice of the sorted name keys starting with `prefix`."""
+        start = bisect_left(self._prefix_keys, prefix)
+        return start, bisect_left(self._prefix_keys, prefix + '\U0010ffff', lo=start)
+
+    def _field_matches(self, query: str) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Rows sharing n-grams with the query, per field.
+
+        Returns:
+        - {field: (row positions, share of the query's n-grams each row contains, similarity)}
+          where the similarity is the Dice coefficient of the n-gram sets for
+          names, so long names sharing a few n-grams rank below close spellings,
+          and the share itself for descriptions
+        """
+        if len(query) < 3:
+            matches = {}
+            for field, postings in self._short.items():
+                positions = postings[len(query)].get(query, np.array([], dtype=np.int32))
+                matches[field] = (positions, np.ones(len(positions)), np.ones(len(positions)))
+            return matches
+
+        matches = {}
+        for field in self.fields:
+            n = 2 if field in self._short else 3
+            postings = self._short[field][2] if n == 2 else self._trigrams[field]
+            grams = _grams(query, n)
+            hits = [postings[gram] for gram in grams if gram in postings]
+            if not hits:
+                continue
+            counts = np.bincount(np.concatenate(hits), minlength=self._length)
+            positions = np.flatnonzero(counts)
+            counts = counts[positions]
+            shares = counts / len(grams)
+            similarity = 2 * counts / (len(grams) + self._gram_counts[field][positions]) if n == 2 else shares
+            matches[field] = (positions, shares, similarity)
+        return matches
+
+    def _search(self, query: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Matching positions ranked best first, their scores, and whether each is an exact (substring) match."""
+        with self._lock:
+            if query in self._memo:
+                self._memo.move_to_end(query)
+                return self._memo[query]
+
+        scores = np.zeros(self._length)
+        exact = np.zeros(self._length, dtype=bool)
+        for field, (positions, shares, similarity) in self._field_matches(query).items():
+            complete = shares >= 1.0
+            if len(query) > 2 and complete.any():
+                # All n-grams present does not imply a substring: verify those rows
+                texts = self._texts[field]
+                complete[complete] = [query in texts[position] for position in positions[complete].tolist()]
+            exact[positions[complete]] = True
+            # Substrings score fully, the rest by similarity, always below a substring
+            similarity = np.where(complete, 1.0, np.minimum(similarity, 0.99))
+            keep = similarity >= SEARCH_FUZZY_THRESHOLD
+            positions, similarity = positions[keep], similarity[keep]
+            scores[positions] = np.maximum(scores[positions], similarity * self.fields[field])
+
+        # Names starting with a close spelling, which the bigrams miss for transpositions in short queries
+        max_edits = _max_edits(query)
+        for field, (codes, lengths) in self._prefix_codes.items() if max_edits else ():
+            distances = _prefix_edit_distances(query, codes, lengths, max_edits)
+            positions = np.flatnonzero((distances > 0) & (distances <= max_edits))
+            similarity = np.minimum(1 - distances[positions] / len(query), 0.99)
+            scores[positions] = np.maximum(scores[positions], similarity * self.fields[field])
+
+        # Whole-name and prefix matches rank above matches elsewhere in the text
+        start, stop = self._prefix_range(query)
+        whole = bisect_left(self._prefix_keys, query + '\x00', lo=start, hi=stop)
+        scores[np.unique(self._prefix_positions[start:stop])] += 1.0
+        scores[np.unique(self._prefix_positions[start:whole])] += 1.0
+
+        matches = np.flatnonzero(scores > 0)
+        order = np.lexsort((-self._popularity[matches], -scores[matches]))
+        result = (matches[order], scores[matches[order]], exact[matches[order]])
+        for array in result:
+            array.flags.writeable = False
+
+        with self._lock:
+            self._memo[query] = result
+            while len(self._memo) > SEARCH_MEMO_ENTRIES:
+                self._memo.popitem(last=False)
+        return result
+
+    def search(self, query: str, limit: Optional[int] = None, fuzzy: bool = True) -> List[Tuple[int, float]]:
+        """
+        Rows matching `query`, best first: whole-name and prefix matches, then
+        substrings of the name, full name or description, then fuzzy matches;
+        ties go to the more popular repository.
+
+        Returns:
+        - list of (row position, score)
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        positions, scores, exact = self._search(query)
+        if not fuzzy:
+            positions, scores = positions[exact], scores[exact]
+        return list(zip(positions[:limit].tolist(), scores[:limit].tolist()))
+
+    def mask(self, query: str) -> np.ndarray:
+        """
+        Boolean row mask of the rows containing `query` in any field, or, if
+        there are none, of its fuzzy matches.
+
+        Queries shorter than three characters only match names and full names.
+        """
+        query = normalize(query)
+        mask = np.zeros(self._length, dtype=bool)
+        if not query:
+            mask[:] = True
+            return mask
+        positions, _, exact = self._search(query)
+        mask[positions[exact] if exact.any() else positions] = True
+        return mask
+
+    def is_fuzzy(self, query: str) -> bool:
+        """Whether `mask(query)` fell back to fuzzy matches (there are some, but no exact ones)."""
+        query = normalize(query)
+        if not query:
+            return False
+        positions, _, exact = self._search(query)
+        return len(positions) > 0 and not exact.any()
+
+    def suggest(self, prefix: str, limit: int = 5) -> List[str]:
+        """Typeahead completions: full names of repositories whose name or full name starts with `prefix`, most popular first."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        start, stop = self._prefix_range(prefix)
+        positions = np.unique(self._prefix_positions[start:stop])
+        positions = positions[np.argsort(-self._popularity[positions], kind='stable')]
+        return [self._labels[position] for position in positions[:limit]]
+
+def build_repository_search(repo_df: pd.DataFrame) -> SearchIndex:
+    return SearchIndex(repo_df)
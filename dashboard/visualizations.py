@@ -1,12 +1,93 @@
 # visualizations.py
+# Figures are cached by the caller (dashboard/figure_cache.py) on the data version and filter
+# fingerprint, so these functions take the filtered frames without hashing or modifying them
+import os
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
+from dashboard.data_processing.rollups import aggregate_rollups, count_by_state
+from dashboard.data_processing.sketches import QUANTILE_METRICS, repository_box_statistics
+
+# Above this many points, box plots send precomputed statistics and scatters switch to binned WebGL traces
+RAW_POINTS_LIMIT = int(os.getenv("CHART_RAW_POINTS_LIMIT", "5000"))
+# Outliers drawn per box in summarized box plots, sampled reproducibly
+OUTLIERS_PER_BOX = 50
+# Grid resolution per axis of binned scatter plots
+SCATTER_BINS = 100
+
+def _box_statistics(df, group, value, outliers_per_box=OUTLIERS_PER_BOX):
+    """
+    Per-group box statistics as Plotly computes them (linear quartiles, Tukey whiskers).
+
+    Returns the statistics indexed by group, ordered by the group's total value
+    descending, and a sample of at most `outliers_per_box` outliers per group.
+    """
+    grouped = df.groupby(group, observed=True)[value]
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'median', 'q3']
+    stats['mean'] = grouped.mean()
+    stats['total'] = grouped.sum()
+
+    iqr = stats['q3'] - stats['q1']
+    lower_limit = df[group].map(stats['q1'] - 1.5 * iqr)
+    upper_limit = df[group].map(stats['q3'] + 1.5 * iqr)
+    inside = (df[value] >= lower_limit) & (df[value] <= upper_limit)
+    within = df.loc[inside].groupby(group, observed=True)[value]
+    stats['lowerfence'] = within.min()
+    stats['upperfence'] = within.max()
+
+    outliers = df.loc[~inside, [group, value]].sample(frac=1, random_state=0)
+    outliers = outliers.groupby(group, observed=True).head(outliers_per_box)
+    return stats.sort_values('total', ascending=False), outliers
+
+def _summarized_box(df, group, value, title):
+    """Box plot drawn from precomputed statistics plus sampled outliers, so its size does not grow with the rows."""
+    stats, outliers = _box_statistics(df, group, value)
+    return _statistics_box(stats, group, value, title, outliers)
+
+def _statistics_box(stats, group, value, title, outliers=None):
+    """Box plot of per-group statistics as returned by `_box_statistics`, with optional outlier points."""
+    names = stats.index.tolist()
+    fig = go.Figure(go.Box(
+        x=names, q1=stats['q1'], median=stats['median'], q3=stats['q3'], mean=stats['mean'],
+        lowerfence=stats['lowerfence'], upperfence=stats['upperfence'], name=value, boxpoints=False,
+    ))
+    if outliers is not None:
+        fig.add_trace(go.Scattergl(
+            x=outliers[group], y=outliers[value], mode='markers', name='outliers (sampled)',
+            marker=dict(size=4, opacity=0.6),
+        ))
+    fig.update_layout(
+        title=title, xaxis_title=group, yaxis_title=value, showlegend=False,
+        xaxis={'categoryorder': 'array', 'categoryarray': names},
+    )
+    return fig
+
+def _binned_scatter(df, x, y, color, title, labels):
+    """WebGL scatter of `df` aggregated onto a SCATTER_BINS x SCATTER_BINS grid: one marker per occupied bin."""
+    points = df[[x, y, color]].dropna(subset=[x, y])
+    if points.empty:
+        return go.Figure(layout=dict(title=title, xaxis_title=labels[x], yaxis_title=labels[y]))
+    bins = {}
+    for axis in (x, y):
+        edges = np.linspace(points[axis].min(), points[axis].max(), SCATTER_BINS + 1)
+        bins[axis] = np.clip(np.searchsorted(edges, points[axis], side='right') - 1, 0, SCATTER_BINS - 1)
+    binned = points.groupby([bins[x], bins[y]]).agg(
+        **{x: (x, 'mean'), y: (y, 'mean'), color: (color, 'mean'), 'repositories': (x, 'size')}
+    )
+    fig = go.Figure(go.Scattergl(
+        x=binned[x], y=binned[y], mode='markers',
+        marker=dict(size=np.sqrt(binned['repositories']) * 4, color=binned[color], colorscale='plasma',
+                    showscale=True, colorbar=dict(title=f"mean {color}")),
+        customdata=binned[['repositories']],
+        hovertemplate=f"{labels[x]}: %{{x:.0f}}<br>{labels[y]}: %{{y:.0f}}<br>repositories: %{{customdata[0]}}<extra></extra>",
+    ))
+    fig.update_layout(title=title, xaxis_title=labels[x], yaxis_title=labels[y])
+    return fig
 
-@st.cache_data
 def plot_repository_growth(repo_data):
-    repo_data['created_at'] = pd.to_datetime(repo_data['created_at'])
     monthly_data = repo_data.resample('ME', on='created_at').size().reset_index(name='count')
     monthly_data['cumulative_count'] = monthly_data['count'].cumsum()
 
@@ -22,14 +103,27 @@ def plot_repository_growth(repo_data):
 
     return fig
 
-@st.cache_data
-def plot_issue_resolution_time(issues_data):
-    resolved_issues = issues_data[issues_data['resolution_time_days'] >= 0]
-    fig = px.box(resolved_issues, x='repository', y='resolution_time_days',
-                 title='Issue Resolution Time by Repository')
+def _activity_box(df, value, title):
+    """Box plot of `value` per repository from the rows: summarized above RAW_POINTS_LIMIT points."""
+    if len(df) > RAW_POINTS_LIMIT:
+        return _summarized_box(df, 'repository', value, title)
+    fig = px.box(df, x='repository', y=value, title=title)
+    fig.update_layout(xaxis={'categoryorder': 'total descending'})
+    return fig
+
+def plot_issue_resolution_time(issues_data, quantile_sketches=None):
+    """
+    Box plot of issue resolution times per repository. With quantile sketches of
+    the selected repositories, the boxes are drawn from them without the rows.
+    """
+    if quantile_sketches is not None:
+        stats = repository_box_statistics(quantile_sketches, QUANTILE_METRICS['issues'])
+        fig = _statistics_box(stats, 'repository', 'resolution_time_days', 'Issue Resolution Time by Repository')
+    else:
+        fig = _activity_box(issues_data[issues_data['resolution_time_days'] >= 0], 'resolution_time_days',
+                            'Issue Resolution Time by Repository')
 
     fig.update_layout(
-        xaxis={'categoryorder': 'total descending'},
         template='plotly_dark',
         paper_bgcolor='#0d1117',
         plot_bgcolor='#0d1117',
@@ -38,14 +132,19 @@ def plot_issue_resolution_time(issues_data):
 
     return fig
 
-@st.cache_data
-def plot_pull_request_merge_time(pr_data):
-    merged_prs = pr_data[pr_data['merge_time_days'] >= 0]
-    fig = px.box(merged_prs, x='repository', y='merge_time_days',
-                 title='Pull Request Merge Time by Repository')
+def plot_pull_request_merge_time(pr_data, quantile_sketches=None):
+    """
+    Box plot of PR merge times per repository. With quantile sketches of the
+    selected repositories, the boxes are drawn from them without the rows.
+    """
+    if quantile_sketches is not None:
+        stats = repository_box_statistics(quantile_sketches, QUANTILE_METRICS['pull_requests'])
+        fig = _statistics_box(stats, 'repository', 'merge_time_days', 'Pull Request Merge Time by Repository')
+    else:
+        fig = _activity_box(pr_data[pr_data['merge_time_days'] >= 0], 'merge_time_days',
+                            'Pull Request Merge Time by Repository')
 
     fig.update_layout(
-        xaxis={'categoryorder': 'total descending'},
         template='plotly_dark',
         paper_bgcolor='#0d1117',
         plot_bgcolor='#0d1117',
@@ -54,7 +153,6 @@ def plot_pull_request_merge_time(pr_data):
 
     return fig
 
-@st.cache_data
 def plot_contributor_activity(repo_data):
     top_repos = repo_data.nlargest(20, 'total_contributors')
     fig = px.bar(top_repos, x='name', y='total_contributors',
@@ -70,7 +168,6 @@ def plot_contributor_activity(repo_data):
 
     return fig
 
-@st.cache_data
 def plot_repository_size_distribution(repo_data):
     size_distribution = repo_data['size_category'].value_counts().sort_index()
     fig = px.pie(values=size_distribution.values, names=size_distribution.index,
@@ -85,7 +182,6 @@ def plot_repository_size_distribution(repo_data):
 
     return fig
 
-@st.cache_data
 def plot_correlation_heatmap(repo_data):
     metrics = ['stars', 'forks', 'open_issues', 'total_contributors']
     corr_matrix = repo_data[metrics].corr()
@@ -101,12 +197,20 @@ def plot_correlation_heatmap(repo_data):
 
     return fig
 
-@st.cache_data
-def plot_issue_pr_funnel(issues_data, pr_data):
-    open_issues = len(issues_data[issues_data['state'] == 'open'])
-    closed_issues = len(issues_data[issues_data['state'] == 'closed'])
-    open_prs = len(pr_data[pr_data['state'] == 'open'])
-    merged_prs = len(pr_data[pr_data['state'] == 'merged'])
+def plot_issue_pr_funnel(issues_data, pr_data, rollup_data=None):
+    """
+    Plots the issue to PR funnel, from the rollup cube when one is given.
+    """
+    if rollup_data is not None:
+        open_issues = count_by_state(rollup_data, 'issue', 'open')
+        closed_issues = count_by_state(rollup_data, 'issue', 'closed')
+        open_prs = count_by_state(rollup_data, 'pull_request', 'open')
+        merged_prs = count_by_state(rollup_data, 'pull_request', 'merged')
+    else:
+        open_issues = len(issues_data[issues_data['state'] == 'open'])
+        closed_issues = len(issues_data[issues_data['state'] == 'closed'])
+        open_prs = len(pr_data[pr_data['state'] == 'open'])
+        merged_prs = len(pr_data[pr_data['state'] == 'merged'])
 
     fig = go.Figure(go.Funnel(
         y=['Open Issues', 'Closed Issues', 'Open PRs', 'Merged PRs'],
@@ -124,12 +228,10 @@ def plot_issue_pr_funnel(issues_data, pr_data):
 
     return fig
 
-@st.cache_data
 def plot_trend_analysis(repo_data):
     """
     Plots trend analysis for repository growth and engagement metrics.
     """
-    repo_data['created_at'] = pd.to_datetime(repo_data['created_at'])
     monthly_data = repo_data.resample('ME', on='created_at').agg({
         'id': 'count',
         'stars': 'sum',
@@ -157,12 +259,36 @@ def plot_trend_analysis(repo_data):
 
     return fig
 
-@st.cache_data
+def plot_star_growth(snapshot_data, top_n=10):
+    """
+    Plots stars gained per day for the fastest-growing repositories, from collected snapshots.
+    """
+    growth = snapshot_data.sort_values(['repository', 'timestamp'])
+    growth = growth.assign(stars_gained=growth.groupby('repository')['stars'].diff())
+    top_repos = growth.groupby('repository')['stars_gained'].sum().nlargest(top_n).index
+
+    fig = px.line(growth[growth['repository'].isin(top_repos)], x='timestamp', y='stars_gained',
+                  color='repository', labels={'timestamp': 'Date', 'stars_gained': 'Stars Gained'},
+                  title=f'Daily Star Growth of the Top {top_n} Growing Repositories')
+
+    fig.update_layout(
+        template='plotly_dark',
+        paper_bgcolor='#0d1117',
+        plot_bgcolor='#0d1117',
+        font=dict(color='#c9d1d9')
+    )
+
+    return fig
+
 def plot_repository_treemap(repo_data):
     """
     Creates a treemap visualization of repositories based on stars and size category.
     """
-    fig = px.treemap(repo_data, path=['size_category', 'name'], values='stars',
+    # Empty categories of the typed size_category column, and zero-star repositories, would become
+    # zero-weight tiles; a category holding only those makes Plotly's weighted colour average fail
+    treemap_data = repo_data[repo_data['stars'] > 0]
+    treemap_data = treemap_data.assign(size_category=treemap_data['size_category'].astype(str))
+    fig = px.treemap(treemap_data, path=['size_category', 'name'], values='stars',
                      color='stars', hover_data=['forks', 'open_issues'],
                      color_continuous_scale='blues',
                      title='Repository Treemap by Stars and Size Category')
@@ -176,23 +302,34 @@ def plot_repository_treemap(repo_data):
 
     return fig
 
-@st.cache_data
-def plot_issues_vs_prs(repo_data, issues_data, pr_data):
+def plot_issues_vs_prs(repo_data, issues_data, pr_data, rollup_data=None):
     """
     Creates a scatter plot comparing issues and pull requests for repositories.
+    Per-repository counts come from the rollup cube when one is given.
     """
+    if rollup_data is not None:
+        counts = aggregate_rollups(rollup_data, by=['repository', 'kind'])
+        counts = counts.pivot(index='repository', columns='kind', values='count')
+        issue_counts = counts.get('issue', pd.Series(dtype=float)).rename('issue_count')
+        pr_counts = counts.get('pull_request', pd.Series(dtype=float)).rename('pr_count')
+    else:
+        issue_counts = issues_data.groupby('repository').size().rename('issue_count')
+        pr_counts = pr_data.groupby('repository').size().rename('pr_count')
+
     repo_summary = repo_data.merge(
-        issues_data.groupby('repository').size().rename('issue_count'),
-        left_on='name', right_index=True, how='left'
+        issue_counts, left_on='name', right_index=True, how='left'
     ).merge(
-        pr_data.groupby('repository').size().rename('pr_count'),
-        left_on='name', right_index=True, how='left'
+        pr_counts, left_on='name', right_index=True, how='left'
     )
 
-    fig = px.scatter(repo_summary, x='issue_count', y='pr_count', color='stars',
-                     size='total_contributors', hover_data=['name', 'id'],
-                     labels={'issue_count': 'Number of Issues', 'pr_count': 'Number of PRs'},
-                     title='Issues vs Pull Requests by Repository')
+    labels = {'issue_count': 'Number of Issues', 'pr_count': 'Number of PRs'}
+    if len(repo_summary) > RAW_POINTS_LIMIT:
+        fig = _binned_scatter(repo_summary, 'issue_count', 'pr_count', 'stars',
+                              'Issues vs Pull Requests by Repository (binned)', labels)
+    else:
+        fig = px.scatter(repo_summary, x='issue_count', y='pr_count', color='stars',
+                         size='total_contributors', hover_data=['name', 'id'], labels=labels,
+                         title='Issues vs Pull Requests by Repository')
 
     fig.update_layout(
         template='plotly_dark',
@@ -203,8 +340,7 @@ def plot_issues_vs_prs(repo_data, issues_data, pr_data):
 
     return fig
 
-@st.cache_data
-def display_top_repositories(repo_data, top_n=10):
+def plot_top_repositories(repo_data, top_n=10):
     top_repos = repo_data.nlargest(top_n, 'stars')
 
     # Create a bar chart
@@ -224,5 +360,7 @@ def display_top_repositories(repo_data, top_n=10):
         font=dict(color='#c9d1d9')
     )
 
-    # Display the chart
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+def display_top_repositories(repo_data, top_n=10):
+    st.plotly_chart(plot_top_repositories(repo_data, top_n), use_container_width=True)
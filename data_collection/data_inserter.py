@@ -2,61 +2,43 @@
 import os
 import logging
 from dotenv import load_dotenv
-from pocketbase import PocketBase
 from pocketbase.client import ClientResponseError
 from data_collection.github_api import fetch_and_process_data
+from data_collection.snapshot_store import append_snapshots
+from data_collection.storage import get_storage, required_env_vars
 
 # Load environment variables
 load_dotenv()
 
-# PocketBase configuration
-POCKETBASE_URL = os.getenv("POCKETBASE_URL")
-POCKETBASE_EMAIL = os.getenv("POCKETBASE_EMAIL")
-POCKETBASE_PASSWORD = os.getenv("POCKETBASE_PASSWORD")
-
-# Initialize PocketBase client
-pb = PocketBase(POCKETBASE_URL)
-
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logging.getLogger('apscheduler').setLevel(logging.DEBUG)
 
-# Check if environment variables are loaded
-required_vars = ['GITHUB_TOKEN', 'POCKETBASE_URL', 'POCKETBASE_EMAIL', 'POCKETBASE_PASSWORD']
+# Check if environment variables are loaded (PocketBase credentials only for the pocketbase backend)
+required_vars = ['GITHUB_TOKEN'] + required_env_vars()
 for var in required_vars:
     if not os.getenv(var):
         raise EnvironmentError(f"{var} is not set in the environment or .env file")
 
+# Records are written through the configured storage backend (STORAGE_BACKEND)
+storage = get_storage()
+
 def authenticate_pocketbase():
-    try:
-        # Authenticate as an admin user
-        admin_user = pb.admins.auth_with_password(POCKETBASE_EMAIL, POCKETBASE_PASSWORD)
-        logging.info("Successfully authenticated with PocketBase")
-    except ClientResponseError as e:
-        logging.error(f"Failed to authenticate with PocketBase: {e}")
-        raise
-    except Exception as e:
-        logging.error(f"Unexpected error during PocketBase authentication: {e}")
-        raise
+    """Authenticate with PocketBase when it is the storage backend; a no-op otherwise."""
+    storage.authenticate()
 
 
 def insert_repository_data(repo_data):
     try:
-        filter_query = f"full_name = '{repo_data['full_name']}'"
-        existing_record = pb.collection("repositories").get_list(1, 1, {"filter": filter_query})
-
         # Remove 'id' from repo_data
         if 'id' in repo_data:
             del repo_data['id']
 
-        if existing_record.items:
-            result = pb.collection("repositories").update(existing_record.items[0].id, repo_data)
-            logging.info(f"Updated repository data for {repo_data['full_name']}")
-        else:
-            result = pb.collection("repositories").create(repo_data)
-            logging.info(f"Inserted repository data for {repo_data['full_name']}")
+        record_id = storage.upsert("repositories", repo_data, ["full_name"])
+        logging.info(f"Upserted repository data for {repo_data['full_name']}")
 
-        return result.id
+        record_repository_snapshot(repo_data)
+        return record_id
     except ClientResponseError as e:
         logging.error(f"PocketBase ClientResponseError in insert_repository_data: {e}")
         logging.error(f"Error details: {e.data}")
@@ -65,6 +47,19 @@ def insert_repository_data(repo_data):
         logging.error(f"Unexpected error in insert_repository_data: {e}")
         raise
 
+def record_repository_snapshot(repo_data):
+    """Append the current stars/forks/open issues to the snapshot history."""
+    try:
+        append_snapshots([{
+            "repository": repo_data["full_name"],
+            "stars": repo_data["stars"],
+            "forks": repo_data["forks"],
+            "open_issues": repo_data["open_issues"],
+        }])
+    except Exception as e:
+        # The PocketBase row is already written; a missing history point is not fatal
+        logging.error(f"Failed to record snapshot for {repo_data['full_name']}: {e}")
+
 def insert_issues_data(issues_data, repo_id, batch_size=100):
     for i in range(0, len(issues_data), batch_size):
         batch = issues_data[i:i + batch_size]
@@ -72,6 +67,7 @@ def insert_issues_data(issues_data, repo_id, batch_size=100):
             issue_data = {
                 "number": issue["number"],
                 "title": issue["title"],
+                "author": issue.get("author"),
                 "state": issue["state"],
                 "created_at": issue["created_at"],
                 "updated_at": issue["updated_at"],
@@ -79,7 +75,7 @@ def insert_issues_data(issues_data, repo_id, batch_size=100):
                 "repository": repo_id
             }
             try:
-                pb.collection("issues").create(issue_data)
+                storage.create("issues", issue_data)
             except ClientResponseError as e:
                 logging.error(f"Error inserting issue {issue['number']} for repository ID {repo_id}: {e}")
         logging.info(f"Inserted {len(batch)} issues for repository ID {repo_id}")
@@ -91,6 +87,7 @@ def insert_pull_requests_data(prs_data, repo_id, batch_size=100):
             pr_data = {
                 "number": pr["number"],
                 "title": pr["title"],
+                "author": pr.get("author"),
                 "state": pr["state"],
                 "created_at": pr["created_at"],
                 "updated_at": pr["updated_at"],
@@ -99,7 +96,7 @@ def insert_pull_requests_data(prs_data, repo_id, batch_size=100):
                 "repository": repo_id
             }
             try:
-                pb.collection("pull_requests").create(pr_data)
+                storage.create("pull_requests", pr_data)
             except ClientResponseError as e:
                 logging.error(f"Error inserting pull request {pr['number']} for repository ID {repo_id}: {e}")
         logging.info(f"Inserted {len(batch)} pull requests for repository ID {repo_id}")
@@ -10,7 +10,8 @@ from ratelimit import limits, sleep_and_retry
 load_dotenv()
 
 # GitHub API configuration
-GITHUB_API_URL = "https://api.github.com"
+# Overridable to point the collector at GitHub Enterprise or a local stand-in (benchmarks/fake_github.py)
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 HEADERS = {
     "Authorization": f"token {GITHUB_TOKEN}",
@@ -90,6 +91,7 @@ def process_issues_data(issues_data):
         {
             "number": issue["number"],
             "title": issue["title"],
+            "author": (issue.get("user") or {}).get("login"),
             "state": issue["state"],
             "created_at": issue["created_at"],
             "updated_at": issue["updated_at"],
@@ -108,6 +110,7 @@ def process_pull_requests_data(prs_data):
         {
             "number": pr["number"],
             "title": pr["title"],
+            "author": (pr.get("user") or {}).get("login"),
             "state": "merged" if pr.get("merged_at") else pr["state"],
             "created_at": pr["created_at"],
             "updated_at": pr["updated_at"],
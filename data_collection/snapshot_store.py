@@ -0,0 +1,179 @@
+# snapshot_store.py
+import os
+import glob
+import uuid
+import logging
+import threading
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Append-only store of (repository, timestamp, stars, forks, open_issues) snapshots
+SNAPSHOT_STORE_PATH = os.getenv(
+    "SNAPSHOT_STORE_PATH", os.path.join('dashboard', 'data_processing', 'data', 'snapshots')
+)
+METRIC_COLUMNS = ['stars', 'forks', 'open_issues']
+SNAPSHOT_SCHEMA = pa.schema([
+    ('repository', pa.string()),
+    ('timestamp', pa.timestamp('s', tz='UTC')),
+    ('stars', pa.int64()),
+    ('forks', pa.int64()),
+    ('open_issues', pa.int64()),
+])
+# Segments are folded into the compacted file once this many accumulate
+MAX_SEGMENTS = int(os.getenv("SNAPSHOT_MAX_SEGMENTS", "64"))
+
+# Scheduler jobs append from several threads; only one may compact at a time
+_compaction_lock = threading.Lock()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def _to_utc(value):
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize('UTC') if timestamp.tzinfo is None else timestamp.tz_convert('UTC')
+
+
+def _write_segment(df, path, name):
+    """Write a sorted snapshot frame as one Parquet file, atomically.
+
+    Repository names are dictionary/RLE encoded; timestamps and counters are
+    delta encoded, so a run of unchanged values costs close to nothing.
+    """
+    df = df.sort_values(['repository', 'timestamp'])
+    table = pa.Table.from_pandas(df[SNAPSHOT_SCHEMA.names], schema=SNAPSHOT_SCHEMA, preserve_index=False)
+    final_path = os.path.join(path, name)
+    tmp_path = f"{final_path}.tmp"
+    pq.write_table(
+        table, tmp_path,
+        use_dictionary=['repository'],
+        column_encoding={col: 'DELTA_BINARY_PACKED' for col in ['timestamp'] + METRIC_COLUMNS},
+        compression='zstd',
+    )
+    os.replace(tmp_path, final_path)
+    return final_path
+
+
+def append_snapshots(snapshots, timestamp=None, path=SNAPSHOT_STORE_PATH):
+    """Append repository snapshots to the store as a new segment.
+
+    `snapshots` is a list of dicts (or a DataFrame) with `repository` and the
+    metric columns; rows without a `timestamp` are stamped with `timestamp`,
+    defaulting to now.
+    """
+    df = pd.DataFrame(snapshots)
+    if df.empty:
+        return None
+    if 'timestamp' not in df.columns:
+        df['timestamp'] = timestamp if timestamp is not None else pd.Timestamp.now(tz='UTC')
+    df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
+
+    os.makedirs(path, exist_ok=True)
+    name = f"segment-{pd.Timestamp.now(tz='UTC').strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}.parquet"
+    segment = _write_segment(df, path, name)
+    logging.info(f"Appended {len(df)} repository snapshots to {segment}")
+
+    if len(glob.glob(os.path.join(path, 'segment-*.parquet'))) >= MAX_SEGMENTS:
+        compact_snapshots(path)
+    return segment
+
+
+def compact_snapshots(path=SNAPSHOT_STORE_PATH):
+    """Merge all segments into a single sorted file, keeping only value changes.
+
+    Consecutive snapshots of a repository with unchanged stars, forks and open
+    issues collapse into the first snapshot of the run; readers forward-fill,
+    so the series is unchanged while the store shrinks to one row per change.
+    """
+    with _compaction_lock:
+        _compact(path)
+
+
+def _compact(path):
+    files = sorted(glob.glob(os.path.join(path, '*.parquet')))
+    if len(files) < 2:
+        return
+
+    df = ds.dataset(files, schema=SNAPSHOT_SCHEMA, format='parquet').to_table().to_pandas()
+    df = df.sort_values(['repository', 'timestamp']).drop_duplicates(['repository', 'timestamp'], keep='last')
+    previous = df.groupby('repository')[METRIC_COLUMNS].shift()
+    changed = previous.isna().any(axis=1) | (df[METRIC_COLUMNS] != previous).any(axis=1)
+    df = df[changed]
+
+    # The compacted file sorts before any segment appended afterwards
+    _write_segment(df, path, 'compacted.parquet')
+    for file in files:
+        if os.path.basename(file) != 'compacted.parquet':
+            os.remove(file)
+    logging.info(f"Compacted {len(files)} snapshot files into {len(df)} change points")
+
+
+def read_snapshots(repositories=None, start=None, end=None, path=SNAPSHOT_STORE_PATH):
+    """Read snapshots for a set of repositories and time range.
+
+    Filters are pushed down to the Parquet reader. Because unchanged values are
+    collapsed on compaction, the last change point before `start` is included
+    for each repository so the range starts with its value at `start`.
+    """
+    condition = None
+    if repositories is not None:
+        condition = ds.field('repository').isin(list(repositories))
+    if end is not None:
+        end_condition = ds.field('timestamp') <= _to_utc(end)
+        condition = end_condition if condition is None else condition & end_condition
+
+    for attempt in range(3):
+        files = sorted(glob.glob(os.path.join(path, '*.parquet')))
+        if not files:
+            return pd.DataFrame(columns=SNAPSHOT_SCHEMA.names)
+        try:
+            df = ds.dataset(files, schema=SNAPSHOT_SCHEMA, format='parquet').to_table(filter=condition).to_pandas()
+            break
+        except FileNotFoundError:
+            # A concurrent compaction removed a segment between listing and reading
+            if attempt == 2:
+                raise
+    df['timestamp'] = df['timestamp'].astype('datetime64[ns, UTC]')
+    df = df.sort_values(['repository', 'timestamp']).drop_duplicates(['repository', 'timestamp'], keep='last')
+    if start is not None:
+        start = _to_utc(start)
+        in_range = df['timestamp'] >= start
+        last_before = df[~in_range].groupby('repository').tail(1).assign(timestamp=start)
+        df = pd.concat([last_before, df[in_range]]).sort_values(['repository', 'timestamp'])
+
+    return df.reset_index(drop=True)
+
+
+def downsample_snapshots(snapshot_df, freq='D', end=None):
+    """Resample snapshots to one value per repository and `freq` bucket.
+
+    Each bucket holds the last known value, forward-filled through buckets
+    without changes and up to `end` (default: now). Buckets start at a
+    repository's first snapshot; snapshots after `end` are left out, and so
+    are repositories without any snapshot up to `end`.
+    """
+    if snapshot_df.empty:
+        return snapshot_df
+
+    end = _to_utc(end) if end is not None else pd.Timestamp.now(tz='UTC')
+    frames = []
+    for repository, group in snapshot_df.groupby('repository'):
+        series = group.set_index('timestamp')[METRIC_COLUMNS].astype(float).sort_index()
+        series = series[series.index <= end]
+        if series.empty:
+            continue
+        # An empty row at `end` extends the range so the last value carries forward; `last()` skips it
+        # in a bucket that has snapshots of its own
+        extension = pd.DataFrame(float('nan'), index=pd.DatetimeIndex([end]), columns=METRIC_COLUMNS)
+        resampled = pd.concat([series, extension]).resample(freq).last().ffill().dropna().astype('int64')
+        frames.append(resampled.rename_axis('timestamp').reset_index().assign(repository=repository))
+
+    if not frames:
+        return pd.DataFrame(columns=SNAPSHOT_SCHEMA.names)
+    return pd.concat(frames, ignore_index=True)[SNAPSHOT_SCHEMA.names]
@@ -0,0 +1,328 @@
+# storage.py
+import os
+import re
+import json
+import uuid
+import sqlite3
+import logging
+import threading
+import pandas as pd
+from dotenv import load_dotenv
+from pocketbase import PocketBase
+from pocketbase.client import ClientResponseError
+
+# Load environment variables
+load_dotenv()
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 'pocketbase' (default) talks to the PocketBase server; 'sqlite' keeps records in a local file
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "pocketbase")
+SQLITE_STORAGE_PATH = os.getenv(
+    "SQLITE_STORAGE_PATH", os.path.join('dashboard', 'data_processing', 'data', 'storage.sqlite3')
+)
+STORAGE_BACKENDS = ('pocketbase', 'sqlite')
+
+# Fields every record carries besides its own data, as in PocketBase
+SYSTEM_FIELDS = ('id', 'created', 'updated')
+FILTER_OPERATORS = ('=', '!=', '>', '>=', '<', '<=')
+_FIELD_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _check_field(field):
+    if not _FIELD_NAME.match(field):
+        raise ValueError(f"Invalid field name {field!r}")
+    return field
+
+
+def pocketbase_filter(filters):
+    """Render (field, operator, value) conditions as a PocketBase filter expression."""
+    conditions = []
+    for field, operator, value in filters or ():
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator {operator!r}")
+        if isinstance(value, str):
+            value = '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+        elif value is None:
+            value = 'null'
+        conditions.append(f"{_check_field(field)} {operator} {value}")
+    return ' && '.join(conditions)
+
+
+def _timestamp():
+    """Current time in PocketBase's `created`/`updated` format, which sorts as a string."""
+    return pd.Timestamp.now(tz='UTC').strftime('%Y-%m-%d %H:%M:%S.%f')[:-3] + 'Z'
+
+
+class StorageBackend:
+    """Record store for the repositories, issues and pull_requests collections.
+
+    Records are plain dicts; `id`, `created` and `updated` are assigned by the
+    backend. Filters are lists of (field, operator, value) conditions that must
+    all hold.
+    """
+
+    def authenticate(self, force=False):
+        """Log in to backends that need credentials; local backends have nothing to do."""
+        return self
+
+    def create(self, collection, record):
+        """Insert a record and return its id."""
+        raise NotImplementedError
+
+    def upsert(self, collection, record, key_fields):
+        """Update the record whose `key_fields` match `record`, or insert it. Returns the record id."""
+        raise NotImplementedError
+
+    def scan(self, collection, page=1, per_page=500, fields=None, filters=None):
+        """Return one page of records, in the shape of a PocketBase list response.
+
+        The result has `items` (dicts restricted to `fields`, if given),
+        `page`, `perPage`, `totalItems` and `totalPages`.
+        """
+        raise NotImplementedError
+
+    def delete(self, collection, record_id):
+        """Delete a record by id."""
+        raise NotImplementedError
+
+    def scan_all(self, collection, fields=None, filters=None, per_page=500):
+        """Iterate over every record matching `filters`, page by page."""
+        page = 1
+        while True:
+            result = self.scan(collection, page, per_page, fields, filters)
+            yield from result['items']
+            if page >= result['totalPages']:
+                return
+            page += 1
+
+
+class PocketBaseStorage(StorageBackend):
+    """Records kept in collections of a PocketBase server, accessed as admin."""
+
+    def __init__(self, url, email, password):
+        self.client = PocketBase(url)
+        self.email = email
+        self.password = password
+        self._auth_lock = threading.Lock()
+
+    def authenticate(self, force=False):
+        with self._auth_lock:
+            if force or not self.client.auth_store.token:
+                try:
+                    self.client.admins.auth_with_password(self.email, self.password)
+                    logging.info("Successfully authenticated with PocketBase")
+                except ClientResponseError as e:
+                    logging.error(f"Failed to authenticate with PocketBase: {e}")
+                    raise
+        return self
+
+    def _call(self, method, *args):
+        """Run a request, re-authenticating once if the admin token was rejected."""
+        self.authenticate()
+        try:
+            return method(*args)
+        except ClientResponseError as e:
+            if e.status != 401:
+                raise
+            self.authenticate(force=True)
+            return method(*args)
+
+    def create(self, collection, record):
+        return self._call(self.client.collection(collection).create, record).id
+
+    def upsert(self, collection, record, key_fields):
+        service = self.client.collection(collection)
+        filter_query = pocketbase_filter([(field, '=', record[field]) for field in key_fields])
+        existing = self._call(service.get_list, 1, 1, {"filter": filter_query})
+        if existing.items:
+            return self._call(service.update, existing.items[0].id, record).id
+        return self._call(service.create, record).id
+
+    def scan(self, collection, page=1, per_page=500, fields=None, filters=None):
+        # Raw JSON keeps `created`/`updated` as the server's strings instead of the SDK's datetimes
+        params = {'page': page, 'perPage': per_page}
+        if fields:
+            params['fields'] = ','.join(fields)
+        if filters:
+            params['filter'] = pocketbase_filter(filters)
+        return self._call(
+            self.client.send, f"/api/collections/{collection}/records", {'method': 'GET', 'params': params}
+        )
+
+    def delete(self, collection, record_id):
+        self._call(self.client.collection(collection).delete, record_id)
+
+
+class SQLiteStorage(StorageBackend):
+    """Records kept as JSON in a local SQLite file, one table per collection.
+
+    A stand-in for PocketBase with the same record shape and filter semantics,
+    for running the whole pipeline on one machine without an HTTP hop. The
+    connection is shared between threads behind a lock.
+    """
+
+    def __init__(self, path=SQLITE_STORAGE_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._lock = threading.Lock()
+        self._tables = set()
+        self._indexes = set()
+
+    def _table(self, collection):
+        """Create the collection's table on first use."""
+        table = _check_field(collection)
+        if table not in self._tables:
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table}" '
+                '(id TEXT PRIMARY KEY, created TEXT NOT NULL, updated TEXT NOT NULL, data TEXT NOT NULL)'
+            )
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS "{table}_updated" ON "{table}" (updated)')
+            self._tables.add(table)
+        return table
+
+    def _index(self, table, key_fields):
+        """Index the JSON fields used as upsert keys so lookups do not scan the table."""
+        name = f"{table}_{'_'.join(key_fields)}"
+        if name not in self._indexes:
+            columns = ', '.join(self._column(field) for field in key_fields)
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" ({columns})')
+            self._indexes.add(name)
+
+    @staticmethod
+    def _column(field):
+        if field in SYSTEM_FIELDS:
+            return field
+        return f"json_extract(data, '$.{_check_field(field)}')"
+
+    def _where(self, filters):
+        conditions, params = [], []
+        for field, operator, value in filters or ():
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter operator {operator!r}")
+            column = self._column(field)
+            if value is None:
+                conditions.append(f"{column} IS {'NOT ' if operator == '!=' else ''}NULL")
+            else:
+                conditions.append(f"{column} {operator} ?")
+                params.append(value)
+        return (f"WHERE {' AND '.join(conditions)}" if conditions else ''), params
+
+    @staticmethod
+    def _split(record):
+        return {k: v for k, v in record.items() if k not in SYSTEM_FIELDS}
+
+    def create(self, collection, record):
+        record_id = uuid.uuid4().hex[:15]
+        now = _timestamp()
+        with self._lock:
+            table = self._table(collection)
+            self._conn.execute(
+                f'INSERT INTO "{table}" (id, created, updated, data) VALUES (?, ?, ?, ?)',
+                (record_id, now, now, json.dumps(self._split(record))),
+            )
+        return record_id
+
+    def upsert(self, collection, record, key_fields):
+        with self._lock:
+            table = self._table(collection)
+            self._index(table, key_fields)
+            where, params = self._where([(field, '=', record[field]) for field in key_fields])
+            existing = self._conn.execute(f'SELECT id, data FROM "{table}" {where} LIMIT 1', params).fetchone()
+            if existing is None:
+                record_id = uuid.uuid4().hex[:15]
+                now = _timestamp()
+                self._conn.execute(
+                    f'INSERT INTO "{table}" (id, created, updated, data) VALUES (?, ?, ?, ?)',
+                    (record_id, now, now, json.dumps(self._split(record))),
+                )
+                return record_id
+            record_id, data = existing
+            # Like a PocketBase update, fields not in `record` keep their stored value
+            merged = {**json.loads(data), **self._split(record)}
+            self._conn.execute(
+                f'UPDATE "{table}" SET updated = ?, data = ? WHERE id = ?',
+                (_timestamp(), json.dumps(merged), record_id),
+            )
+            return record_id
+
+    def scan(self, collection, page=1, per_page=500, fields=None, filters=None):
+        where, params = self._where(filters)
+        with self._lock:
+            table = self._table(collection)
+            total = self._conn.execute(f'SELECT count(*) FROM "{table}" {where}', params).fetchone()[0]
+            rows = self._conn.execute(
+                f'SELECT id, created, updated, data FROM "{table}" {where} ORDER BY rowid LIMIT ? OFFSET ?',
+                params + [per_page, (page - 1) * per_page],
+            ).fetchall()
+
+        items = []
+        for record_id, created, updated, data in rows:
+            item = {'id': record_id, 'created': created, 'updated': updated, **json.loads(data)}
+            items.append({field: item.get(field) for field in fields} if fields else item)
+        return {
+            'page': page,
+            'perPage': per_page,
+            'totalItems': total,
+            'totalPages': max(1, -(-total // per_page)),
+            'items': items,
+        }
+
+    def scan_all(self, collection, fields=None, filters=None, per_page=500):
+        # Keyset pagination on rowid: each chunk is an index seek instead of an ever larger OFFSET
+        where, params = self._where(filters)
+        where = f"{where} AND rowid > ?" if where else "WHERE rowid > ?"
+        last_rowid = 0
+        while True:
+            with self._lock:
+                table = self._table(collection)
+                rows = self._conn.execute(
+                    f'SELECT rowid, id, created, updated, data FROM "{table}" {where} ORDER BY rowid LIMIT ?',
+                    params + [last_rowid, per_page],
+                ).fetchall()
+            for last_rowid, record_id, created, updated, data in rows:
+                item = {'id': record_id, 'created': created, 'updated': updated, **json.loads(data)}
+                yield {field: item.get(field) for field in fields} if fields else item
+            if len(rows) < per_page:
+                return
+
+    def delete(self, collection, record_id):
+        with self._lock:
+            table = self._table(collection)
+            self._conn.execute(f'DELETE FROM "{table}" WHERE id = ?', (record_id,))
+
+    def close(self):
+        self._conn.close()
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage():
+    """Return the process-wide storage backend selected by STORAGE_BACKEND."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            if STORAGE_BACKEND == 'sqlite':
+                _storage = SQLiteStorage(SQLITE_STORAGE_PATH)
+                logging.info(f"Using SQLite storage at {SQLITE_STORAGE_PATH}")
+            elif STORAGE_BACKEND == 'pocketbase':
+                _storage = PocketBaseStorage(
+                    os.getenv("POCKETBASE_URL"), os.getenv("POCKETBASE_EMAIL"), os.getenv("POCKETBASE_PASSWORD")
+                )
+            else:
+                raise ValueError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r}, expected one of {STORAGE_BACKENDS}")
+        return _storage
+
+
+def required_env_vars():
+    """Environment variables the selected backend needs."""
+    if STORAGE_BACKEND == 'pocketbase':
+        return ['POCKETBASE_URL', 'POCKETBASE_EMAIL', 'POCKETBASE_PASSWORD']
+    return []
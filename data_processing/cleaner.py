@@ -2,49 +2,34 @@
 import logging
 import pandas as pd
 import numpy as np
-from pocketbase import PocketBase
 from pocketbase.client import ClientResponseError
-import os
 from dotenv import load_dotenv
+from data_collection.storage import get_storage
 
 # Load environment variables
 load_dotenv()
 
-# PocketBase configuration
-POCKETBASE_URL = os.getenv("POCKETBASE_URL")
-POCKETBASE_EMAIL = os.getenv("POCKETBASE_EMAIL")
-POCKETBASE_PASSWORD = os.getenv("POCKETBASE_PASSWORD")
-
-# Initialize PocketBase client
-pb = PocketBase(POCKETBASE_URL)
-
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 def authenticate_pocketbase():
-    try:
-        pb.admins.auth_with_password(POCKETBASE_EMAIL, POCKETBASE_PASSWORD)
-        logging.info("Successfully authenticated with PocketBase")
-    except ClientResponseError as e:
-        logging.error(f"Failed to authenticate with PocketBase: {e}")
-        raise
+    """Authenticate with PocketBase when it is the storage backend; a no-op otherwise."""
+    get_storage().authenticate()
 
 def fetch_data_from_pocketbase(collection_name):
-    """Fetch data from a PocketBase collection and return as a DataFrame."""
+    """Fetch data from a collection of the configured storage backend and return as a DataFrame."""
     try:
-        records = pb.collection(collection_name).get_full_list()
-        df = pd.DataFrame([{k: v for k, v in record.__dict__.items() if not k.startswith('_')} for record in records])
-        return df
+        return pd.DataFrame(list(get_storage().scan_all(collection_name)))
     except ClientResponseError as e:
         logging.error(f"Error fetching data from {collection_name}: {e}")
         return pd.DataFrame()
 
 def convert_to_datetime(df, columns):
-    """Convert specified columns to datetime with UTC timezone."""
+    """Convert specified columns to datetime with UTC timezone, skipping already typed columns."""
     for col in columns:
-        if col in df.columns:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
             try:
-                df[col] = pd.to_datetime(df[col], errors='coerce', utc=True)
+                df[col] = pd.to_datetime(df[col], errors='coerce', utc=True, format='ISO8601')
             except Exception as e:
                 logging.error(f"Error converting column {col} to datetime: {e}")
     return df
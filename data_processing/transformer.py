@@ -2,37 +2,24 @@
 import logging
 
 import pandas as pd
-from pocketbase import PocketBase
-from pocketbase.client import ClientResponseError
-import os
 from dotenv import load_dotenv
+from data_collection.storage import get_storage
+from dashboard.data_processing.sketches import (
+    QUANTILE_METRICS, build_quantile_sketches, contributor_counts, repository_quantiles
+)
 
 # Load environment variables
 load_dotenv()
 
-# PocketBase configuration
-POCKETBASE_URL = os.getenv("POCKETBASE_URL")
-POCKETBASE_EMAIL = os.getenv("POCKETBASE_EMAIL")
-POCKETBASE_PASSWORD = os.getenv("POCKETBASE_PASSWORD")
-
-# Initialize PocketBase client
-pb = PocketBase(POCKETBASE_URL)
-
 
 def authenticate_pocketbase():
-    try:
-        pb.admins.auth_with_password(POCKETBASE_EMAIL, POCKETBASE_PASSWORD)
-        print("Successfully authenticated with PocketBase")
-    except ClientResponseError as e:
-        print(f"Failed to authenticate with PocketBase: {e}")
-        raise
+    """Authenticate with PocketBase when it is the storage backend; a no-op otherwise."""
+    get_storage().authenticate()
 
 
 def calculate_issue_resolution_time(issues_df):
     """Calculate issue resolution time in days."""
     issues_df = issues_df.copy()  # Create a copy to avoid SettingWithCopyWarning
-    issues_df['created_at'] = pd.to_datetime(issues_df['created_at'], utc=True)
-    issues_df['closed_at'] = pd.to_datetime(issues_df['closed_at'], utc=True)
     issues_df['resolution_time_days'] = (issues_df['closed_at'] - issues_df['created_at']).dt.total_seconds() / (24 * 3600)
     issues_df['resolution_time_days'] = issues_df['resolution_time_days'].fillna(-1)  # Unresolved issues set to -1
     return issues_df
@@ -41,15 +28,18 @@ def calculate_issue_resolution_time(issues_df):
 def calculate_pr_merge_time(pr_df):
     """Calculate pull request merge time in days."""
     pr_df = pr_df.copy()  # Create a copy to avoid SettingWithCopyWarning
-    pr_df['created_at'] = pd.to_datetime(pr_df['created_at'], utc=True)
-    pr_df['merged_at'] = pd.to_datetime(pr_df['merged_at'], utc=True)
     pr_df['merge_time_days'] = (pr_df['merged_at'] - pr_df['created_at']).dt.total_seconds() / (24 * 3600)
     pr_df['merge_time_days'] = pr_df['merge_time_days'].fillna(-1)  # Unmerged PRs set to -1
     return pr_df
 
 
-def aggregate_repository_metrics(repo_df, issues_df, pr_df):
-    """Aggregate metrics for each repository."""
+def aggregate_repository_metrics(repo_df, issues_df, pr_df, sketch_df=None):
+    """Aggregate metrics for each repository.
+
+    Besides the means, p50/p90/p99 resolution and merge times are served from
+    per-repository quantile sketches. Pass previously persisted sketches as
+    `sketch_df` to skip rebuilding them from the raw rows.
+    """
     if issues_df.empty:
         logging.warning("Issues data is empty, skipping issue resolution aggregation.")
         avg_issue_resolution = pd.DataFrame(columns=['id', 'avg_issue_resolution_days'])
@@ -64,32 +54,31 @@ def aggregate_repository_metrics(repo_df, issues_df, pr_df):
         avg_pr_merge_time = pr_df.groupby('repository')['merge_time_days'].mean().reset_index()
         avg_pr_merge_time.columns = ['id', 'avg_pr_merge_time_days']
 
+    if sketch_df is None:
+        sketch_df = build_quantile_sketches(issues_df, pr_df)
+    issue_percentiles = repository_quantiles(sketch_df, QUANTILE_METRICS['issues'], prefix='issue_resolution_days')
+    pr_percentiles = repository_quantiles(sketch_df, QUANTILE_METRICS['pull_requests'], prefix='pr_merge_time_days')
+
     # Merge metrics with repository dataframe
     result_df = repo_df.merge(avg_issue_resolution, on='id', how='left')
     result_df = result_df.merge(avg_pr_merge_time, on='id', how='left')
+    result_df = result_df.merge(issue_percentiles.rename(columns={'repository': 'id'}), on='id', how='left')
+    result_df = result_df.merge(pr_percentiles.rename(columns={'repository': 'id'}), on='id', how='left')
 
     # Fill missing values with -1 to indicate lack of data
     result_df = result_df.fillna({
         'avg_issue_resolution_days': -1,
-        'avg_pr_merge_time_days': -1
+        'avg_pr_merge_time_days': -1,
+        **{col: -1 for col in issue_percentiles.columns.drop('repository')},
+        **{col: -1 for col in pr_percentiles.columns.drop('repository')},
     })
 
     return result_df
 
 
 def calculate_contributor_activity(issues_df, pr_df):
-    """Calculate the number of contributors per repository."""
-    issues_contributors = issues_df.groupby('repository')['number'].nunique().reset_index()
-    issues_contributors.columns = ['repository', 'issue_contributors']
-
-    pr_contributors = pr_df.groupby('repository')['number'].nunique().reset_index()
-    pr_contributors.columns = ['repository', 'pr_contributors']
-
-    contributors_df = issues_contributors.merge(pr_contributors, on='repository', how='outer')
-    contributors_df.fillna(0, inplace=True)
-    contributors_df['total_contributors'] = contributors_df['issue_contributors'] + contributors_df['pr_contributors']
-
-    return contributors_df
+    """Estimate the number of distinct contributors per repository from issue and PR authors."""
+    return contributor_counts(issues_df, pr_df, fallback_column='number')
 
 
 def categorize_repositories(repo_df):
@@ -112,15 +101,19 @@ def normalize_metrics(repo_df):
     return repo_df
 
 
-def transform_all_data(repo_df, issues_df, pr_df):
-    """Apply all transformations to the data."""
+def transform_all_data(repo_df, issues_df, pr_df, sketch_df=None):
+    """Apply all transformations to the data.
+
+    `sketch_df` (quantile sketches keyed by repository id) is passed on to
+    `aggregate_repository_metrics`; without it they are built once from the rows.
+    """
     if not issues_df.empty:
         issues_df = calculate_issue_resolution_time(issues_df)
 
     if not pr_df.empty:
         pr_df = calculate_pr_merge_time(pr_df)
 
-    repo_df = aggregate_repository_metrics(repo_df, issues_df, pr_df)
+    repo_df = aggregate_repository_metrics(repo_df, issues_df, pr_df, sketch_df)
 
     if not issues_df.empty or not pr_df.empty:
         contributors_df = calculate_contributor_activity(issues_df, pr_df)
@@ -136,14 +129,14 @@ def transform_all_data(repo_df, issues_df, pr_df):
     return repo_df, issues_df, pr_df
 
 if __name__ == "__main__":
-    from dashboard.data_processing.cleaner import clean_all_data
+    from data_processing.cleaner import clean_all_data
 
     authenticate_pocketbase()
 
-    # Clean data
+    # Clean data read from the configured storage backend
     repo_clean, issues_clean, pr_clean = clean_all_data()
 
     # Transform data
     repo_transformed, issues_transformed, pr_transformed = transform_all_data(repo_clean, issues_clean, pr_clean)
 
-    print("Data transformation and update completed.")
+    logging.info("Data transformation completed.")
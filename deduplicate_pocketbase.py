@@ -1,8 +1,7 @@
-import os
 from dotenv import load_dotenv
-from pocketbase import PocketBase
 import pandas as pd
 import logging
+from data_collection.storage import get_storage
 
 # Load environment variables
 load_dotenv()
@@ -10,30 +9,23 @@ load_dotenv()
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# PocketBase configuration
-POCKETBASE_URL = os.getenv("POCKETBASE_URL")
-POCKETBASE_EMAIL = os.getenv("POCKETBASE_EMAIL")
-POCKETBASE_PASSWORD = os.getenv("POCKETBASE_PASSWORD")
-
-# Initialize PocketBase client
-pb = PocketBase(POCKETBASE_URL)
+# Records are read and deleted through the configured storage backend (STORAGE_BACKEND)
+storage = get_storage()
 
 
 def authenticate_pocketbase():
-    """Authenticate with PocketBase using admin credentials."""
+    """Authenticate with PocketBase when it is the storage backend; a no-op otherwise."""
     try:
-        pb.admins.auth_with_password(POCKETBASE_EMAIL, POCKETBASE_PASSWORD)
-        logging.info("Successfully authenticated with PocketBase")
+        storage.authenticate()
     except Exception as e:
         logging.error(f"Failed to authenticate with PocketBase: {e}")
         raise
 
 
 def fetch_all_records(collection_name):
-    """Fetch all records from a PocketBase collection."""
+    """Fetch all records from a collection as dicts."""
     try:
-        records = pb.collection(collection_name).get_full_list(query_params={"$autoCancel": False})
-        return records
+        return list(storage.scan_all(collection_name))
     except Exception as e:
         logging.error(f"Error fetching records from {collection_name}: {e}")
         return []
@@ -41,7 +33,7 @@ def fetch_all_records(collection_name):
 
 def identify_duplicates(records, key_fields):
     """Identify duplicate records based on specified key fields."""
-    df = pd.DataFrame([{k: v for k, v in record.__dict__.items() if not k.startswith('_')} for record in records])
+    df = pd.DataFrame(records)
     duplicates = df[df.duplicated(subset=key_fields, keep=False)].sort_values(by=key_fields)
     return duplicates
 
@@ -55,7 +47,7 @@ def delete_duplicate_records(collection_name, duplicates, key_fields):
             records_to_delete = group_sorted.iloc[1:]
 
             for _, record in records_to_delete.iterrows():
-                pb.collection(collection_name).delete(record['id'])
+                storage.delete(collection_name, record['id'])
                 logging.info(f"Deleted duplicate record with ID {record['id']} from {collection_name}")
     except Exception as e:
         logging.error(f"Error deleting duplicate records: {e}")
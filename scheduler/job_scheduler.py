@@ -1,10 +1,9 @@
 # job_scheduler.py
 import os
 import logging
-from pocketbase.client import ClientResponseError
-from pocketbase import PocketBase
 from scheduler.apscheduler_config import create_scheduler
-from data_collection.data_inserter import insert_data
+from data_collection.data_inserter import authenticate_pocketbase, insert_data
+from data_collection.storage import required_env_vars
 from data_processing.cleaner import clean_all_data
 from data_processing.transformer import transform_all_data
 from datetime import datetime
@@ -14,36 +13,16 @@ import requests
 # Load environment variables
 load_dotenv()
 
-# PocketBase configuration
-POCKETBASE_URL = os.getenv("POCKETBASE_URL")
-POCKETBASE_EMAIL = os.getenv("POCKETBASE_EMAIL")
-POCKETBASE_PASSWORD = os.getenv("POCKETBASE_PASSWORD")
-
-# Initialize PocketBase client
-pb = PocketBase(POCKETBASE_URL)
-
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logging.getLogger('apscheduler').setLevel(logging.DEBUG)
 
-# Check if environment variables are loaded
-required_vars = ['GITHUB_TOKEN', 'POCKETBASE_URL', 'POCKETBASE_EMAIL', 'POCKETBASE_PASSWORD']
+# Check if environment variables are loaded (PocketBase credentials only for the pocketbase backend)
+required_vars = ['GITHUB_TOKEN'] + required_env_vars()
 for var in required_vars:
     if not os.getenv(var):
         raise EnvironmentError(f"{var} is not set in the environment or .env file")
 
-def authenticate_pocketbase():
-    try:
-        # Authenticate as an admin user
-        admin_admin = pb.admins.auth_with_password(POCKETBASE_EMAIL, POCKETBASE_PASSWORD)
-        logging.info("Successfully authenticated with PocketBase")
-    except ClientResponseError as e:
-        logging.error(f"Failed to authenticate with PocketBase: {e}")
-        raise
-    except Exception as e:
-        logging.error(f"Unexpected error during PocketBase authentication: {e}")
-        raise
-
 def scheduled_data_collection_and_processing(owner, repo):
     """
     The job function that will be scheduled to run at regular intervals.
@@ -0,0 +1,28 @@
+# tests/conftest.py
+
+import pytest
+from data_collection import storage as storage_module
+from data_collection.storage import SQLiteStorage
+from dashboard.data_processing import exporter, fetch_data
+
+
+@pytest.fixture
+def releases(tmp_path, monkeypatch):
+    """Point the exporter (and with it every reader of CURRENT) at an empty data directory."""
+    data_dir = tmp_path / 'data'
+    monkeypatch.setattr(exporter, 'DATA_DIR', str(data_dir))
+    monkeypatch.setattr(exporter, 'RELEASES_DIR', str(data_dir / 'releases'))
+    monkeypatch.setattr(exporter, 'CURRENT_FILE', str(data_dir / 'CURRENT'))
+    return data_dir
+
+
+@pytest.fixture
+def sqlite_storage(tmp_path, monkeypatch):
+    """A SQLite storage backend used by the collectors and the export in place of PocketBase."""
+    store = SQLiteStorage(str(tmp_path / 'storage.sqlite3'))
+    monkeypatch.setattr(storage_module, '_storage', store)
+    monkeypatch.setattr(fetch_data, 'STORAGE_BACKEND', 'sqlite')
+    # Pre-rendering needs the whole dashboard stack and is covered by its own path
+    monkeypatch.setattr(fetch_data, 'render_default_view', None)
+    yield store
+    store.close()
@@ -0,0 +1,42 @@
+# tests/test_analytics_store.py
+
+import pandas as pd
+import pytest
+from dashboard.data_processing import analytics_store
+
+pytest.importorskip('duckdb')
+
+
+@pytest.fixture
+def release_dir(tmp_path):
+    """A release directory whose path needs quoting in SQL."""
+    base = tmp_path / "o'brien's data"
+    partition = base / 'issues_data.parquet' / 'repository=alpha'
+    partition.mkdir(parents=True)
+    pd.DataFrame({'number': [1, 2], 'author': ['ann', 'bob']}).to_parquet(partition / 'part-0.parquet')
+    pd.DataFrame({'name': ['alpha'], 'stars': [10]}).to_parquet(base / 'repo_data.parquet')
+    return str(base)
+
+
+def test_views_read_a_release_whose_path_has_quotes(release_dir):
+    con = analytics_store.connect(release_dir)
+    try:
+        assert con.execute("SELECT stars FROM repositories").fetchall() == [(10,)]
+    finally:
+        con.close()
+
+    issues = analytics_store.query_activity('issues', ['alpha'], ['repository', 'number'], base_path=release_dir)
+    assert issues.sort_values('number').values.tolist() == [['alpha', 1], ['alpha', 2]]
+
+
+def test_missing_dataset_raises_file_not_found(release_dir):
+    with pytest.raises(FileNotFoundError):
+        analytics_store.query_activity('pull_requests', base_path=release_dir)
+
+
+def test_contributor_counts_are_exact():
+    issues = pd.DataFrame({'repository': ['a', 'a', 'b'], 'author': ['ann', 'ann', 'bob']})
+    prs = pd.DataFrame({'repository': ['a', 'b'], 'author': ['cid', 'bob']})
+
+    counts = analytics_store.contributor_counts(issues, prs)
+    assert counts.values.tolist() == [['a', 1, 1, 2], ['b', 1, 1, 1]]
@@ -0,0 +1,84 @@
+# tests/test_downloads.py
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from dashboard.downloads import EXPORT_FORMATS, ExportJobs, write_export
+from dashboard.filter_engine import build_repository_index
+
+
+@pytest.fixture
+def selection():
+    """A filtered, non-contiguous selection of repositories, as the dashboard exports it."""
+    rng = np.random.default_rng(0)
+    rows = 400
+    created = pd.Timestamp('2023-01-01', tz='UTC') + pd.to_timedelta(rng.integers(0, 10 ** 12, rows), unit='us')
+    homepage = pd.Series([None] * rows, dtype=object)
+    homepage.iloc[-40:] = 'https://example.org'
+    repositories = pd.DataFrame({
+        'name': [f"repo{i}" for i in range(rows)],
+        'description': rng.choice(['a, "quoted" text', 'plain', None], rows),
+        'created_at': created,
+        'stars': rng.integers(0, 1000, rows),
+        'forks': rng.integers(0, 100, rows),
+        'stars_per_fork': rng.random(rows).round(2),
+        'size_category': pd.Categorical(rng.choice(['micro', 'small'], rows)),
+        'stale': rng.random(rows) < 0.5,
+        # All-null in the first chunks, so its type comes from the whole column
+        'homepage': homepage,
+    })
+    selected = build_repository_index(repositories).filter(ranges={'stars': (100, 900)}, categories={'stale': [False]})
+    assert 0 < len(selected) < rows
+    assert selected['homepage'].head(50).isna().all() and selected['homepage'].notna().any()
+    return selected
+
+
+def _expected(selected):
+    return selected.astype({'size_category': object}).reset_index(drop=True)
+
+
+def test_csv_round_trip(selection, tmp_path):
+    path = write_export(selection, str(tmp_path / 'repo_data.csv.gz'), 'CSV (gzip)', chunk_rows=50)
+
+    read = pd.read_csv(path, parse_dates=['created_at'])
+    assert str(read['created_at'].dtype) == 'datetime64[ns, UTC]'
+    # CSV has no None: missing text reads back as NaN
+    pd.testing.assert_frame_equal(read, _expected(selection).fillna(np.nan), check_dtype=False)
+    assert read['stale'].dtype == bool
+
+
+def test_parquet_round_trip(selection, tmp_path):
+    path = write_export(selection, str(tmp_path / 'repo_data.parquet'), 'Parquet', chunk_rows=50)
+
+    read = pd.read_parquet(path)
+    assert isinstance(read['created_at'].dtype, pd.DatetimeTZDtype)
+    assert str(read['created_at'].dt.tz) == 'UTC'
+    expected = _expected(selection)
+    pd.testing.assert_frame_equal(read, expected, check_dtype=False)
+    assert (read.dtypes.drop('created_at') == expected.dtypes.drop('created_at')).all()
+
+
+def test_arrow_round_trip(selection, tmp_path):
+    path = write_export(selection, str(tmp_path / 'repo_data.arrow'), 'Arrow', chunk_rows=50)
+
+    with pa.memory_map(path) as source:
+        read = pa.ipc.open_file(source).read_all().to_pandas()
+    pd.testing.assert_frame_equal(read, _expected(selection), check_dtype=False)
+
+
+def test_jobs_write_in_the_background_and_reuse_files(selection):
+    jobs = ExportJobs()
+    key = ('v1', 'fingerprint', 'filtered_repo_data', 'Parquet')
+
+    job = jobs.submit(key, 'filtered_repo_data', selection, 'Parquet')
+    path = job.result(timeout=30)
+    assert path.endswith(f"filtered_repo_data.{EXPORT_FORMATS['Parquet'][0]}")
+    assert jobs.submit(key, 'filtered_repo_data', selection, 'Parquet') is job
+    assert jobs.get(key) is job
+    pd.testing.assert_frame_equal(pd.read_parquet(path), _expected(selection), check_dtype=False)
+
+
+def test_unknown_format_is_rejected(selection, tmp_path):
+    with pytest.raises(ValueError):
+        write_export(selection, str(tmp_path / 'repo_data.xlsx'), 'Excel')
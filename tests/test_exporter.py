@@ -0,0 +1,93 @@
+# tests/test_exporter.py
+
+import os
+import pandas as pd
+import pytest
+from dashboard.data_processing import exporter
+from dashboard.data_processing.exporter import current_release_dir, export_release, read_manifest
+
+
+def _tables(stars=10):
+    issues = pd.DataFrame({
+        'repository': ['alpha', 'alpha', 'beta'],
+        'number': [1, 2, 3],
+        'created_at': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03'], utc=True),
+    })
+    return {'repo_data': pd.DataFrame({'name': ['alpha', 'beta'], 'stars': [stars, 5]}), 'issues_data': issues}
+
+
+def _releases():
+    return sorted(name for name in os.listdir(exporter.RELEASES_DIR) if not name.startswith('.'))
+
+
+def test_export_publishes_a_release_with_its_manifest(releases):
+    release_dir = export_release(_tables(), partitioned={'issues_data'}, watermark={'issues': {'updated': 'x'}})
+
+    assert current_release_dir() == release_dir
+    manifest = read_manifest(release_dir)
+    assert manifest['version'] == os.path.basename(release_dir)
+    assert manifest['watermark'] == {'issues': {'updated': 'x'}}
+    assert manifest['datasets']['repo_data']['rows'] == 2
+    issues = manifest['datasets']['issues_data']
+    assert issues['rows'] == 3
+    assert sorted(file['partition'] for file in issues['files'].values()) == ['alpha', 'beta']
+
+
+def test_a_failed_export_leaves_the_live_release_untouched(releases, monkeypatch):
+    live = export_release(_tables(), partitioned={'issues_data'})
+
+    def fail(df, path, sort_by=None):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(exporter, 'write_table', fail)
+    with pytest.raises(OSError):
+        export_release(_tables(stars=99), partitioned={'issues_data'})
+
+    assert current_release_dir() == live
+    assert os.listdir(exporter.RELEASES_DIR) == [os.path.basename(live)]
+
+
+def test_a_failing_prerender_still_publishes_the_datasets(releases):
+    def prerender(release_dir):
+        raise RuntimeError("no browser")
+
+    release_dir = export_release(_tables(), partitioned={'issues_data'}, prerender=prerender)
+
+    assert current_release_dir() == release_dir
+    assert set(read_manifest(release_dir)['datasets']) == {'repo_data', 'issues_data'}
+
+
+def test_old_releases_are_pruned_in_publication_order(releases):
+    published = [export_release(_tables(stars=n), partitioned={'issues_data'}) for n in range(5)]
+
+    assert _releases() == [os.path.basename(release_dir) for release_dir in published[-exporter.RELEASES_TO_KEEP:]]
+    assert current_release_dir() == published[-1]
+
+
+def test_pruning_never_removes_the_live_release(releases):
+    published = [export_release(_tables(stars=n), partitioned={'issues_data'}) for n in range(3)]
+    # Rolled back to the oldest release
+    exporter._publish(os.path.basename(published[0]))
+    exporter._prune_releases(keep=1)
+
+    assert _releases() == [os.path.basename(published[0]), os.path.basename(published[2])]
+    assert current_release_dir() == published[0]
+
+
+def test_base_release_links_unchanged_partitions_and_carries_datasets_over(releases):
+    base = export_release(_tables(), partitioned={'issues_data'})
+    changed = pd.DataFrame({'repository': ['beta'], 'number': [4],
+                            'created_at': pd.to_datetime(['2024-02-01'], utc=True)})
+
+    release_dir = export_release({'issues_data': changed}, partitioned={'issues_data'}, base_release=base)
+
+    base_files = read_manifest(base)['datasets']['issues_data']['files']
+    files = read_manifest(release_dir)['datasets']['issues_data']['files']
+    for relative, entry in files.items():
+        base_file = os.path.join(base, relative)
+        linked = os.path.exists(base_file) and os.path.samefile(base_file, os.path.join(release_dir, relative))
+        assert linked == (entry['partition'] == 'alpha')
+        assert (entry == base_files.get(relative)) == linked
+    issues = pd.read_parquet(os.path.join(release_dir, 'issues_data.parquet'))
+    assert sorted(issues['number']) == [1, 2, 4]
+    assert os.path.samefile(os.path.join(base, 'repo_data.parquet'), os.path.join(release_dir, 'repo_data.parquet'))
@@ -0,0 +1,65 @@
+# tests/test_figure_cache.py
+
+import datetime
+import plotly.graph_objects as go
+from dashboard.figure_cache import FigureCache, filter_fingerprint
+
+
+def _builder(builds, name):
+    """Build a small figure named `name`, recording each build."""
+    def build():
+        builds.append(name)
+        return go.Figure(go.Bar(x=[name], y=[1]))
+    return build
+
+
+def _size():
+    return len(go.Figure(go.Bar(x=['a'], y=[1])).to_json())
+
+
+def test_hit_and_miss():
+    cache, builds = FigureCache(), []
+
+    first, hit, size = cache.get_or_build_entry(('v1', 'all', 'chart'), _builder(builds, 'a'))
+    assert not hit and size == len(first.to_json())
+    again, hit, _ = cache.get_or_build_entry(('v1', 'all', 'chart'), _builder(builds, 'a'))
+    assert hit and again is first
+    assert builds == ['a']
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'evictions': 0,
+                             'entries': 1, 'bytes': size}
+
+
+def test_evicts_the_least_recently_used_at_capacity():
+    cache, builds = FigureCache(max_bytes=3 * _size()), []
+    for name in 'abc':
+        cache.get_or_build((1, 'all', name), _builder(builds, name))
+
+    # 'a' was used last, so 'b' is the least recently used when 'd' comes in
+    cache.get_or_build((1, 'all', 'a'), _builder(builds, 'a'))
+    cache.get_or_build((1, 'all', 'd'), _builder(builds, 'd'))
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['entries'] == 3
+
+    for name in 'acd':
+        cache.get_or_build((1, 'all', name), _builder(builds, name))
+    assert builds == ['a', 'b', 'c', 'd']
+    cache.get_or_build((1, 'all', 'b'), _builder(builds, 'b'))
+    assert builds == ['a', 'b', 'c', 'd', 'b']
+
+
+def test_a_new_version_misses():
+    cache, builds = FigureCache(), []
+    fingerprint = filter_fingerprint({'stars': (0, 10)}, None, True)
+
+    cache.get_or_build(('20240101T000000000000Z', fingerprint, 'chart'), _builder(builds, 'old'))
+    figure, hit, _ = cache.get_or_build_entry(('20240102T000000000000Z', fingerprint, 'chart'),
+                                              _builder(builds, 'new'))
+    assert not hit and builds == ['old', 'new']
+    assert figure.data[0].x == ('new',)
+
+
+def test_fingerprints_ignore_container_types_and_key_order():
+    day = datetime.date(2024, 1, 1)
+    assert filter_fingerprint({'a': (1, 2), 'b': {'x', 'y'}, 'date': day}) == \
+        filter_fingerprint({'date': day, 'b': {'y', 'x'}, 'a': [1, 2]})
+    assert filter_fingerprint({'a': (1, 2)}) != filter_fingerprint({'a': (1, 3)})
@@ -0,0 +1,138 @@
+# tests/test_filter_engine.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from dashboard.filter_engine import build_activity_index, build_repository_index
+
+
+@pytest.fixture
+def repositories():
+    rng = np.random.default_rng(0)
+    rows = 500
+    stars = rng.integers(0, 1000, rows).astype(float)
+    stars[::37] = np.nan
+    return pd.DataFrame({
+        'name': [f"repo{i}" for i in range(rows)],
+        'created_at': pd.Timestamp('2020-01-01', tz='UTC') + pd.to_timedelta(rng.integers(0, 1500, rows), unit='D'),
+        'stars': stars,
+        'forks': rng.integers(0, 200, rows),
+        'open_issues': rng.integers(0, 50, rows),
+        'total_contributors': rng.integers(0, 30, rows),
+        'size_category': rng.choice(['Small', 'Medium', 'Large'], rows),
+        'stale': rng.random(rows) < 0.3,
+    })
+
+
+@pytest.fixture
+def issues():
+    rng = np.random.default_rng(1)
+    rows = 3000
+    # Rows of a repository are scattered, as they come out of the exporter
+    return pd.DataFrame({
+        'repository': rng.choice([f"repo{i}" for i in range(40)], rows),
+        'resolution_time_days': np.where(rng.random(rows) < 0.2, np.nan, rng.exponential(10, rows)),
+        'number': np.arange(rows),
+    })
+
+
+def _same_rows(filtered, expected, key):
+    assert sorted(filtered[key]) == sorted(expected[key])
+
+
+def test_range_masks_match_boolean_filters(repositories):
+    index = build_repository_index(repositories)
+    frame = index.frame
+
+    _same_rows(index.filter(ranges={'stars': (100, 500)}), frame[frame['stars'].between(100, 500)], 'name')
+    _same_rows(index.filter(ranges={'forks': (None, 20)}), frame[frame['forks'] <= 20], 'name')
+    start, end = pd.Timestamp('2021-01-01'), pd.Timestamp('2022-06-30', tz='UTC')
+    _same_rows(index.filter(ranges={'created_at': (start, end)}),
+               frame[frame['created_at'].between(start.tz_localize('UTC'), end)], 'name')
+    # Unbounded on both ends still drops null values
+    _same_rows(index.filter(ranges={'stars': (None, None)}), frame[frame['stars'].notna()], 'name')
+
+
+def test_category_and_stale_masks_match_boolean_filters(repositories):
+    index = build_repository_index(repositories)
+    frame = index.frame
+
+    _same_rows(index.filter(categories={'size_category': ['Small', 'Large']}),
+               frame[frame['size_category'].isin(['Small', 'Large'])], 'name')
+    _same_rows(index.filter(categories={'stale': [False]}), frame[~frame['stale']], 'name')
+    combined = index.filter(ranges={'stars': (200, None), 'open_issues': (5, 30)},
+                            categories={'size_category': ['Medium'], 'stale': [False]})
+    expected = frame[(frame['stars'] >= 200) & frame['open_issues'].between(5, 30)
+                     & (frame['size_category'] == 'Medium') & ~frame['stale']]
+    _same_rows(combined, expected, 'name')
+
+
+def test_bounds_and_categories(repositories):
+    index = build_repository_index(repositories)
+
+    assert index.bounds('stars') == (repositories['stars'].min(), repositories['stars'].max())
+    assert index.bounds('created_at') == (repositories['created_at'].min(), repositories['created_at'].max())
+    assert set(index.categories('size_category')) == {'Small', 'Medium', 'Large'}
+
+
+def test_group_masks_match_boolean_filters(issues):
+    index = build_activity_index('issues', issues)
+    frame = index.frame
+    groups = ['repo3', 'repo7', 'repo11']
+
+    _same_rows(index.filter(groups=groups), issues[issues['repository'].isin(groups)], 'number')
+    selected = index.filter(ranges={'resolution_time_days': (1, 5)}, groups=groups)
+    expected = issues[issues['repository'].isin(groups) & issues['resolution_time_days'].between(1, 5)]
+    _same_rows(selected, expected, 'number')
+
+    assert index.count(groups) == issues['repository'].isin(groups).sum()
+    in_groups = issues.loc[issues['repository'].isin(groups), 'resolution_time_days']
+    assert index.bounds('resolution_time_days', groups) == (in_groups.min(), in_groups.max())
+    # Laid out contiguously per repository, keeping the order within each
+    assert frame['repository'].ne(frame['repository'].shift()).sum() == frame['repository'].nunique()
+    assert list(frame.loc[frame['repository'] == 'repo3', 'number']) == \
+        list(issues.loc[issues['repository'] == 'repo3', 'number'])
+
+
+def test_contiguous_selection_is_a_view(issues):
+    index = build_activity_index('issues', issues)
+    first, second = index.groups()[:2]
+
+    with pd.option_context('mode.copy_on_write', True):
+        selected = index.filter(groups=[first, second])
+        assert np.shares_memory(selected['number'].to_numpy(), index.frame['number'].to_numpy())
+        selected.loc[selected.index[0], 'number'] = -1
+        assert (index.frame['number'] >= 0).all()
+
+        scattered = index.filter(groups=[index.groups()[0], index.groups()[2]])
+        assert not np.shares_memory(scattered['number'].to_numpy(), index.frame['number'].to_numpy())
+
+    assert len(selected) == issues['repository'].isin([first, second]).sum()
+
+
+def test_empty_selections(repositories, issues):
+    repository_index = build_repository_index(repositories)
+    activity_index = build_activity_index('issues', issues)
+
+    assert repository_index.filter(ranges={'stars': (5000, None)}).empty
+    assert repository_index.filter(categories={'size_category': []}).empty
+    assert repository_index.filter(categories={'size_category': ['Unknown']}).empty
+    assert activity_index.filter(groups=[]).empty
+    assert activity_index.filter(groups=['missing']).empty
+    assert activity_index.count(['missing']) == 0
+    assert activity_index.bounds('resolution_time_days', ['missing']) is None
+    assert list(activity_index.filter(groups=[]).columns) == list(issues.columns)
+
+
+def test_masks_are_reused_across_filter_changes(repositories):
+    index = build_repository_index(repositories)
+
+    first = index.mask(ranges={'stars': (100, 500)}, categories={'stale': [False]})
+    other = index.mask(ranges={'stars': (100, 600)}, categories={'stale': [False]})
+    again = index.mask(categories={'stale': (False,)}, ranges={'stars': [100, 500]})
+
+    assert again is first
+    assert other is not first
+    assert not first.flags.writeable
+    with pytest.raises(ValueError):
+        first[0] = not first[0]
@@ -0,0 +1,124 @@
+# tests/test_incremental_export.py
+
+import json
+import os
+import pandas as pd
+from dashboard.data_processing.exporter import MANIFEST_FILE, current_release_dir, read_manifest
+from dashboard.data_processing.fetch_data import export_incremental, fetch_and_prepare_data
+
+
+def _insert_repository(store, name, stars=10):
+    return store.create('repositories', {
+        'name': name, 'full_name': f"org/{name}", 'description': name, 'stars': stars, 'forks': 1,
+        'open_issues': 1, 'created_at': '2024-01-01 00:00:00.000Z', 'updated_at': '2024-05-01 00:00:00.000Z',
+    })
+
+
+def _insert_issue(store, repo_id, number, title='bug'):
+    return store.create('issues', {
+        'repository': repo_id, 'number': number, 'title': title, 'author': f"user{number}", 'state': 'closed',
+        'created_at': '2024-02-01 00:00:00.000Z', 'updated_at': '2024-02-03 00:00:00.000Z',
+        'closed_at': '2024-02-03 00:00:00.000Z',
+    })
+
+
+def _insert_pull_request(store, repo_id, number):
+    return store.create('pull_requests', {
+        'repository': repo_id, 'number': number, 'title': 'feature', 'author': f"user{number}", 'state': 'merged',
+        'created_at': '2024-03-01 00:00:00.000Z', 'updated_at': '2024-03-02 00:00:00.000Z',
+        'closed_at': '2024-03-02 00:00:00.000Z', 'merged_at': '2024-03-02 00:00:00.000Z',
+    })
+
+
+def _set_updated(store, collection, record_id, updated):
+    """Pin a record's PocketBase `updated` time, to lay out the timings of concurrent writes."""
+    store._conn.execute(f'UPDATE "{collection}" SET updated = ? WHERE id = ?', (updated, record_id))
+
+
+def _seed(store):
+    repo_id = _insert_repository(store, 'alpha')
+    issue_id = _insert_issue(store, repo_id, 1)
+    pr_id = _insert_pull_request(store, repo_id, 2)
+    _set_updated(store, 'repositories', repo_id, '2024-06-01 10:00:00.000Z')
+    _set_updated(store, 'issues', issue_id, '2024-06-01 10:00:05.000Z')
+    _set_updated(store, 'pull_requests', pr_id, '2024-06-01 10:00:09.000Z')
+    return repo_id, issue_id, pr_id
+
+
+def _issues(release_dir):
+    return pd.read_parquet(os.path.join(release_dir, 'issues_data.parquet'))
+
+
+def test_full_export_records_a_watermark_per_collection(sqlite_storage, releases):
+    repo_id, issue_id, pr_id = _seed(sqlite_storage)
+    release_dir = fetch_and_prepare_data()
+
+    assert read_manifest(release_dir)['watermark'] == {
+        'repositories': {'updated': '2024-06-01 10:00:00.000Z', 'ids': [repo_id]},
+        'issues': {'updated': '2024-06-01 10:00:05.000Z', 'ids': [issue_id]},
+        'pull_requests': {'updated': '2024-06-01 10:00:09.000Z', 'ids': [pr_id]},
+    }
+
+
+def test_incremental_export_without_changes_keeps_the_release(sqlite_storage, releases):
+    _seed(sqlite_storage)
+    release_dir = fetch_and_prepare_data()
+
+    assert export_incremental() == release_dir
+    assert current_release_dir() == release_dir
+
+
+def test_record_updated_while_a_later_collection_downloaded_is_exported(sqlite_storage, releases):
+    repo_id, _, _ = _seed(sqlite_storage)
+    fetch_and_prepare_data()
+    # Written after repositories were fetched but before PRs were: older than the newest PR
+    sqlite_storage.upsert('repositories', {'full_name': 'org/alpha', 'stars': 5000}, ['full_name'])
+    _set_updated(sqlite_storage, 'repositories', repo_id, '2024-06-01 10:00:07.000Z')
+
+    release_dir = export_incremental()
+
+    repo_data = pd.read_parquet(os.path.join(release_dir, 'repo_data.parquet'))
+    assert repo_data.set_index('name').loc['alpha', 'stars'] == 5000
+    assert read_manifest(release_dir)['watermark']['repositories']['updated'] == '2024-06-01 10:00:07.000Z'
+
+
+def test_record_sharing_the_watermark_time_is_exported_once(sqlite_storage, releases):
+    repo_id, issue_id, _ = _seed(sqlite_storage)
+    fetch_and_prepare_data()
+    late_id = _insert_issue(sqlite_storage, repo_id, 3)
+    _set_updated(sqlite_storage, 'issues', late_id, '2024-06-01 10:00:05.000Z')
+
+    release_dir = export_incremental()
+    assert sorted(_issues(release_dir)['number']) == [1, 3]
+    assert read_manifest(release_dir)['watermark']['issues']['ids'] == sorted([issue_id, late_id])
+
+    # Both records at the watermark are now known; nothing is left to export
+    assert export_incremental() == release_dir
+
+
+def test_updated_record_is_upserted_not_duplicated(sqlite_storage, releases):
+    _, issue_id, _ = _seed(sqlite_storage)
+    fetch_and_prepare_data()
+    sqlite_storage.upsert('issues', {'id': issue_id, 'title': 'crash on start'}, ['id'])
+    _set_updated(sqlite_storage, 'issues', issue_id, '2024-06-02 00:00:00.000Z')
+
+    issues = _issues(export_incremental())
+    assert len(issues) == 1
+    assert issues.loc[0, 'title'] == 'crash on start'
+
+
+def test_release_with_a_single_watermark_is_still_read(sqlite_storage, releases):
+    repo_id, _, _ = _seed(sqlite_storage)
+    release_dir = fetch_and_prepare_data()
+    manifest_path = os.path.join(release_dir, MANIFEST_FILE)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest['watermark'] = '2024-06-01 10:00:09.000Z'
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f)
+    new_id = _insert_issue(sqlite_storage, repo_id, 4)
+    _set_updated(sqlite_storage, 'issues', new_id, '2024-06-03 00:00:00.000Z')
+
+    release_dir = export_incremental()
+    assert sorted(_issues(release_dir)['number']) == [1, 4]
+    assert set(read_manifest(release_dir)['watermark']) == {'repositories', 'issues', 'pull_requests'}
@@ -0,0 +1,61 @@
+# tests/test_pocketbase_config.py
+
+import base64
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dashboard.data_processing import pocketbase_config
+
+
+def _jwt(expires_in):
+    claims = base64.urlsafe_b64encode(json.dumps({'exp': time.time() + expires_in}).encode()).decode().rstrip('=')
+    return f"header.{claims}.signature"
+
+
+def _count_logins(monkeypatch, token):
+    """Replace the admin login by one that hands out fresh tokens, slowly enough for threads to overlap."""
+    logins = []
+
+    def login(email, password):
+        time.sleep(0.05)
+        logins.append(email)
+        pocketbase_config.pb.auth_store.save(_jwt(3600) + str(len(logins)), None)
+
+    monkeypatch.setattr(pocketbase_config.pb.admins, 'auth_with_password', login)
+    pocketbase_config.pb.auth_store.save(token, None)
+    return logins
+
+
+def test_valid_token_is_reused(monkeypatch):
+    token = _jwt(3600)
+    logins = _count_logins(monkeypatch, token)
+
+    assert pocketbase_config.auth_token() == token
+    assert logins == []
+
+
+def test_expired_token_is_refreshed_once_across_threads(monkeypatch):
+    logins = _count_logins(monkeypatch, _jwt(-10))
+
+    with ThreadPoolExecutor(8) as pool:
+        tokens = set(pool.map(lambda _: pocketbase_config.auth_token(), range(8)))
+
+    assert len(logins) == 1
+    assert len(tokens) == 1
+
+
+def test_threads_rejected_with_the_same_token_share_one_login(monkeypatch):
+    rejected = _jwt(3600)
+    logins = _count_logins(monkeypatch, rejected)
+    start = threading.Barrier(8)
+
+    def retry(_):
+        start.wait()
+        return pocketbase_config.auth_token(rejected=rejected)
+
+    with ThreadPoolExecutor(8) as pool:
+        tokens = set(pool.map(retry, range(8)))
+
+    assert len(logins) == 1
+    assert tokens == {pocketbase_config.pb.auth_store.token} != {rejected}
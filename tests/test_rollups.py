@@ -0,0 +1,69 @@
+# tests/test_rollups.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from dashboard.data_processing.rollups import (
+    ROLLUP_GRAIN, build_rollups, count_by_state, distinct_authors, duration_quantiles, filter_rollups, mean_duration
+)
+from dashboard.data_processing.sketches import TDigest
+
+
+def _activity(rng, rows, metric):
+    created = pd.Timestamp('2024-01-01', tz='UTC') + pd.to_timedelta(rng.integers(0, 365, rows), unit='D')
+    return pd.DataFrame({
+        'repository': rng.choice(['a', 'b', 'c'], rows),
+        'state': rng.choice(['open', 'closed'], rows).astype(object),
+        'created_at': created,
+        'author': rng.choice([f"user{i}" for i in range(300)], rows),
+        metric: np.where(rng.random(rows) < 0.2, -1, rng.exponential(10, rows)),
+    })
+
+
+@pytest.fixture
+def activity():
+    rng = np.random.default_rng(0)
+    return _activity(rng, 6000, 'resolution_time_days'), _activity(rng, 3000, 'merge_time_days')
+
+
+def test_cube_counts_match_the_rows(activity):
+    issues, pr_data = activity
+    issues.loc[::10, 'state'] = None
+
+    rollups = build_rollups(issues, pr_data)
+    assert (rollups['grain'] == ROLLUP_GRAIN).all()
+    assert count_by_state(rollups, 'issue') == len(issues)
+    assert count_by_state(rollups, 'pull_request') == len(pr_data)
+    assert count_by_state(rollups, 'issue', 'open') == (issues['state'] == 'open').sum()
+    assert rollups.loc[rollups['kind'] == 'issue', 'state'].isna().any()
+
+
+def test_items_without_a_creation_date_are_left_out(activity):
+    issues, pr_data = activity
+    issues.loc[:99, 'created_at'] = pd.NaT
+
+    rollups = build_rollups(issues, pr_data)
+    assert count_by_state(rollups, 'issue') == len(issues) - 100
+
+
+def test_cells_answer_the_row_aggregates(activity):
+    issues, pr_data = activity
+    rollups = filter_rollups(build_rollups(issues, pr_data), ['a', 'b'])
+    selected = issues[issues['repository'].isin(['a', 'b'])]
+    durations = selected.loc[selected['resolution_time_days'] >= 0, 'resolution_time_days']
+
+    assert mean_duration(rollups, 'issue') == pytest.approx(durations.mean())
+    assert duration_quantiles(rollups, 'issue')[0.5] == pytest.approx(durations.median(), rel=0.05)
+    authors = pd.concat([selected['author'], pr_data.loc[pr_data['repository'].isin(['a', 'b']), 'author']])
+    assert distinct_authors(rollups) == pytest.approx(authors.nunique(), rel=0.05)
+
+
+def test_cell_sketches_are_the_digests_of_their_rows(activity):
+    issues, pr_data = activity
+    rollups = build_rollups(issues, pr_data).set_index(['repository', 'period', 'kind', 'state'])
+
+    issues['period'] = issues['created_at'].dt.tz_localize(None).dt.to_period('M').dt.start_time
+    completed = issues[issues['resolution_time_days'] >= 0]
+    for (repository, period, state), rows in list(completed.groupby(['repository', 'period', 'state']))[:20]:
+        expected = TDigest().update(rows['resolution_time_days'].to_numpy()).to_bytes()
+        assert rollups.loc[(repository, period, 'issue', state), 'duration_sketch'] == expected
@@ -0,0 +1,87 @@
+# tests/test_search_index.py
+
+import pandas as pd
+import pytest
+from dashboard.search_index import SearchIndex
+
+
+@pytest.fixture
+def index():
+    repositories = pd.DataFrame({
+        'name': ['react', 'react-native', 'preact', 'vue', 'angular', 'svelte', 'redux'],
+        'full_name': ['facebook/react', 'facebook/react-native', 'preactjs/preact', 'vuejs/vue',
+                      'angular/angular', 'sveltejs/svelte', 'reduxjs/redux'],
+        'description': ['A library for web user interfaces', 'Native mobile apps with React',
+                        'Fast 3kB alternative', 'Progressive framework', 'Web platform',
+                        'Cybernetically enhanced web apps', 'Predictable state container'],
+        'stars': [220, 110, 35, 200, 90, 75, 60],
+    })
+    return repositories, SearchIndex(repositories)
+
+
+def _names(repositories, results):
+    return [repositories['name'].iat[position] for position, _ in results]
+
+
+def test_substring_matches_rank_prefixes_first(index):
+    repositories, search_index = index
+
+    assert _names(repositories, search_index.search('react', fuzzy=False)) == ['react', 'react-native', 'preact']
+    assert _names(repositories, search_index.search('ACT', fuzzy=False)) == ['react', 'react-native', 'preact']
+    mask = search_index.mask('native')
+    assert list(repositories.loc[mask, 'name']) == ['react-native', 'preact']
+    assert not search_index.is_fuzzy('native')
+
+
+def test_prefix_matches_of_one_and_two_letters(index):
+    repositories, search_index = index
+
+    assert list(repositories.loc[search_index.mask('re'), 'name']) == ['react', 'react-native', 'preact', 'redux']
+    assert _names(repositories, search_index.search('s'))[0] == 'svelte'
+
+
+def test_description_matches(index):
+    repositories, search_index = index
+
+    assert list(repositories.loc[search_index.mask('state container'), 'name']) == ['redux']
+    # Equal description matches go to the more starred repository
+    assert _names(repositories, search_index.search('web', fuzzy=False)) == ['react', 'angular', 'svelte']
+    # A name match ranks above a description match
+    assert _names(repositories, search_index.search('native', fuzzy=False)) == ['react-native', 'preact']
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('raect', 'react'),
+    ('agnular', 'angular'),
+    ('svlete', 'svelte'),
+    ('rdeux', 'redux'),
+    ('facebok', 'react'),
+    ('progresive', 'vue'),
+])
+def test_fuzzy_matches_typos_and_transpositions(index, query, expected):
+    repositories, search_index = index
+
+    assert search_index.is_fuzzy(query)
+    assert _names(repositories, search_index.search(query))[0] == expected
+    assert expected in set(repositories.loc[search_index.mask(query), 'name'])
+
+
+def test_fuzzy_matches_rank_below_substrings(index):
+    repositories, search_index = index
+
+    results = search_index.search('react')
+    assert _names(repositories, results)[:3] == ['react', 'react-native', 'preact']
+    assert all(score < 1 for _, score in results[3:])
+    assert search_index.search('xyzzy') == []
+    assert not search_index.mask('xyzzy').any()
+    assert search_index.mask('').all()
+
+
+def test_suggest_completes_names_by_popularity(index):
+    _, search_index = index
+
+    assert search_index.suggest('re') == ['facebook/react', 'facebook/react-native', 'reduxjs/redux']
+    assert search_index.suggest('Facebook/R', limit=1) == ['facebook/react']
+    assert search_index.suggest('s') == ['sveltejs/svelte']
+    assert search_index.suggest('') == []
+    assert search_index.suggest('zz') == []
@@ -0,0 +1,88 @@
+# tests/test_sketches.py
+
+import math
+import numpy as np
+import pandas as pd
+import pytest
+from dashboard.data_processing.sketches import (
+    TDigest, build_quantile_sketches, merge_sketches, repository_box_statistics, sketch_quantiles
+)
+from dashboard.data_processing.transformer import add_repository_quantiles
+
+
+def test_merge_keeps_the_compression_of_the_sketches():
+    rng = np.random.default_rng(0)
+    parts = [rng.exponential(5, 2000) for _ in range(4)]
+    payloads = [TDigest(50).update(values).to_bytes() for values in parts]
+
+    merged = merge_sketches(payloads)
+    assert merged.compression == 50
+    assert merged.count == 8000
+    assert merged.means.size <= 50
+    assert abs(merged.quantile(0.5) - np.median(np.concatenate(parts))) < 0.25
+
+
+def test_merge_of_a_single_sketch_is_that_sketch():
+    digest = TDigest(100).update(np.arange(1000))
+    merged = merge_sketches([digest.to_bytes()])
+
+    assert merged.to_bytes() == digest.to_bytes()
+
+
+def test_merge_of_no_sketches_is_empty():
+    assert math.isnan(merge_sketches([]).quantile(0.5))
+
+
+def _activity(rng, repositories, rows):
+    return pd.DataFrame({
+        'repository': rng.choice(repositories, rows),
+        'resolution_time_days': rng.exponential(10, rows),
+    })
+
+
+def test_build_matches_a_digest_per_repository():
+    rng = np.random.default_rng(1)
+    issues = _activity(rng, ['a', 'b', 'c'], 5000)
+    issues.loc[::7, 'resolution_time_days'] = -1  # open issues are left out
+    pr_data = pd.DataFrame({'repository': ['a'], 'merge_time_days': [2.0]})
+
+    sketch_df = build_quantile_sketches(issues, pr_data, compression=50)
+    issue_sketches = sketch_df[sketch_df['metric'] == 'resolution_time_days'].set_index('repository')
+
+    for repository, rows in issues[issues['resolution_time_days'] >= 0].groupby('repository'):
+        expected = TDigest(50).update(rows['resolution_time_days'].to_numpy())
+        assert issue_sketches.loc[repository, 'sketch'] == expected.to_bytes()
+        assert issue_sketches.loc[repository, 'count'] == len(rows)
+
+
+def test_box_statistics_follow_the_rows():
+    rng = np.random.default_rng(2)
+    issues = _activity(rng, ['a', 'b'], 20000)
+    sketch_df = build_quantile_sketches(issues, pd.DataFrame(columns=['repository', 'merge_time_days']))
+
+    stats = repository_box_statistics(sketch_df, 'resolution_time_days')
+    for repository, rows in issues.groupby('repository'):
+        values = rows['resolution_time_days']
+        q1, median, q3 = values.quantile([0.25, 0.5, 0.75])
+        assert stats.loc[repository, ['q1', 'median', 'q3']].to_numpy() == pytest.approx([q1, median, q3], rel=0.02)
+        assert stats.loc[repository, 'total'] == pytest.approx(values.sum())
+        assert stats.loc[repository, 'lowerfence'] == pytest.approx(values.min())
+        assert stats.loc[repository, 'upperfence'] == pytest.approx(q3 + 1.5 * (q3 - q1), rel=0.02)
+    assert list(stats.index) == list(issues.groupby('repository')['resolution_time_days'].sum()
+                                     .sort_values(ascending=False).index)
+
+
+def test_repository_quantiles_come_from_the_sketches():
+    rng = np.random.default_rng(3)
+    issues = _activity(rng, ['a', 'b'], 4000)
+    pr_data = pd.DataFrame({'repository': ['a'] * 3, 'merge_time_days': [1.0, 2.0, 3.0]})
+    sketch_df = build_quantile_sketches(issues, pr_data)
+    repo_df = pd.DataFrame({'name': ['a', 'b', 'c']})
+
+    repo_df = add_repository_quantiles(repo_df, sketch_df).set_index('name')
+    for repository in ('a', 'b'):
+        expected = sketch_quantiles(sketch_df, 'resolution_time_days', [repository])
+        assert repo_df.loc[repository, 'issue_resolution_days_p90'] == pytest.approx(expected[0.9])
+    assert repo_df.loc['a', 'pr_merge_time_days_p50'] == pytest.approx(2.0)
+    assert (repo_df.loc['c'] == -1).all()
+    assert repo_df.loc['b', 'pr_merge_time_days_p99'] == -1
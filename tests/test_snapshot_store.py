@@ -0,0 +1,44 @@
+# tests/test_snapshot_store.py
+
+import pandas as pd
+from data_collection.snapshot_store import (
+    append_snapshots, compact_snapshots, downsample_snapshots, read_snapshots
+)
+
+T0 = pd.Timestamp('2024-05-01 12:00', tz='UTC')
+
+
+def _snapshots(*rows):
+    return pd.DataFrame(rows, columns=['repository', 'timestamp', 'stars', 'forks', 'open_issues'])
+
+
+def test_downsample_carries_the_last_value_forward_to_end():
+    df = _snapshots(('a', T0, 5, 1, 2), ('a', T0 + pd.Timedelta(days=2), 7, 1, 2))
+    result = downsample_snapshots(df, end=T0 + pd.Timedelta(days=3))
+    assert result['stars'].tolist() == [5, 5, 7, 7]
+    assert result['timestamp'].iloc[-1] == pd.Timestamp('2024-05-04', tz='UTC')
+
+
+def test_downsample_keeps_a_snapshot_taken_exactly_at_end():
+    result = downsample_snapshots(_snapshots(('a', T0, 5, 1, 2)), end=T0)
+    assert result[['stars', 'forks', 'open_issues']].values.tolist() == [[5, 1, 2]]
+
+
+def test_downsample_skips_repositories_without_snapshots_up_to_end():
+    df = _snapshots(('a', T0, 5, 1, 2), ('b', T0 + pd.Timedelta(days=5), 9, 9, 9))
+    result = downsample_snapshots(df, end=T0 + pd.Timedelta(days=1))
+    assert set(result['repository']) == {'a'}
+    assert downsample_snapshots(df, end=T0 - pd.Timedelta(days=1)).empty
+
+
+def test_compaction_keeps_only_changes_and_reads_back_the_series(tmp_path):
+    path = str(tmp_path / 'snapshots')
+    for day, stars in enumerate([5, 5, 5, 8]):
+        append_snapshots([{'repository': 'a', 'stars': stars, 'forks': 1, 'open_issues': 0}],
+                         timestamp=T0 + pd.Timedelta(days=day), path=path)
+    compact_snapshots(path)
+
+    stored = read_snapshots(path=path)
+    assert stored['stars'].tolist() == [5, 8]
+    series = downsample_snapshots(stored, end=T0 + pd.Timedelta(days=3))
+    assert series['stars'].tolist() == [5, 5, 5, 8]
@@ -0,0 +1,127 @@
+# tests/test_storage.py
+
+import pytest
+from pocketbase.client import ClientResponseError
+from data_collection.storage import PocketBaseStorage, SQLiteStorage, pocketbase_filter
+from data_processing import transformer
+from data_processing.cleaner import clean_all_data
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteStorage(str(tmp_path / 'storage.sqlite3'))
+    yield store
+    store.close()
+
+
+def test_create_assigns_system_fields(store):
+    record_id = store.create('issues', {'number': 1, 'title': 'bug', 'id': 'ignored'})
+    item, = store.scan('issues')['items']
+
+    assert item['id'] == record_id != 'ignored'
+    assert item['created'] == item['updated']
+    assert (item['number'], item['title']) == (1, 'bug')
+
+
+def test_upsert_updates_the_matching_record_and_keeps_other_fields(store):
+    first = store.upsert('repositories', {'full_name': 'org/a', 'stars': 1, 'forks': 2}, ['full_name'])
+    store.upsert('repositories', {'full_name': 'org/b', 'stars': 7}, ['full_name'])
+    again = store.upsert('repositories', {'full_name': 'org/a', 'stars': 5}, ['full_name'])
+
+    assert again == first
+    records = {item['full_name']: item for item in store.scan_all('repositories')}
+    assert len(records) == 2
+    assert (records['org/a']['stars'], records['org/a']['forks']) == (5, 2)
+    assert records['org/a']['updated'] >= records['org/a']['created']
+
+
+def test_scan_pages_filters_and_restricts_fields(store):
+    for number in range(5):
+        store.create('issues', {'number': number, 'state': 'open' if number % 2 else 'closed', 'closed_at': None})
+
+    page = store.scan('issues', page=2, per_page=2, fields=['number'])
+    assert (page['totalItems'], page['totalPages']) == (5, 3)
+    assert page['items'] == [{'number': 2}, {'number': 3}]
+
+    open_issues = store.scan('issues', filters=[('state', '=', 'open'), ('number', '>', 1)])
+    assert [item['number'] for item in open_issues['items']] == [3]
+    assert store.scan('issues', filters=[('closed_at', '=', None)])['totalItems'] == 5
+    assert store.scan('issues', filters=[('closed_at', '!=', None)])['totalItems'] == 0
+
+
+def test_scan_all_reads_every_page_in_insertion_order(store):
+    for number in range(7):
+        store.create('pull_requests', {'number': number})
+
+    assert [item['number'] for item in store.scan_all('pull_requests', per_page=3)] == list(range(7))
+    assert [item['number'] for item in store.scan_all('pull_requests', filters=[('number', '>=', 5)],
+                                                      per_page=1)] == [5, 6]
+    assert list(store.scan_all('empty')) == []
+
+
+def test_delete_removes_the_record(store):
+    keep = store.create('issues', {'number': 1})
+    store.delete('issues', store.create('issues', {'number': 2}))
+
+    assert [item['id'] for item in store.scan_all('issues')] == [keep]
+
+
+def test_invalid_fields_and_operators_are_rejected(store):
+    with pytest.raises(ValueError):
+        store.scan('issues', filters=[("number') OR 1=1 --", '=', 1)])
+    with pytest.raises(ValueError):
+        store.scan('issues', filters=[('number', 'LIKE', 1)])
+    with pytest.raises(ValueError):
+        store.create('issues; DROP TABLE issues', {'number': 1})
+
+
+def test_pocketbase_filter_quotes_values():
+    assert pocketbase_filter([('name', '=', 'say "hi" \\o/'), ('stars', '>=', 10), ('closed_at', '!=', None)]) == (
+        'name = "say \\"hi\\" \\\\o/" && stars >= 10 && closed_at != null'
+    )
+    assert pocketbase_filter(None) == ''
+    with pytest.raises(ValueError):
+        pocketbase_filter([('name', '~', 'a')])
+
+
+def test_pocketbase_storage_reauthenticates_once_on_401(monkeypatch):
+    store = PocketBaseStorage('http://127.0.0.1:1', 'admin@example.com', 'secret')
+    logins = []
+    monkeypatch.setattr(store.client.admins, 'auth_with_password', lambda email, password: logins.append(email))
+    store.client.auth_store.save('token', None)
+    responses = [ClientResponseError(status=401), {'items': []}]
+
+    def send(path, options):
+        response = responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(store.client, 'send', send)
+
+    assert store.scan('issues') == {'items': []}
+    assert logins == ['admin@example.com']
+
+
+def test_scheduler_processing_reads_through_the_storage_backend(sqlite_storage):
+    repo_id = sqlite_storage.create('repositories', {
+        'name': 'alpha', 'full_name': 'org/alpha', 'description': 'alpha', 'stars': 10, 'forks': 2,
+        'open_issues': 1, 'created_at': '2024-01-01 00:00:00.000Z', 'updated_at': '2024-05-01 00:00:00.000Z',
+    })
+    sqlite_storage.create('issues', {
+        'repository': repo_id, 'number': 1, 'title': 'bug', 'author': 'ann', 'state': 'closed',
+        'created_at': '2024-02-01 00:00:00.000Z', 'updated_at': '2024-02-03 00:00:00.000Z',
+        'closed_at': '2024-02-03 00:00:00.000Z',
+    })
+    sqlite_storage.create('pull_requests', {
+        'repository': repo_id, 'number': 2, 'title': 'fix', 'author': 'bob', 'state': 'merged',
+        'created_at': '2024-03-01 00:00:00.000Z', 'updated_at': '2024-03-02 00:00:00.000Z',
+        'closed_at': '2024-03-02 00:00:00.000Z', 'merged_at': '2024-03-02 00:00:00.000Z',
+    })
+
+    transformer.authenticate_pocketbase()
+    repo_df, issues_df, pr_df = transformer.transform_all_data(*clean_all_data())
+
+    assert repo_df.loc[0, 'stars_per_fork'] == 5
+    assert issues_df.loc[0, 'resolution_time_days'] == 2
+    assert pr_df.loc[0, 'merge_time_days'] == 1
@@ -0,0 +1,79 @@
+# tests/test_visualizations.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from dashboard import visualizations
+from dashboard.visualizations import (
+    OUTLIERS_PER_BOX, RAW_POINTS_LIMIT, SCATTER_BINS, plot_issue_resolution_time, plot_issues_vs_prs
+)
+
+
+def _tukey_box(values):
+    """q1, median, q3 and whiskers as Plotly draws them: linear quartiles, whiskers at the last points within 1.5 IQR."""
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    inside = values[(values >= q1 - 1.5 * (q3 - q1)) & (values <= q3 + 1.5 * (q3 - q1))]
+    return q1, median, q3, inside.min(), inside.max()
+
+
+@pytest.fixture
+def issues():
+    rng = np.random.default_rng(0)
+    rows = RAW_POINTS_LIMIT + 1000
+    return pd.DataFrame({
+        'repository': rng.choice([f"repo{i}" for i in range(12)], rows),
+        'resolution_time_days': rng.lognormal(2, 1, rows),
+    })
+
+
+def test_summarized_box_matches_the_rows(issues):
+    fig = plot_issue_resolution_time(issues)
+    box, outliers = fig.data
+
+    assert box.type == 'box' and box.y is None
+    totals = issues.groupby('repository')['resolution_time_days'].sum().sort_values(ascending=False)
+    assert list(box.x) == list(totals.index)
+    for i, repository in enumerate(box.x):
+        values = issues.loc[issues['repository'] == repository, 'resolution_time_days'].to_numpy()
+        expected = _tukey_box(values)
+        drawn = (box.q1[i], box.median[i], box.q3[i], box.lowerfence[i], box.upperfence[i])
+        assert drawn == pytest.approx(expected)
+        assert box.mean[i] == pytest.approx(values.mean())
+
+        sampled = np.asarray(outliers.y)[np.asarray(outliers.x) == repository]
+        assert len(sampled) <= OUTLIERS_PER_BOX
+        assert ((sampled < expected[3]) | (sampled > expected[4])).all()
+
+
+def test_small_selections_send_the_rows(issues):
+    fig = plot_issue_resolution_time(issues.head(RAW_POINTS_LIMIT))
+
+    assert fig.data[0].type == 'box'
+    assert len(fig.data[0].y) == RAW_POINTS_LIMIT
+
+
+def test_binned_scatter_keeps_every_repository(monkeypatch):
+    monkeypatch.setattr(visualizations, 'RAW_POINTS_LIMIT', 100)
+    rng = np.random.default_rng(1)
+    repositories = 2000
+    repo_data = pd.DataFrame({
+        'id': range(repositories),
+        'name': [f"repo{i}" for i in range(repositories)],
+        'stars': rng.integers(0, 5000, repositories),
+        'total_contributors': rng.integers(1, 50, repositories),
+    })
+    issues = pd.DataFrame({'repository': rng.choice(repo_data['name'][:1500], 40000)})
+    pr_data = pd.DataFrame({'repository': rng.choice(repo_data['name'], 20000)})
+
+    scatter = plot_issues_vs_prs(repo_data, issues, pr_data).data[0]
+    assert scatter.type == 'scattergl'
+    assert len(scatter.x) <= SCATTER_BINS ** 2
+
+    # Every repository with both counts lands in exactly one bin, and each bin marks the mean of its points
+    counts = pd.DataFrame({'issue_count': issues.groupby('repository').size(),
+                           'pr_count': pr_data.groupby('repository').size()}).dropna()
+    per_bin = np.asarray(scatter.customdata)[:, 0]
+    assert per_bin.sum() == len(counts)
+    assert np.average(scatter.x, weights=per_bin) == pytest.approx(counts['issue_count'].mean())
+    assert np.average(scatter.y, weights=per_bin) == pytest.approx(counts['pr_count'].mean())
+    assert min(scatter.x) >= counts['issue_count'].min() and max(scatter.x) <= counts['issue_count'].max()